@@ -20,6 +20,7 @@ from app.modules.crm import models as _cm
 from app.modules.marketing import models as _mkm
 from app.modules.compliance import models as _cpm
 from app.modules.workflow import models as _wm
+from app.modules.utilities import models as _um
 from app.auth import models as _auth
 
 config = context.config
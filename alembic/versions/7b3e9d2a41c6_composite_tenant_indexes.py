@@ -0,0 +1,54 @@
+"""composite_tenant_indexes
+
+Composite indexes for the tenant-isolated list, dashboard and billing-run
+access paths (tenant_org_id + status/date, lease_id + due_date).
+
+Revision ID: 7b3e9d2a41c6
+Revises: 4fcc5de3c519
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b3e9d2a41c6'
+down_revision: Union[str, Sequence[str], None] = '4fcc5de3c519'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_invoices_org_status_due", "invoices", ["tenant_org_id", "invoice_status", "due_date"]),
+    ("ix_invoices_lease_due", "invoices", ["lease_id", "due_date"]),
+    ("ix_invoices_tenant_id", "invoices", ["tenant_id"]),
+    ("ix_payments_org_date", "payments", ["tenant_org_id", "payment_date"]),
+    ("ix_payments_tenant_date", "payments", ["tenant_id", "payment_date"]),
+    ("ix_leases_org_status_end", "leases", ["tenant_org_id", "lease_status", "end_date"]),
+    ("ix_rent_schedules_org_due", "rent_schedules", ["tenant_org_id", "due_date"]),
+    ("ix_rent_schedules_lease_due", "rent_schedules", ["lease_id", "due_date"]),
+    ("ix_maintenance_requests_org_status", "maintenance_requests", ["tenant_org_id", "status", "created_at"]),
+    ("ix_utility_readings_org_date", "utility_readings", ["tenant_org_id", "reading_date"]),
+]
+
+
+def _existing(table: str) -> set:
+    return {ix["name"] for ix in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Databases created by init_db() after the models gained these indexes
+    # already have them. Checked by hand: MySQL has no CREATE INDEX IF NOT EXISTS.
+    for name, table, columns in INDEXES:
+        if name not in _existing(table):
+            op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in reversed(INDEXES):
+        if name in _existing(table):
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,54 @@
+"""gl_balance_unique_period
+
+One GLAccountBalance row per (account_id, period_id). Duplicates left by
+concurrent first postings are merged into the oldest row first.
+
+Revision ID: c41d7e2b9f08
+Revises: 7b3e9d2a41c6
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41d7e2b9f08'
+down_revision: Union[str, Sequence[str], None] = '7b3e9d2a41c6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+NAME = "uq_gl_account_balances_account_period"
+TABLE = "gl_account_balances"
+
+
+def _existing() -> set:
+    return {ix["name"] for ix in sa.inspect(op.get_bind()).get_indexes(TABLE)}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if NAME in _existing():
+        return
+    conn = op.get_bind()
+    dupes = conn.execute(sa.text(
+        f"SELECT account_id, period_id, MIN(id), SUM(debits), SUM(credits) FROM {TABLE} "
+        "GROUP BY account_id, period_id HAVING COUNT(*) > 1"
+    )).all()
+    for account_id, period_id, keep, debits, credits in dupes:
+        conn.execute(sa.text(
+            f"UPDATE {TABLE} SET debits = :dr, credits = :cr, closing_balance = opening_balance + :dr - :cr "
+            "WHERE id = :keep"
+        ), {"dr": debits, "cr": credits, "keep": keep})
+        conn.execute(sa.text(
+            f"DELETE FROM {TABLE} WHERE account_id = :a AND period_id = :p AND id <> :keep"
+        ), {"a": account_id, "p": period_id, "keep": keep})
+    op.create_index(NAME, TABLE, ["account_id", "period_id"], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if NAME in _existing():
+        op.drop_index(NAME, table_name=TABLE)
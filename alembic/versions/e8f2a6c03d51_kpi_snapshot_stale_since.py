@@ -0,0 +1,41 @@
+"""kpi_snapshot_stale_since
+
+Snapshot staleness is stamped on the kpi_snapshots row by the writing
+transaction, so every process sees it.
+
+Revision ID: e8f2a6c03d51
+Revises: c41d7e2b9f08
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8f2a6c03d51'
+down_revision: Union[str, Sequence[str], None] = 'c41d7e2b9f08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLE = "kpi_snapshots"
+COLUMN = "stale_since"
+
+
+def _existing() -> set:
+    return {c["name"] for c in sa.inspect(op.get_bind()).get_columns(TABLE)}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if COLUMN not in _existing():
+        op.add_column(TABLE, sa.Column(COLUMN, sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if COLUMN in _existing():
+        with op.batch_alter_table(TABLE) as batch:
+            batch.drop_column(COLUMN)
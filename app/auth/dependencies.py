@@ -1,15 +1,19 @@
 """Auth dependencies – JWT token validation, role checks."""
 import logging
 from datetime import datetime, timedelta
-from typing import Optional, List
+from itertools import chain
+from typing import Optional, List, NamedTuple
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from sqlalchemy import event
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_auth_db
 from app.config import get_settings
 from app.auth.models import UserAccount, Role
+from app.utils.cache_service import TTLCache
+from app.utils import query_stats
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -30,10 +34,90 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
-async def get_current_user_from_token(
+# ─── Principal cache: user + role per token subject ───
+class Principal(NamedTuple):
+    user: UserAccount
+    role: Optional[Role]
+
+
+principal_cache = TTLCache(maxsize=settings.PRINCIPAL_CACHE_MAX_ENTRIES, ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS)
+
+
+def _detached_copy(obj):
+    """Session-independent copy of a loaded row, safe to share across requests."""
+    return type(obj)(**{attr.key: getattr(obj, attr.key) for attr in obj.__mapper__.column_attrs})
+
+
+def load_principal(db: Session, user_id: int) -> Optional[Principal]:
+    """Active user and role for a token subject, from cache or one joined query.
+
+    The query is blocking, so only call this from sync code: the auth
+    dependencies are plain def, which FastAPI runs in its threadpool.
+    """
+    if settings.PRINCIPAL_CACHE_TTL_SECONDS > 0:
+        hit, principal = principal_cache.get(user_id)
+        if hit:
+            return principal
+    row = db.query(UserAccount, Role).outerjoin(Role, Role.id == UserAccount.role_id).filter(
+        UserAccount.id == user_id, UserAccount.is_active == True).first()
+    if not row:
+        return None
+    principal = Principal(_detached_copy(row[0]), _detached_copy(row[1]) if row[1] else None)
+    if settings.PRINCIPAL_CACHE_TTL_SECONDS > 0:
+        principal_cache.set(user_id, principal)
+    return principal
+
+
+def get_user_role(db: Session, user: UserAccount) -> Optional[Role]:
+    """Role of an authenticated user, served from the principal cache when possible."""
+    principal = load_principal(db, user.id)
+    if principal and principal.role and principal.role.id == user.role_id:
+        return principal.role
+    return db.query(Role).filter(Role.id == user.role_id).first()
+
+
+_PRINCIPAL_DIRTY_KEY = "principal_dirty"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_principal_changes(session, flush_context):
+    for obj in chain(session.dirty, session.deleted):
+        if isinstance(obj, UserAccount):
+            session.info.setdefault(_PRINCIPAL_DIRTY_KEY, set()).add(obj.id)
+        elif isinstance(obj, Role):
+            # Any user may hold the role, so drop every principal
+            session.info.setdefault(_PRINCIPAL_DIRTY_KEY, set()).add(None)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_principal_bulk(orm_execute_state):
+    if orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if getattr(table, "name", None) in (UserAccount.__tablename__, Role.__tablename__):
+            orm_execute_state.session.info.setdefault(_PRINCIPAL_DIRTY_KEY, set()).add(None)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_principals(session):
+    user_ids = session.info.pop(_PRINCIPAL_DIRTY_KEY, None)
+    if not user_ids:
+        return
+    if None in user_ids:
+        principal_cache.clear()
+    else:
+        for user_id in user_ids:
+            principal_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_principal_changes(session):
+    session.info.pop(_PRINCIPAL_DIRTY_KEY, None)
+
+
+def get_current_user_from_token(
     request: Request,
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_auth_db),
 ) -> Optional[UserAccount]:
     token = None
     if credentials:
@@ -59,30 +143,39 @@ async def get_current_user_from_token(
         user_id_int = int(user_id)
     except (ValueError, TypeError):
         return None
-    user = db.query(UserAccount).filter(UserAccount.id == user_id_int, UserAccount.is_active == True).first()
-    logger.debug("User found: %s", user.username if user else None)
-    return user
+    principal = load_principal(db, user_id_int)
+    db.close()  # hand the reader connection back before the route's own session checks one out
+    logger.debug("User found: %s", principal.user.username if principal else None)
+    if not principal:
+        return None
+    if request is not None:
+        request.state.user_id = principal.user.id  # reused by the audit middleware
+    stats = query_stats.current()
+    if stats is not None:
+        stats.tenant_org_id = principal.user.tenant_org_id
+    return principal.user
 
 
-async def get_current_user(
+def get_current_user(
     request: Request,
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_auth_db),
 ) -> UserAccount:
-    user = await get_current_user_from_token(request, credentials, db)
+    user = get_current_user_from_token(request, credentials, db)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
     return user
 
 
 def require_roles(allowed_roles: List[str]):
-    async def role_checker(
+    def role_checker(
         request: Request,
         credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-        db: Session = Depends(get_db),
+        db: Session = Depends(get_auth_db),
     ):
-        user = await get_current_user(request, credentials, db)
-        role = db.query(Role).filter(Role.id == user.role_id).first()
+        user = get_current_user(request, credentials, db)
+        role = get_user_role(db, user)
+        db.close()
         if not role or role.role_name not in allowed_roles:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
         return user
@@ -3,10 +3,12 @@ from fastapi import APIRouter, Depends, HTTPException, status, Response, Request
 from fastapi.responses import RedirectResponse
 from sqlalchemy.orm import Session
 from datetime import datetime
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.auth.models import UserAccount, Role
 from app.auth.schemas import LoginRequest, TokenResponse, UserCreate, UserResponse, UserUpdate
-from app.auth.dependencies import hash_password, verify_password, create_access_token, get_current_user
+from app.auth.dependencies import (
+    hash_password, verify_password, create_access_token, get_current_user, get_user_role
+)
 
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
 
@@ -62,8 +64,8 @@ def register(req: UserCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/me", response_model=UserResponse)
-def get_me(user: UserAccount = Depends(get_current_user), db: Session = Depends(get_db)):
-    role = db.query(Role).filter(Role.id == user.role_id).first()
+def get_me(user: UserAccount = Depends(get_current_user), db: Session = Depends(get_read_db)):
+    role = get_user_role(db, user)
     return UserResponse(
         id=user.id, username=user.username, email=user.email,
         full_name=user.full_name, role_id=user.role_id,
@@ -87,7 +89,7 @@ def logout_get(response: Response):
 
 
 @router.get("/users", response_model=list[UserResponse])
-def list_users(db: Session = Depends(get_db), current_user: UserAccount = Depends(get_current_user)):
+def list_users(db: Session = Depends(get_read_db), current_user: UserAccount = Depends(get_current_user)):
     # Simple role check for admin (assuming role_id 1 is admin)
     if current_user.role_id != 1:
         raise HTTPException(status_code=403, detail="Forbidden: Admin access required")
@@ -146,6 +148,6 @@ def delete_user(user_id: int, db: Session = Depends(get_db), current_user: UserA
 
 
 @router.get("/roles")
-def list_roles(db: Session = Depends(get_db), current_user: UserAccount = Depends(get_current_user)):
+def list_roles(db: Session = Depends(get_read_db), current_user: UserAccount = Depends(get_current_user)):
     roles = db.query(Role).all()
     return [{"id": r.id, "role_name": r.role_name, "description": r.description, "permissions": r.permissions} for r in roles]
@@ -15,6 +15,45 @@ class Settings(BaseSettings):
     APP_VERSION: str = "1.0.0"
     DEBUG: bool = True
 
+    # Dashboard cache and KPI snapshots
+    DASHBOARD_CACHE_TTL_SECONDS: float = 30  # per process: another worker's writes show within this TTL
+    DASHBOARD_CACHE_MAX_ENTRIES: int = 1024
+    KPI_SNAPSHOT_REFRESH_MINUTES: int = 15  # 0 disables the scheduled refresh
+
+    # Principal (user + role) cache used by token auth; TTL 0 disables it
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 4096
+
+    # Audit log writer
+    AUDIT_QUEUE_SIZE: int = 10000
+    AUDIT_BATCH_SIZE: int = 200
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0
+
+    # Per-request query stats: warn (DEBUG only) when one statement repeats more than this; 0 disables
+    N_PLUS_ONE_THRESHOLD: int = 10
+
+    # Slow query log: statements at or over SLOW_QUERY_MS (0 disables) are aggregated for
+    # /api/system/slow-queries and appended to a rotating file ("" for no file)
+    SLOW_QUERY_MS: float = 200
+    SLOW_QUERY_LOG_FILE: str = "logs/slow_queries.log"
+    SLOW_QUERY_MAX_STATEMENTS: int = 500
+
+    # SQLite profile (file databases only): pragmas applied on every connection, reads from a
+    # pool, writes serialized through one writer connection (waits up to SQLITE_WRITE_TIMEOUT_SECONDS)
+    SQLITE_WAL: bool = True  # disable on network filesystems, where WAL is unsafe
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KB: int = 65536
+    SQLITE_MMAP_SIZE_MB: int = 256
+    SQLITE_READ_POOL_SIZE: int = 8
+    SQLITE_WRITE_TIMEOUT_SECONDS: float = 30
+
+    # Read replicas for get_read_db endpoints (comma-separated URLs; empty = read from the primary).
+    # A client reads from the primary for READ_YOUR_WRITES_SECONDS after its own writes; a replica
+    # that fails to connect is skipped for READ_REPLICA_RETRY_SECONDS
+    DATABASE_READ_URLS: str = ""
+    READ_YOUR_WRITES_SECONDS: float = 5
+    READ_REPLICA_RETRY_SECONDS: float = 30
+
     # SMTP Settings
     SMTP_SERVER: str = "smtp.gmail.com"
     SMTP_PORT: int = 587
@@ -0,0 +1,22 @@
+"""Dashboard read models – KpiSnapshot."""
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class KpiSnapshot(Base):
+    """Precomputed dashboard payload per tenant org (NULL org = cross-org view)."""
+    __tablename__ = "kpi_snapshots"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    tenant_org_id = Column(Integer, ForeignKey("tenant_orgs.id"), index=True)
+    kpi_key = Column(String(50), nullable=False)  # portfolio / finance / maintenance
+    payload = Column(JSON, nullable=False)
+    as_of = Column(DateTime, nullable=False)
+    refresh_ms = Column(Integer)
+    stale_since = Column(DateTime)  # first dashboard-data write committed after a refresh
+    created_at = Column(DateTime, server_default=func.now())
+
+    @property
+    def is_stale(self) -> bool:
+        """A write to this org's dashboard data was committed after the snapshot was taken."""
+        return self.stale_since is not None and self.stale_since > self.as_of
@@ -1,23 +1,32 @@
 """Dashboard analytics routes – KPIs for all role-based dashboards."""
 import logging
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import func as sqlfunc
-from datetime import date, timedelta
-from dateutil.relativedelta import relativedelta
-from app.database import get_db
+from datetime import datetime
+from app.database import get_db, get_read_db
 from app.auth.dependencies import get_current_user
 from app.auth.models import UserAccount
-from app.modules.properties.models import Property, Unit
-from app.modules.leasing.models import Lease, RentSchedule
-from app.modules.billing.models import Invoice, Payment
-from app.modules.maintenance.models import MaintenanceRequest, WorkOrder
+from app.utils.serialization import to_dict
+from app.modules.properties.models import Unit
+from app.modules.maintenance.models import WorkOrder
 from app.modules.accounting.models import OwnerDistribution
+from app.utils import dashboard_service
+from app.utils.cache_service import dashboard_cache
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/dashboard", tags=["Dashboard"])
 
 
+def _cached(name: str, user: UserAccount, response: Response, compute, *params):
+    """Serve a dashboard payload from the per-org cache, computing it on a miss."""
+    key = (name, user.tenant_org_id, user.linked_entity_type, user.linked_entity_id, *params)
+    hit, payload = dashboard_cache.get_or_set(key, compute)
+    response.headers["X-Cache"] = "HIT" if hit else "MISS"
+    response.headers["X-Cache-Hit-Ratio"] = f"{dashboard_cache.hit_ratio:.3f}"
+    return payload
+
+
 def _tenant_filter(q, model, user):
     """Apply tenant_org_id filter if user has one."""
     if user.tenant_org_id and hasattr(model, "tenant_org_id"):
@@ -25,161 +34,62 @@ def _tenant_filter(q, model, user):
     return q
 
 
-@router.get("/portfolio")
-def portfolio_dashboard(db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
-    # Base queries with tenant isolation
-    prop_q = db.query(Property).filter(Property.is_deleted == False)
-    prop_q = _tenant_filter(prop_q, Property, user)
-    unit_q = db.query(Unit).filter(Unit.is_deleted == False)
-    unit_q = _tenant_filter(unit_q, Unit, user)
+def _snapshot_or_live(db: Session, key: str, user: UserAccount, compute) -> dict:
+    """Serve the org's KPI snapshot unless a write has made it stale since it was taken, else compute live."""
+    snap = dashboard_service.get_kpi_snapshot(db, key, user.tenant_org_id)
+    if snap and not snap.is_stale:
+        return {**snap.payload, "as_of": snap.as_of.isoformat(), "source": "snapshot"}
+    return {**compute(), "as_of": datetime.now().isoformat(), "source": "live"}
 
-    total_properties = prop_q.count()
-    total_units = unit_q.count()
-    occupied = unit_q.filter(Unit.current_status == "Occupied").count()
-    vacant = unit_q.filter(Unit.current_status == "Vacant").count()
-    occupancy_rate = round((occupied / total_units * 100) if total_units > 0 else 0, 1)
-
-    lease_q = _tenant_filter(db.query(Lease), Lease, user)
-    active_leases = lease_q.filter(Lease.lease_status == "Active").count()
-
-    pmt_q = _tenant_filter(db.query(sqlfunc.coalesce(sqlfunc.sum(Payment.amount), 0)), Payment, user)
-    total_revenue = pmt_q.scalar() or 0
-
-    inv_q = _tenant_filter(db.query(sqlfunc.coalesce(sqlfunc.sum(Invoice.total_amount), 0)), Invoice, user)
-    total_invoiced = inv_q.scalar() or 0
-
-    outstanding_q = _tenant_filter(
-        db.query(sqlfunc.coalesce(sqlfunc.sum(Invoice.total_amount), 0)).filter(
-            Invoice.invoice_status.in_(["Posted", "PartiallyPaid"])),
-        Invoice, user
-    )
-    outstanding = outstanding_q.scalar() or 0
-
-    maint_q = _tenant_filter(
-        db.query(sqlfunc.count(MaintenanceRequest.id)).filter(
-            MaintenanceRequest.status.in_(["New", "Acknowledged", "InProgress"])),
-        MaintenanceRequest, user
-    )
-    open_maintenance = maint_q.scalar() or 0
-
-    # Expiring leases in next 90 days
-    ninety_days = date.today() + timedelta(days=90)
-    expiring_q = _tenant_filter(
-        db.query(sqlfunc.count(Lease.id)).filter(
-            Lease.lease_status == "Active", Lease.end_date <= ninety_days, Lease.end_date >= date.today()),
-        Lease, user
-    )
-    expiring_leases = expiring_q.scalar() or 0
-
-    # Unit status breakdown
-    unit_statuses = _tenant_filter(
-        db.query(Unit.current_status, sqlfunc.count(Unit.id)).filter(Unit.is_deleted == False),
-        Unit, user
-    ).group_by(Unit.current_status).all()
-
-    # Property type breakdown
-    prop_types = _tenant_filter(
-        db.query(Property.property_type, sqlfunc.count(Property.id)).filter(Property.is_deleted == False),
-        Property, user
-    ).group_by(Property.property_type).all()
 
-    return {
-        "total_properties": total_properties,
-        "total_units": total_units,
-        "occupied_units": occupied,
-        "vacant_units": vacant,
-        "occupancy_rate": occupancy_rate,
-        "active_leases": active_leases,
-        "expiring_leases_90d": expiring_leases,
-        "total_revenue": float(total_revenue),
-        "total_invoiced": float(total_invoiced),
-        "outstanding_amount": float(outstanding),
-        "collection_rate": round(float(total_revenue) / float(total_invoiced) * 100, 1) if float(total_invoiced) > 0 else 0,
-        "open_maintenance_requests": open_maintenance,
-        "unit_status_breakdown": {s: c for s, c in unit_statuses},
-        "property_type_breakdown": {t: c for t, c in prop_types},
-    }
+def _live(compute) -> dict:
+    return {**compute(), "as_of": datetime.now().isoformat(), "source": "live"}
 
 
-@router.get("/finance")
-def finance_dashboard(db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
-    today = date.today()
-    # Aging buckets
-    buckets = {"0-30": 0, "31-60": 0, "61-90": 0, "90+": 0}
-    overdue_q = _tenant_filter(
-        db.query(Invoice).filter(
-            Invoice.invoice_status.in_(["Posted", "PartiallyPaid"]),
-            Invoice.due_date < today
-        ), Invoice, user
-    )
-    overdue_invoices = overdue_q.all()
-    for inv in overdue_invoices:
-        days = (today - inv.due_date).days
-        amt = float(inv.total_amount or 0)
-        if days <= 30:
-            buckets["0-30"] += amt
-        elif days <= 60:
-            buckets["31-60"] += amt
-        elif days <= 90:
-            buckets["61-90"] += amt
-        else:
-            buckets["90+"] += amt
-
-    # Monthly revenue for last 6 months — using relativedelta for correct month boundaries
-    monthly_revenue = []
-    for i in range(5, -1, -1):
-        m_start = (today.replace(day=1) - relativedelta(months=i))
-        m_end = m_start + relativedelta(months=1) - timedelta(days=1)
-        rev_q = _tenant_filter(
-            db.query(sqlfunc.coalesce(sqlfunc.sum(Payment.amount), 0)).filter(
-                Payment.payment_date >= m_start, Payment.payment_date <= m_end),
-            Payment, user
-        )
-        rev = rev_q.scalar()
-        monthly_revenue.append({"month": m_start.strftime("%b %Y"), "revenue": float(rev or 0)})
+@router.get("/portfolio")
+def portfolio_dashboard(response: Response, live: bool = False, db: Session = Depends(get_read_db),
+                        user: UserAccount = Depends(get_current_user)):
+    compute = lambda: dashboard_service.portfolio_kpis(db, user.tenant_org_id)
+    if live:
+        return _live(compute)
+    return _cached("portfolio", user, response, lambda: _snapshot_or_live(db, "portfolio", user, compute))
 
-    return {
-        "aging_buckets": buckets,
-        "total_arrears": sum(buckets.values()),
-        "monthly_revenue": monthly_revenue,
-    }
 
+@router.get("/finance")
+def finance_dashboard(response: Response, months: int = Query(6, ge=1, le=60), live: bool = False,
+                      db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
+    compute = lambda: dashboard_service.finance_kpis(db, user.tenant_org_id, months)
+    if live or months > dashboard_service.SNAPSHOT_REVENUE_MONTHS:
+        return _live(compute)
 
-@router.get("/maintenance")
-def maintenance_dashboard(db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
-    base = _tenant_filter(db.query(MaintenanceRequest), MaintenanceRequest, user)
+    def from_snapshot():
+        payload = _snapshot_or_live(db, "finance", user, compute)
+        payload["monthly_revenue"] = payload["monthly_revenue"][-months:]
+        return payload
+    return _cached("finance", user, response, from_snapshot, months)
 
-    by_status = base.with_entities(
-        MaintenanceRequest.status, sqlfunc.count(MaintenanceRequest.id)
-    ).group_by(MaintenanceRequest.status).all()
 
-    by_priority = base.filter(
-        MaintenanceRequest.status.in_(["New", "Acknowledged", "InProgress"])
-    ).with_entities(
-        MaintenanceRequest.priority, sqlfunc.count(MaintenanceRequest.id)
-    ).group_by(MaintenanceRequest.priority).all()
+@router.get("/maintenance")
+def maintenance_dashboard(response: Response, live: bool = False, db: Session = Depends(get_read_db),
+                          user: UserAccount = Depends(get_current_user)):
+    compute = lambda: dashboard_service.maintenance_kpis(db, user.tenant_org_id)
+    if live:
+        return _live(compute)
+    return _cached("maintenance", user, response, lambda: _snapshot_or_live(db, "maintenance", user, compute))
 
-    by_category = base.with_entities(
-        MaintenanceRequest.category, sqlfunc.count(MaintenanceRequest.id)
-    ).group_by(MaintenanceRequest.category).all()
 
-    total_open = base.filter(
-        MaintenanceRequest.status.in_(["New", "Acknowledged", "InProgress"])
-    ).count()
+@router.post("/snapshots/refresh")
+def refresh_snapshots(db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
+    org_ids = [user.tenant_org_id] if user.tenant_org_id else None
+    return {"snapshots_refreshed": dashboard_service.refresh_kpi_snapshots(db, org_ids)}
 
-    sla_breached = base.filter(MaintenanceRequest.sla_resolution_breached == True).count()
 
-    return {
-        "total_open": total_open,
-        "sla_breached": sla_breached,
-        "by_status": {s: c for s, c in by_status},
-        "by_priority": {p: c for p, c in by_priority},
-        "by_category": {cat: c for cat, c in by_category},
-    }
+@router.get("/owner")
+def owner_dashboard(response: Response, db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
+    return _cached("owner", user, response, lambda: _owner_kpis(db, user))
 
 
-@router.get("/owner")
-def owner_dashboard(db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
+def _owner_kpis(db: Session, user: UserAccount) -> dict:
     owner_id = user.linked_entity_id if user.linked_entity_type == "Owner" else None
 
     # Total distributions
@@ -206,7 +116,7 @@ def owner_dashboard(db: Session = Depends(get_db), user: UserAccount = Depends(g
         recent_q = recent_q.filter(OwnerDistribution.owner_id == owner_id)
     recent = recent_q.order_by(OwnerDistribution.id.desc()).limit(10).all()
     recent_list = [
-        {c.name: getattr(d, c.name) for c in d.__table__.columns}
+        to_dict(d)
         for d in recent
     ]
 
@@ -219,11 +129,14 @@ def owner_dashboard(db: Session = Depends(get_db), user: UserAccount = Depends(g
 
 
 @router.get("/vendor")
-def vendor_dashboard(db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
+def vendor_dashboard(response: Response, db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
     vendor_id = user.linked_entity_id if user.linked_entity_type == "Vendor" else None
     if not vendor_id and user.role_id != 1:  # Not admin
         raise HTTPException(status_code=403, detail="Not a vendor — access denied")
+    return _cached("vendor", user, response, lambda: _vendor_kpis(db, vendor_id))
+
 
+def _vendor_kpis(db: Session, vendor_id) -> dict:
     q_wo = db.query(WorkOrder).filter(WorkOrder.status.in_(["Open", "InProgress"]))
     if vendor_id:
         q_wo = q_wo.filter(WorkOrder.assigned_vendor_id == vendor_id)
@@ -235,3 +148,10 @@ def vendor_dashboard(db: Session = Depends(get_db), user: UserAccount = Depends(
         "pending_payments": 0.0,
         "performance_rating": 4.8,
     }
+
+
+@router.get("/cache-stats")
+def dashboard_cache_stats(user: UserAccount = Depends(get_current_user)):
+    if user.role_id != 1:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return dashboard_cache.stats()
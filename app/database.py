@@ -1,29 +1,181 @@
 """Database engine, session, and base model configuration."""
+import itertools
+import logging
+import time
+from collections import OrderedDict
+from threading import Lock
+from fastapi import Request
 from sqlalchemy import create_engine, event
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, DeclarativeBase
+from typing import Optional
 from app.config import get_settings
 
+logger = logging.getLogger(__name__)
 settings = get_settings()
 
-connect_args = {}
-if "sqlite" in settings.DATABASE_URL:
+
+def _sqlite_pragmas(dbapi_conn, _record):
+    """WAL lets readers run alongside the writer; NORMAL sync is durable enough under WAL."""
+    cursor = dbapi_conn.cursor()
+    if settings.SQLITE_WAL:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.execute(f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KB)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE_MB) * 1024 * 1024}")
+    cursor.close()
+
+
+def create_engines(url: str, echo: bool = False) -> tuple[Engine, Optional[Engine]]:
+    """(engine, writer_engine) for url.
+
+    For a SQLite file, engine is a pool of readers and writer_engine a pool
+    of exactly one connection, so concurrent writers queue in-process instead
+    of failing with "database is locked". Other databases get one engine and
+    no writer_engine.
+    """
+    if not url.startswith("sqlite"):
+        return create_engine(url, pool_size=20, max_overflow=10, pool_pre_ping=True, pool_recycle=3600,
+                             echo=echo), None
     connect_args = {"check_same_thread": False}
-    engine = create_engine(
-        settings.DATABASE_URL,
-        connect_args=connect_args,
-        echo=settings.DEBUG,
-    )
-else:
-    engine = create_engine(
-        settings.DATABASE_URL,
-        pool_size=20,
-        max_overflow=10,
-        pool_pre_ping=True,
-        pool_recycle=3600,
-        echo=settings.DEBUG,
-    )
-
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    if make_url(url).database in (None, "", ":memory:"):
+        return create_engine(url, connect_args=connect_args, echo=echo), None
+    readers = create_engine(url, connect_args=connect_args, pool_size=settings.SQLITE_READ_POOL_SIZE, echo=echo)
+    writer = create_engine(url, connect_args=connect_args, pool_size=1, max_overflow=0,
+                           pool_timeout=settings.SQLITE_WRITE_TIMEOUT_SECONDS, echo=echo)
+    for e in (readers, writer):
+        event.listen(e, "connect", _sqlite_pragmas)
+    return readers, writer
+
+
+engine, writer_engine = create_engines(settings.DATABASE_URL, echo=settings.DEBUG)
+
+# Sync driver -> asyncio driver for the async session path
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "mysql": "mysql+asyncmy", "postgresql": "postgresql+asyncpg"}
+
+
+def create_async_engine_for(sync_engine: Engine) -> AsyncEngine:
+    """An asyncio engine on the same database as sync_engine, with the same SQLite pragmas."""
+    url = sync_engine.url
+    async_engine = create_async_engine(url.set(drivername=ASYNC_DRIVERS[url.get_backend_name()]),
+                                       echo=sync_engine.echo, pool_pre_ping=url.get_backend_name() != "sqlite")
+    if url.get_backend_name() == "sqlite":
+        event.listen(async_engine.sync_engine, "connect", _sqlite_pragmas)
+    return async_engine
+
+
+_async_sessions: dict[Engine, async_sessionmaker] = {}
+
+
+def async_session_factory(sync_engine: Optional[Engine] = None) -> async_sessionmaker:
+    """AsyncSession factory for sync_engine's database (default: the primary), built on first use
+    so the asyncio driver (aiosqlite, asyncmy) is only needed by deployments that use the async path."""
+    sync_engine = sync_engine or engine
+    factory = _async_sessions.get(sync_engine)
+    if factory is None:
+        factory = _async_sessions.setdefault(sync_engine, async_sessionmaker(
+            create_async_engine_for(sync_engine), autoflush=False, expire_on_commit=False))
+    return factory
+
+
+# Request and service sessions (get_db) run on the writer, so read-modify-write
+# code reads in the same transaction as its write. Read-only endpoints
+# (get_read_db) and auth lookups (get_auth_db) use the reader pool.
+SessionLocal = sessionmaker(bind=writer_engine or engine, autocommit=False, autoflush=False)
+ReadSessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+
+class ReplicaRouter:
+    """Round-robin sessions on read replicas, with read-your-writes stickiness.
+
+    A replica whose connection checkout fails is skipped for retry_seconds.
+    Clients (keyed by their bearer token or session cookie) that made a
+    successful write in the last sticky_seconds read from the primary.
+    """
+
+    def __init__(self, engines: list[Engine], sticky_seconds: float = 5.0, retry_seconds: float = 30.0,
+                 max_sticky: int = 10000):
+        self.engines = engines
+        self.sticky_seconds = sticky_seconds
+        self.retry_seconds = retry_seconds
+        self.max_sticky = max_sticky
+        self.failures = 0
+        self._sessions = [sessionmaker(bind=e, autocommit=False, autoflush=False) for e in engines]
+        self._down_until = [0.0] * len(engines)
+        self._next = itertools.count()
+        self._writers: OrderedDict = OrderedDict()
+        self._lock = Lock()
+
+    def note_write(self, key: Optional[str]):
+        if not key or not self.engines:
+            return
+        with self._lock:
+            self._writers[key] = time.monotonic() + self.sticky_seconds
+            self._writers.move_to_end(key)
+            while len(self._writers) > self.max_sticky:
+                self._writers.popitem(last=False)
+
+    def is_sticky(self, key: Optional[str]) -> bool:
+        if not key:
+            return False
+        with self._lock:
+            until = self._writers.get(key)
+            return until is not None and until > time.monotonic()
+
+    def open(self) -> Optional[Session]:
+        """A session on the next healthy replica, connection already checked out; None if none is reachable."""
+        start = next(self._next)
+        for k in range(len(self._sessions)):
+            i = (start + k) % len(self._sessions)
+            if self._down_until[i] > time.monotonic():
+                continue
+            db = self._sessions[i]()
+            try:
+                db.connection()
+                return db
+            except DBAPIError as e:
+                db.close()
+                self._down_until[i] = time.monotonic() + self.retry_seconds
+                self.failures += 1
+                logger.warning("Read replica %d unavailable, using others for %.0fs: %s", i, self.retry_seconds, e)
+        return None
+
+    async def open_async(self) -> Optional[AsyncSession]:
+        """open() for the async path: an AsyncSession on the next healthy replica, or None."""
+        start = next(self._next)
+        for k in range(len(self.engines)):
+            i = (start + k) % len(self.engines)
+            if self._down_until[i] > time.monotonic():
+                continue
+            db = async_session_factory(self.engines[i])()
+            try:
+                await db.connection()
+                return db
+            except DBAPIError as e:
+                await db.close()
+                self._down_until[i] = time.monotonic() + self.retry_seconds
+                self.failures += 1
+                logger.warning("Read replica %d unavailable, using others for %.0fs: %s", i, self.retry_seconds, e)
+        return None
+
+
+def client_key(request: Request) -> Optional[str]:
+    """Identifies the client for read-your-writes: its bearer token, else its access_token cookie."""
+    auth = request.headers.get("Authorization")
+    if auth and auth.startswith("Bearer "):
+        return auth[7:]
+    return request.cookies.get("access_token")
+
+
+replica_router = ReplicaRouter(
+    [create_engines(url.strip(), echo=settings.DEBUG)[0] for url in settings.DATABASE_READ_URLS.split(",")
+     if url.strip()],
+    sticky_seconds=settings.READ_YOUR_WRITES_SECONDS,
+    retry_seconds=settings.READ_REPLICA_RETRY_SECONDS,
+)
 
 
 class Base(DeclarativeBase):
@@ -39,6 +191,54 @@ def get_db():
         db.close()
 
 
+def get_auth_db():
+    """Session for resolving the request's user and role, on the primary's reader pool.
+
+    Never a replica, so user and role changes apply as soon as they commit,
+    and never the writer, so authenticating does not queue behind writes.
+    """
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_read_db(request: Request):
+    """Session for read-only endpoints: a replica when DATABASE_READ_URLS is set.
+
+    Falls back to the primary's reader pool (ReadSessionLocal) when there
+    are no replicas, when this client wrote within READ_YOUR_WRITES_SECONDS,
+    or when no replica can be reached. Never write through it.
+    """
+    db = None
+    if replica_router.engines and not replica_router.is_sticky(client_key(request)):
+        db = replica_router.open()
+    db = db or ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    """Async counterpart of get_db: an AsyncSession on the primary."""
+    async with async_session_factory()() as db:
+        yield db
+
+
+async def get_async_read_db(request: Request):
+    """Async counterpart of get_read_db, with the same replica choice and fallbacks."""
+    db = None
+    if replica_router.engines and not replica_router.is_sticky(client_key(request)):
+        db = await replica_router.open_async()
+    db = db or async_session_factory()()
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
 def init_db():
     """Create all tables defined on Base.metadata."""
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=writer_engine or engine)
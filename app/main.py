@@ -9,13 +9,13 @@ from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
 from app.config import get_settings
-from app.database import get_db, init_db, Base, engine
-from app.auth.dependencies import get_current_user_from_token
+from app.database import get_db, get_auth_db, init_db, Base, engine
+from app.auth.dependencies import get_current_user_from_token, get_user_role
 from app.auth.models import UserAccount, Role
 from app.auth.routes import router as auth_router
 from app.modules.properties.routes import router as properties_router, tenants_router, owners_router, vendors_router
 from app.modules.properties.asset_routes import router as assets_router
-from app.modules.system.routes import router as system_router
+from app.modules.system.routes import router as system_router, metrics_router
 from app.modules.leasing.routes import router as leasing_router
 from app.modules.billing.routes import router as billing_router
 from app.modules.maintenance.routes import router as maintenance_router
@@ -30,6 +30,9 @@ from app.utils.export_service import router as export_router
 from app.utils.automation_routes import router as automation_router
 from app.modules.utilities.routes import router as utilities_router
 from app.middleware.audit import AuditMiddleware
+from app.middleware.request_context import RequestContextMiddleware
+from app.utils.audit_service import audit_writer
+from app.utils.serialization import FastJSONResponse
 
 # Import all models so that Base.metadata knows about them
 from app.modules.properties import models as _pm
@@ -42,6 +45,7 @@ from app.modules.marketing import models as _mkm
 from app.modules.compliance import models as _cpm
 from app.modules.workflow import models as _wm
 from app.modules.utilities import models as _um
+from app.dashboards import models as _dbm
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -88,16 +92,19 @@ async def lifespan(app: FastAPI):
         db.close()
 
     scheduler.start()
+    await audit_writer.start()
     logger.info("Application startup complete.")
 
     yield
 
     # --- Shutdown ---
+    await audit_writer.stop()
     scheduler.stop()
     logger.info("Application shutdown complete.")
 
 
-app = FastAPI(title=settings.APP_NAME, version=settings.APP_VERSION, lifespan=lifespan)
+app = FastAPI(title=settings.APP_NAME, version=settings.APP_VERSION, lifespan=lifespan,
+              default_response_class=FastJSONResponse)
 
 # Create directories
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -122,12 +129,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Request-ID", "X-Response-Time", "Server-Timing", "X-DB-Query-Count"],
 )
+app.add_middleware(RequestContextMiddleware)
 
 # Register ALL API routers (before any route definitions)
 app.include_router(auth_router)
 app.include_router(properties_router)
 app.include_router(system_router)
+app.include_router(metrics_router)
 app.include_router(tenants_router)
 app.include_router(owners_router)
 app.include_router(vendors_router)
@@ -164,200 +174,200 @@ async def login_page(request: Request):
 
 
 @app.get("/dashboard", response_class=HTMLResponse)
-async def dashboard_page(request: Request, user: UserAccount = Depends(get_current_user_from_token),
-                          db: Session = Depends(get_db)):
+def dashboard_page(request: Request, user: UserAccount = Depends(get_current_user_from_token),
+                    db: Session = Depends(get_auth_db)):
     if not user:
         return RedirectResponse(url="/login")
-    role = db.query(Role).filter(Role.id == user.role_id).first()
+    role = get_user_role(db, user)
     return templates.TemplateResponse("dashboard/index.html", {
         "request": request, "user": user, "role": role, "settings": settings
     })
 
 
 @app.get("/properties", response_class=HTMLResponse)
-async def properties_page(request: Request, user: UserAccount = Depends(get_current_user_from_token),
-                           db: Session = Depends(get_db)):
+def properties_page(request: Request, user: UserAccount = Depends(get_current_user_from_token),
+                     db: Session = Depends(get_auth_db)):
     if not user:
         return RedirectResponse(url="/login")
-    role = db.query(Role).filter(Role.id == user.role_id).first()
+    role = get_user_role(db, user)
     return templates.TemplateResponse("properties/index.html", {
         "request": request, "user": user, "role": role, "settings": settings
     })
 
 
 @app.get("/properties/{prop_id}", response_class=HTMLResponse)
-async def property_detail_page(request: Request, prop_id: int,
-                                user: UserAccount = Depends(get_current_user_from_token),
-                                db: Session = Depends(get_db)):
+def property_detail_page(request: Request, prop_id: int,
+                          user: UserAccount = Depends(get_current_user_from_token),
+                          db: Session = Depends(get_auth_db)):
     if not user:
         return RedirectResponse(url="/login")
-    role = db.query(Role).filter(Role.id == user.role_id).first()
+    role = get_user_role(db, user)
     return templates.TemplateResponse("properties/detail.html", {
         "request": request, "user": user, "role": role, "prop_id": prop_id, "settings": settings
     })
 
 
 @app.get("/properties/{prop_id}/units/{unit_id}", response_class=HTMLResponse)
-async def unit_detail_page(request: Request, prop_id: int, unit_id: int,
-                            user: UserAccount = Depends(get_current_user_from_token),
-                            db: Session = Depends(get_db)):
+def unit_detail_page(request: Request, prop_id: int, unit_id: int,
+                      user: UserAccount = Depends(get_current_user_from_token),
+                      db: Session = Depends(get_auth_db)):
     if not user:
         return RedirectResponse(url="/login")
-    role = db.query(Role).filter(Role.id == user.role_id).first()
+    role = get_user_role(db, user)
     return templates.TemplateResponse("properties/unit_detail.html", {
         "request": request, "user": user, "role": role, "prop_id": prop_id, "unit_id": unit_id, "settings": settings
     })
 
 
 @app.get("/assets", response_class=HTMLResponse)
-async def assets_page(request: Request, user: UserAccount = Depends(get_current_user_from_token),
-                       db: Session = Depends(get_db)):
+def assets_page(request: Request, user: UserAccount = Depends(get_current_user_from_token),
+                 db: Session = Depends(get_auth_db)):
     if not user:
         return RedirectResponse(url="/login")
-    role = db.query(Role).filter(Role.id == user.role_id).first()
+    role = get_user_role(db, user)
     return templates.TemplateResponse("properties/assets.html", {
         "request": request, "user": user, "role": role, "settings": settings
     })
 
 
 @app.get("/utilities", response_class=HTMLResponse)
-async def utilities_page(request: Request, user: UserAccount = Depends(get_current_user_from_token),
-                          db: Session = Depends(get_db)):
+def utilities_page(request: Request, user: UserAccount = Depends(get_current_user_from_token),
+                    db: Session = Depends(get_auth_db)):
     if not user:
         return RedirectResponse(url="/login")
-    role = db.query(Role).filter(Role.id == user.role_id).first()
+    role = get_user_role(db, user)
     return templates.TemplateResponse("utilities/index.html", {
         "request": request, "user": user, "role": role, "settings": settings
     })
 
 
 @app.get("/leases", response_class=HTMLResponse)
-async def leases_page(request: Request, user: UserAccount = Depends(get_current_user_from_token),
-                       db: Session = Depends(get_db)):
+def leases_page(request: Request, user: UserAccount = Depends(get_current_user_from_token),
+                 db: Session = Depends(get_auth_db)):
     if not user:
         return RedirectResponse(url="/login")
-    role = db.query(Role).filter(Role.id == user.role_id).first()
+    role = get_user_role(db, user)
     return templates.TemplateResponse("leasing/index.html", {
         "request": request, "user": user, "role": role, "settings": settings
     })
 
 
 @app.get("/invoices", response_class=HTMLResponse)
-async def invoices_page(request: Request, user: UserAccount = Depends(get_current_user_from_token),
-                         db: Session = Depends(get_db)):
+def invoices_page(request: Request, user: UserAccount = Depends(get_current_user_from_token),
+                   db: Session = Depends(get_auth_db)):
     if not user:
         return RedirectResponse(url="/login")
-    role = db.query(Role).filter(Role.id == user.role_id).first()
+    role = get_user_role(db, user)
     return templates.TemplateResponse("billing/index.html", {
         "request": request, "user": user, "role": role, "settings": settings
     })
 
 
 @app.get("/maintenance", response_class=HTMLResponse)
-async def maintenance_page(request: Request, user: UserAccount = Depends(get_current_user_from_token),
-                            db: Session = Depends(get_db)):
+def maintenance_page(request: Request, user: UserAccount = Depends(get_current_user_from_token),
+                      db: Session = Depends(get_auth_db)):
     if not user:
         return RedirectResponse(url="/login")
-    role = db.query(Role).filter(Role.id == user.role_id).first()
+    role = get_user_role(db, user)
     return templates.TemplateResponse("maintenance/index.html", {
         "request": request, "user": user, "role": role, "settings": settings
     })
 
 
 @app.get("/tenants", response_class=HTMLResponse)
-async def tenants_page(request: Request, user: UserAccount = Depends(get_current_user_from_token),
-                        db: Session = Depends(get_db)):
+def tenants_page(request: Request, user: UserAccount = Depends(get_current_user_from_token),
+                  db: Session = Depends(get_auth_db)):
     if not user:
         return RedirectResponse(url="/login")
-    role = db.query(Role).filter(Role.id == user.role_id).first()
+    role = get_user_role(db, user)
     return templates.TemplateResponse("tenants/index.html", {
         "request": request, "user": user, "role": role, "settings": settings
     })
 
 
 @app.get("/owners", response_class=HTMLResponse)
-async def owners_page(request: Request, user: UserAccount = Depends(get_current_user_from_token),
-                      db: Session = Depends(get_db)):
+def owners_page(request: Request, user: UserAccount = Depends(get_current_user_from_token),
+                db: Session = Depends(get_auth_db)):
     if not user:
         return RedirectResponse(url="/login")
-    role = db.query(Role).filter(Role.id == user.role_id).first()
+    role = get_user_role(db, user)
     return templates.TemplateResponse("tenants/owners.html", {
         "request": request, "user": user, "role": role, "settings": settings
     })
 
 
 @app.get("/reports", response_class=HTMLResponse)
-async def reports_page(request: Request, user: UserAccount = Depends(get_current_user_from_token),
-                        db: Session = Depends(get_db)):
+def reports_page(request: Request, user: UserAccount = Depends(get_current_user_from_token),
+                  db: Session = Depends(get_auth_db)):
     if not user:
         return RedirectResponse(url="/login")
-    role = db.query(Role).filter(Role.id == user.role_id).first()
+    role = get_user_role(db, user)
     return templates.TemplateResponse("reports/index.html", {
         "request": request, "user": user, "role": role, "settings": settings
     })
 
 
 @app.get("/accounting", response_class=HTMLResponse)
-async def accounting_page(request: Request, user: UserAccount = Depends(get_current_user_from_token),
-                           db: Session = Depends(get_db)):
+def accounting_page(request: Request, user: UserAccount = Depends(get_current_user_from_token),
+                     db: Session = Depends(get_auth_db)):
     if not user:
         return RedirectResponse(url="/login")
-    role = db.query(Role).filter(Role.id == user.role_id).first()
+    role = get_user_role(db, user)
     return templates.TemplateResponse("accounting/index.html", {
         "request": request, "user": user, "role": role, "settings": settings
     })
 
 
 @app.get("/crm", response_class=HTMLResponse)
-async def crm_page(request: Request, user: UserAccount = Depends(get_current_user_from_token),
-                    db: Session = Depends(get_db)):
+def crm_page(request: Request, user: UserAccount = Depends(get_current_user_from_token),
+              db: Session = Depends(get_auth_db)):
     if not user:
         return RedirectResponse(url="/login")
-    role = db.query(Role).filter(Role.id == user.role_id).first()
+    role = get_user_role(db, user)
     return templates.TemplateResponse("crm/index.html", {
         "request": request, "user": user, "role": role, "settings": settings
     })
 
 
 @app.get("/marketing", response_class=HTMLResponse)
-async def marketing_page(request: Request, user: UserAccount = Depends(get_current_user_from_token),
-                          db: Session = Depends(get_db)):
+def marketing_page(request: Request, user: UserAccount = Depends(get_current_user_from_token),
+                    db: Session = Depends(get_auth_db)):
     if not user:
         return RedirectResponse(url="/login")
-    role = db.query(Role).filter(Role.id == user.role_id).first()
+    role = get_user_role(db, user)
     return templates.TemplateResponse("marketing/index.html", {
         "request": request, "user": user, "role": role, "settings": settings
     })
 
 
 @app.get("/compliance", response_class=HTMLResponse)
-async def compliance_page(request: Request, user: UserAccount = Depends(get_current_user_from_token),
-                           db: Session = Depends(get_db)):
+def compliance_page(request: Request, user: UserAccount = Depends(get_current_user_from_token),
+                     db: Session = Depends(get_auth_db)):
     if not user:
         return RedirectResponse(url="/login")
-    role = db.query(Role).filter(Role.id == user.role_id).first()
+    role = get_user_role(db, user)
     return templates.TemplateResponse("compliance/index.html", {
         "request": request, "user": user, "role": role, "settings": settings
     })
 
 
 @app.get("/workflow", response_class=HTMLResponse)
-async def workflow_page(request: Request, user: UserAccount = Depends(get_current_user_from_token),
-                         db: Session = Depends(get_db)):
+def workflow_page(request: Request, user: UserAccount = Depends(get_current_user_from_token),
+                   db: Session = Depends(get_auth_db)):
     if not user:
         return RedirectResponse(url="/login")
-    role = db.query(Role).filter(Role.id == user.role_id).first()
+    role = get_user_role(db, user)
     return templates.TemplateResponse("workflow/index.html", {
         "request": request, "user": user, "role": role, "settings": settings
     })
 
 
 @app.get("/users", response_class=HTMLResponse)
-async def users_page(request: Request, user: UserAccount = Depends(get_current_user_from_token),
-                     db: Session = Depends(get_db)):
+def users_page(request: Request, user: UserAccount = Depends(get_current_user_from_token),
+               db: Session = Depends(get_auth_db)):
     if not user:
         return RedirectResponse(url="/login")
-    role = db.query(Role).filter(Role.id == user.role_id).first()
+    role = get_user_role(db, user)
     if role.id != 1:  # Only allow admin
         return RedirectResponse(url="/dashboard")
     return templates.TemplateResponse("auth/users.html", {
@@ -366,11 +376,11 @@ async def users_page(request: Request, user: UserAccount = Depends(get_current_u
 
 
 @app.get("/roles", response_class=HTMLResponse)
-async def roles_page(request: Request, user: UserAccount = Depends(get_current_user_from_token),
-                     db: Session = Depends(get_db)):
+def roles_page(request: Request, user: UserAccount = Depends(get_current_user_from_token),
+               db: Session = Depends(get_auth_db)):
     if not user:
         return RedirectResponse(url="/login")
-    role = db.query(Role).filter(Role.id == user.role_id).first()
+    role = get_user_role(db, user)
     if role.id != 1:  # Only allow admin
         return RedirectResponse(url="/dashboard")
     return templates.TemplateResponse("auth/roles.html", {
@@ -379,11 +389,11 @@ async def roles_page(request: Request, user: UserAccount = Depends(get_current_u
 
 
 @app.get("/settings", response_class=HTMLResponse)
-async def settings_page(request: Request, user: UserAccount = Depends(get_current_user_from_token),
-                         db: Session = Depends(get_db)):
+def settings_page(request: Request, user: UserAccount = Depends(get_current_user_from_token),
+                   db: Session = Depends(get_auth_db)):
     if not user:
         return RedirectResponse(url="/login")
-    role = db.query(Role).filter(Role.id == user.role_id).first()
+    role = get_user_role(db, user)
     if role.id != 1:  # Only allow admin
         return RedirectResponse(url="/dashboard")
     return templates.TemplateResponse("system/settings.html", {
@@ -392,11 +402,11 @@ async def settings_page(request: Request, user: UserAccount = Depends(get_curren
 
 
 @app.get("/workflow/scheduler", response_class=HTMLResponse)
-async def scheduler_page(request: Request, user: UserAccount = Depends(get_current_user_from_token),
-                         db: Session = Depends(get_db)):
+def scheduler_page(request: Request, user: UserAccount = Depends(get_current_user_from_token),
+                   db: Session = Depends(get_auth_db)):
     if not user:
         return RedirectResponse(url="/login")
-    role = db.query(Role).filter(Role.id == user.role_id).first()
+    role = get_user_role(db, user)
     if role.id != 1:  # Only allow admin
         return RedirectResponse(url="/dashboard")
     return templates.TemplateResponse("workflow/scheduler.html", {
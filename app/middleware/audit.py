@@ -1,77 +1,88 @@
 """Audit Logging Middleware."""
 import logging
+from datetime import datetime
+from typing import Optional
 from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from sqlalchemy.orm import Session
-from app.database import SessionLocal
-from app.auth.models import AuditLog
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from app.config import get_settings
+from app.utils.audit_service import audit_writer
 from jose import jwt, JWTError
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
-class AuditMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
+AUDITED_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
 
-        # Log only state-changing methods + successful responses
-        if request.method in ["POST", "PUT", "PATCH", "DELETE"] and 200 <= response.status_code < 300:
-            try:
-                # Extract user from token
-                auth_header = request.headers.get("Authorization")
-                user_id = None
-                if auth_header and auth_header.startswith("Bearer "):
-                    token = auth_header.split(" ")[1]
-                    try:
-                        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-                        user_id = payload.get("sub")
-                        if user_id:
-                            user_id = int(user_id)
-                    except JWTError:
-                        pass
 
-                # Cookie fallback
-                if not user_id:
-                     token = request.cookies.get("access_token")
-                     if token:
-                         try:
-                            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-                            user_id = payload.get("sub")
-                            if user_id:
-                                user_id = int(user_id)
-                         except (JWTError, ValueError, TypeError) as e:
-                             logger.debug("Failed to decode cookie token for audit: %s", e)
+class AuditMiddleware:
+    """Pure ASGI audit middleware: records successful state-changing requests.
+
+    Responses are passed through untouched (streaming included); only the
+    status of http.response.start is observed.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] not in AUDITED_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        # Shared with request.state, so the auth dependency's user_id is visible here
+        state = scope.setdefault("state", {})
+        status_code = 0
 
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+        # Log only successful responses
+        if 200 <= status_code < 300:
+            try:
+                request = Request(scope)
+                # Set by the auth dependency when the endpoint authenticated; decode only otherwise
+                user_id = state.get("user_id") or self.token_user_id(request)
                 if user_id:
-                    self.log_action(user_id, request)
+                    await audit_writer.enqueue(self.audit_event(user_id, request))
             except Exception as e:
                 logger.error("Audit Log Error: %s", e)
 
-        return response
-
-    def log_action(self, user_id: int, request: Request):
-        db = SessionLocal()
-        try:
-            # Simple audit log
-            action = f"{request.method} {request.url.path}"
-            # Extract ID from path if possible, e.g. /api/properties/123
-            path_parts = request.url.path.strip("/").split("/")
-            entity_type = path_parts[1] if len(path_parts) > 1 else "Unknown"
-            entity_id = None
-            if len(path_parts) > 2 and path_parts[-1].isdigit():
-                entity_id = int(path_parts[-1])
+    @staticmethod
+    def token_user_id(request: Request) -> Optional[int]:
+        """User id from the bearer token, falling back to the access_token cookie."""
+        auth_header = request.headers.get("Authorization")
+        tokens = []
+        if auth_header and auth_header.startswith("Bearer "):
+            tokens.append(auth_header.split(" ")[1])
+        if request.cookies.get("access_token"):
+            tokens.append(request.cookies["access_token"])
+        for token in tokens:
+            try:
+                payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+                if payload.get("sub"):
+                    return int(payload["sub"])
+            except (JWTError, ValueError, TypeError) as e:
+                logger.debug("Failed to decode token for audit: %s", e)
+        return None
 
-            log = AuditLog(
-                user_id=user_id,
-                action=action,
-                entity_type=entity_type,
-                entity_id=entity_id,
-                ip_address=request.client.host
-            )
-            db.add(log)
-            db.commit()
-        except Exception as e:
-            logger.error("Failed to write audit log: %s", e)
-        finally:
-            db.close()
+    @staticmethod
+    def audit_event(user_id: int, request: Request) -> dict:
+        # Extract ID from path if possible, e.g. /api/properties/123
+        path_parts = request.url.path.strip("/").split("/")
+        entity_type = path_parts[1] if len(path_parts) > 1 else "Unknown"
+        entity_id = None
+        if len(path_parts) > 2 and path_parts[-1].isdigit():
+            entity_id = int(path_parts[-1])
+        return {
+            "user_id": user_id,
+            "action": f"{request.method} {request.url.path}",
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "ip_address": request.client.host if request.client else None,
+            "timestamp": datetime.utcnow(),
+        }
@@ -0,0 +1,79 @@
+"""Request context middleware – request id, response timing and per-request query stats."""
+import logging
+import time
+import uuid
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app import database
+from app.config import get_settings
+from app.utils import metrics, query_stats
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+REQUEST_ID_HEADER = "X-Request-ID"
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+
+class RequestContextMiddleware:
+    """Pure ASGI middleware that tags each request with an id and times it.
+
+    The id is taken from an incoming X-Request-ID header (or generated), stored
+    on request.state.request_id and echoed back. X-Response-Time reports the
+    milliseconds until the response headers were sent.
+
+    Statements run while handling the request are counted (app.utils.query_stats)
+    and reported as Server-Timing and X-DB-Query-Count. In DEBUG, a statement
+    repeated more than N_PLUS_ONE_THRESHOLD times logs a possible-N+1 warning.
+    Latency (by route template) and in-flight count feed app.utils.metrics.
+
+    A successful write makes the client's reads sticky to the primary
+    (database.replica_router), noted before the response reaches the client.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        request_id = None
+        for name, value in scope.get("headers", []):
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")[:64]
+                break
+        request_id = request_id or uuid.uuid4().hex
+        scope.setdefault("state", {})["request_id"] = request_id
+        status_code = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if database.replica_router.engines and scope["method"] in WRITE_METHODS and status_code < 400:
+                    database.replica_router.note_write(database.client_key(Request(scope)))
+                elapsed = (time.perf_counter() - start) * 1000
+                headers = MutableHeaders(scope=message)
+                headers[REQUEST_ID_HEADER] = request_id
+                headers["X-Response-Time"] = f"{elapsed:.2f}ms"
+                headers.append("Server-Timing", f"{stats.server_timing()}, app;dur={elapsed:.2f}")
+                headers["X-DB-Query-Count"] = str(stats.count)
+            await send(message)
+
+        metrics.registry.in_flight += 1
+        with query_stats.track_queries(f'{scope["method"]} {scope["path"]}') as stats:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                metrics.registry.in_flight -= 1
+                metrics.request_latency.observe(time.perf_counter() - start, scope["method"],
+                                                metrics.route_template(scope), status_code)
+                query_stats.recent_requests.add(request_id, stats)
+                if settings.DEBUG and settings.N_PLUS_ONE_THRESHOLD > 0:
+                    query_stats.warn_repeated(stats, settings.N_PLUS_ONE_THRESHOLD)
+                logger.info("%s %s %d %.2fms rid=%s queries=%d db=%.2fms", scope["method"], scope["path"],
+                            status_code, (time.perf_counter() - start) * 1000, request_id, stats.count, stats.db_ms)
@@ -1,5 +1,5 @@
-"""Accounting models – ChartOfAccount, JournalEntry, VendorBill, OwnerDistribution, BankAccount."""
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Date, Numeric, ForeignKey, Text
+"""Accounting models – ChartOfAccount, AccountingPeriod, JournalEntry, VendorBill, OwnerDistribution, BankAccount."""
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Date, Numeric, ForeignKey, Text, Index
 from sqlalchemy.sql import func
 from app.database import Base
 
@@ -32,6 +32,23 @@ class GLAccountBalance(Base):
     currency = Column(String(10), default="USD")
     created_at = Column(DateTime, server_default=func.now())
 
+    __table_args__ = (
+        Index("uq_gl_account_balances_account_period", "account_id", "period_id", unique=True),
+    )
+
+
+class AccountingPeriod(Base):
+    __tablename__ = "accounting_periods"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    tenant_org_id = Column(Integer, ForeignKey("tenant_orgs.id"))
+    period_id = Column(String(10), nullable=False, index=True)  # YYYY-MM
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=False)
+    status = Column(String(20), default="Closed")
+    closed_by = Column(Integer)
+    closed_at = Column(DateTime, server_default=func.now())
+    created_at = Column(DateTime, server_default=func.now())
+
 
 class JournalEntry(Base):
     __tablename__ = "journal_entries"
@@ -6,13 +6,16 @@ from sqlalchemy import func
 from typing import Optional
 from datetime import date, timedelta
 from dateutil.relativedelta import relativedelta
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.auth.dependencies import get_current_user
 from app.auth.models import UserAccount
+from app.utils.pagination import PageParams, paginate
+from app.utils.serialization import to_dict
 from app.modules.accounting.models import (
     ChartOfAccount, JournalEntry, JournalEntryLine,
-    GLAccountBalance, BankAccount, VendorBill, OwnerDistribution
+    GLAccountBalance, AccountingPeriod, BankAccount, VendorBill, OwnerDistribution
 )
+from app.utils import report_service, ledger_service
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/accounting", tags=["Accounting"])
@@ -26,7 +29,7 @@ def _tenant_q(q, model, user):
 
 # ─── Chart of Accounts ───
 @router.get("/chart-of-accounts")
-def list_accounts(type: Optional[str] = None, db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
+def list_accounts(type: Optional[str] = None, db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
     q = db.query(ChartOfAccount).filter(ChartOfAccount.status == "Active")
     q = _tenant_q(q, ChartOfAccount, user)
     if type:
@@ -72,61 +75,110 @@ def delete_account(acc_id: int, db: Session = Depends(get_db), user: UserAccount
 # ─── Journal Entries ───
 @router.get("/journal-entries")
 def list_journal_entries(start_date: Optional[date] = None, end_date: Optional[date] = None,
-                         skip: int = 0, limit: int = 50,
-                         db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
+                         include_lines: bool = True, include_total: bool = True, page: PageParams = Depends(),
+                         db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
+    """Newest entries first, keyset-paged on (entry_date, id). include_total=false
+    is kept as an alias of total=none; lines are added to JSON pages only."""
     q = db.query(JournalEntry)
     q = _tenant_q(q, JournalEntry, user)
     if start_date:
         q = q.filter(JournalEntry.entry_date >= start_date)
     if end_date:
         q = q.filter(JournalEntry.entry_date <= end_date)
-    total = q.count()
-    items = q.order_by(JournalEntry.entry_date.desc()).offset(skip).limit(limit).all()
-    res = []
-    for je in items:
+    if not include_total:
+        page.total = "none"
+
+    lines_by_entry = {}
+
+    def load_lines(entries):
+        for l in db.query(JournalEntryLine).filter(
+            JournalEntryLine.journal_entry_id.in_([je.id for je in entries])
+        ).order_by(JournalEntryLine.id):
+            lines_by_entry.setdefault(l.journal_entry_id, []).append(_dict(l))
+
+    def serialize(je):
         je_dict = _dict(je)
-        lines = db.query(JournalEntryLine).filter(JournalEntryLine.journal_entry_id == je.id).all()
-        je_dict["lines"] = [_dict(l) for l in lines]
-        res.append(je_dict)
-    return {"total": total, "items": res}
+        if include_lines and page.format == "json":
+            je_dict["lines"] = lines_by_entry.get(je.id, [])
+        return je_dict
+    return paginate(q, [JournalEntry.entry_date, JournalEntry.id], page, serialize,
+                    prefetch=load_lines if include_lines else None)
 
 
 @router.post("/journal-entries", status_code=201)
 def create_journal_entry(data: dict, db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
     lines_data = data.pop("lines", [])
     je = JournalEntry(**{k: v for k, v in data.items() if hasattr(JournalEntry, k)})
+    if isinstance(je.entry_date, str):
+        try:
+            je.entry_date = date.fromisoformat(je.entry_date)
+        except ValueError:
+            raise HTTPException(400, "entry_date must be an ISO date")
+    if not je.entry_date:
+        raise HTTPException(400, "entry_date is required")
     if user.tenant_org_id:
         je.tenant_org_id = user.tenant_org_id
+    je.period_id = ledger_service.period_of(je.entry_date)
+    last_closed = ledger_service.last_closed_period(db, je.tenant_org_id)
+    if last_closed and je.period_id <= last_closed:
+        raise HTTPException(400, f"Period {je.period_id} is closed")
     je.created_by = user.id
     db.add(je)
     db.flush()
     total_dr, total_cr = 0, 0
+    lines = []
     for l_data in lines_data:
         line = JournalEntryLine(**{k: v for k, v in l_data.items() if hasattr(JournalEntryLine, k)})
         line.journal_entry_id = je.id
         total_dr += float(line.debit_amount or 0)
         total_cr += float(line.credit_amount or 0)
         db.add(line)
+        lines.append(line)
     je.total_debit = total_dr
     je.total_credit = total_cr
     if abs(total_dr - total_cr) > 0.01:
         db.rollback()
         raise HTTPException(400, "Journal Entry is not balanced")
+    ledger_service.post_journal_entry(db, je, lines)
     db.commit()
     db.refresh(je)
     return _dict(je)
 
 
+# ─── Periods ───
+@router.get("/periods")
+def list_periods(db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
+    items = _tenant_q(db.query(AccountingPeriod), AccountingPeriod, user).order_by(AccountingPeriod.period_id).all()
+    return {"total": len(items), "items": [_dict(p) for p in items],
+            "last_closed": ledger_service.last_closed_period(db, user.tenant_org_id)}
+
+
+@router.post("/periods/{period_id}/close")
+def close_period(period_id: str, db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
+    result = ledger_service.close_period(db, period_id, user.tenant_org_id, closed_by=user.id)
+    if result.get("error"):
+        raise HTTPException(400, result["error"])
+    return result
+
+
+@router.get("/periods/{period_id}/balances")
+def get_period_balances(period_id: str, db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
+    q = db.query(GLAccountBalance).filter(GLAccountBalance.period_id == period_id)
+    if user.tenant_org_id:
+        q = q.join(ChartOfAccount, GLAccountBalance.account_id == ChartOfAccount.id).filter(
+            ChartOfAccount.tenant_org_id == user.tenant_org_id)
+    items = q.order_by(GLAccountBalance.account_id).all()
+    return {"period_id": period_id, "total": len(items), "items": [_dict(b) for b in items]}
+
+
 # ─── Vendor Bills ───
 @router.get("/vendor-bills")
-def list_vendor_bills(status: Optional[str] = None, skip: int = 0, limit: int = 50,
-                      db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
+def list_vendor_bills(status: Optional[str] = None, page: PageParams = Depends(),
+                      db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
     q = _tenant_q(db.query(VendorBill), VendorBill, user)
     if status:
         q = q.filter(VendorBill.status == status)
-    total = q.count()
-    items = q.order_by(VendorBill.id.desc()).offset(skip).limit(limit).all()
-    return {"total": total, "items": [_dict(b) for b in items]}
+    return paginate(q, [VendorBill.id], page, _dict)
 
 
 @router.post("/vendor-bills", status_code=201)
@@ -156,14 +208,12 @@ def update_vendor_bill(bill_id: int, data: dict, db: Session = Depends(get_db),
 
 # ─── Owner Distributions ───
 @router.get("/distributions")
-def list_distributions(owner_id: Optional[int] = None, skip: int = 0, limit: int = 50,
-                       db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
+def list_distributions(owner_id: Optional[int] = None, page: PageParams = Depends(),
+                       db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
     q = _tenant_q(db.query(OwnerDistribution), OwnerDistribution, user)
     if owner_id:
         q = q.filter(OwnerDistribution.owner_id == owner_id)
-    total = q.count()
-    items = q.order_by(OwnerDistribution.id.desc()).offset(skip).limit(limit).all()
-    return {"total": total, "items": [_dict(d) for d in items]}
+    return paginate(q, [OwnerDistribution.id], page, _dict)
 
 
 @router.post("/distributions", status_code=201)
@@ -184,7 +234,7 @@ def create_distribution(data: dict, db: Session = Depends(get_db), user: UserAcc
 
 # ─── Bank Accounts ───
 @router.get("/bank-accounts")
-def list_bank_accounts(db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
+def list_bank_accounts(db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
     q = _tenant_q(db.query(BankAccount), BankAccount, user)
     items = q.all()
     return {"total": len(items), "items": [_dict(b) for b in items]}
@@ -203,37 +253,15 @@ def create_bank_account(data: dict, db: Session = Depends(get_db), user: UserAcc
 
 # ─── Reports ───
 @router.get("/reports/balance-sheet")
-def get_balance_sheet(as_of: date = Query(...), db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
-    accounts = db.query(ChartOfAccount).filter(ChartOfAccount.account_type.in_(["Asset", "Liability", "Equity"]))
-    accounts = _tenant_q(accounts, ChartOfAccount, user).all()
-    report = []
-    for acc in accounts:
-        balance = db.query(
-            func.coalesce(func.sum(JournalEntryLine.debit_amount), 0) - func.coalesce(func.sum(JournalEntryLine.credit_amount), 0)
-        ).join(JournalEntry, JournalEntryLine.journal_entry_id == JournalEntry.id
-        ).filter(JournalEntryLine.account_id == acc.id, JournalEntry.entry_date <= as_of).scalar() or 0
-        if acc.account_type in ["Liability", "Equity"]:
-            balance = -balance
-        report.append({"account_code": acc.account_code, "account_name": acc.account_name, "type": acc.account_type, "balance": float(balance)})
+def get_balance_sheet(as_of: date = Query(...), db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
+    report = report_service.balance_sheet(db, as_of, user.tenant_org_id)
     return {"as_of": as_of, "data": report}
 
 
 @router.get("/reports/income-statement")
 def get_income_statement(start_date: date = Query(...), end_date: date = Query(...),
-                         db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
-    accounts = db.query(ChartOfAccount).filter(ChartOfAccount.account_type.in_(["Revenue", "Expense"]))
-    accounts = _tenant_q(accounts, ChartOfAccount, user).all()
-    report = []
-    for acc in accounts:
-        balance = db.query(
-            func.coalesce(func.sum(JournalEntryLine.credit_amount), 0) - func.coalesce(func.sum(JournalEntryLine.debit_amount), 0)
-        ).join(JournalEntry, JournalEntryLine.journal_entry_id == JournalEntry.id
-        ).filter(JournalEntryLine.account_id == acc.id,
-                 JournalEntry.entry_date >= start_date, JournalEntry.entry_date <= end_date
-        ).scalar() or 0
-        if acc.account_type == "Expense":
-            balance = -balance
-        report.append({"account_code": acc.account_code, "account_name": acc.account_name, "type": acc.account_type, "balance": float(balance)})
+                         db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
+    report = report_service.income_statement(db, start_date, end_date, user.tenant_org_id)
     total_revenue = sum(r["balance"] for r in report if r["type"] == "Revenue")
     total_expenses = sum(r["balance"] for r in report if r["type"] == "Expense")
     return {"start_date": start_date, "end_date": end_date, "data": report,
@@ -242,23 +270,12 @@ def get_income_statement(start_date: date = Query(...), end_date: date = Query(.
 
 
 @router.get("/reports/trial-balance")
-def get_trial_balance(as_of: date = Query(...), db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
-    accounts = _tenant_q(db.query(ChartOfAccount), ChartOfAccount, user).all()
-    report = []
-    total_dr, total_cr = 0, 0
-    for acc in accounts:
-        dr = db.query(func.coalesce(func.sum(JournalEntryLine.debit_amount), 0)
-        ).join(JournalEntry, JournalEntryLine.journal_entry_id == JournalEntry.id
-        ).filter(JournalEntryLine.account_id == acc.id, JournalEntry.entry_date <= as_of).scalar() or 0
-        cr = db.query(func.coalesce(func.sum(JournalEntryLine.credit_amount), 0)
-        ).join(JournalEntry, JournalEntryLine.journal_entry_id == JournalEntry.id
-        ).filter(JournalEntryLine.account_id == acc.id, JournalEntry.entry_date <= as_of).scalar() or 0
-        total_dr += float(dr)
-        total_cr += float(cr)
-        report.append({"account_code": acc.account_code, "account_name": acc.account_name,
-                        "debit": float(dr), "credit": float(cr)})
+def get_trial_balance(as_of: date = Query(...), db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
+    report = report_service.trial_balance(db, as_of, user.tenant_org_id)
+    total_dr = sum(r["debit"] for r in report)
+    total_cr = sum(r["credit"] for r in report)
     return {"as_of": as_of, "data": report, "total_debit": total_dr, "total_credit": total_cr}
 
 
 def _dict(obj):
-    return {c.name: getattr(obj, c.name) for c in obj.__table__.columns}
+    return to_dict(obj)
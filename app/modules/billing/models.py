@@ -1,5 +1,5 @@
 """Billing models – Invoice, Payment, FX, LateFee."""
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Date, Text, Numeric, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Date, Text, Numeric, ForeignKey, JSON, Index
 from sqlalchemy.sql import func
 from app.database import Base
 
@@ -68,6 +68,12 @@ class Invoice(Base):
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        Index("ix_invoices_org_status_due", "tenant_org_id", "invoice_status", "due_date"),
+        Index("ix_invoices_lease_due", "lease_id", "due_date"),
+        Index("ix_invoices_tenant_id", "tenant_id"),
+    )
+
 
 class InvoiceLine(Base):
     __tablename__ = "invoice_lines"
@@ -103,6 +109,11 @@ class Payment(Base):
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        Index("ix_payments_org_date", "tenant_org_id", "payment_date"),
+        Index("ix_payments_tenant_date", "tenant_id", "payment_date"),
+    )
+
 
 class PaymentAllocation(Base):
     __tablename__ = "payment_allocations"
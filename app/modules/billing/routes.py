@@ -1,12 +1,15 @@
 """Billing routes – invoices, payments, late fees, payment methods."""
 import logging
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, func as sqlfunc
+from sqlalchemy import or_, select, func as sqlfunc
 from typing import Optional
-from app.database import get_db
+from app.database import get_async_read_db, get_db, get_read_db
 from app.auth.dependencies import get_current_user
 from app.auth.models import UserAccount
+from app.utils.pagination import PageParams, paginate, paginate_async
+from app.utils.serialization import load_fields, parse_fields, to_dict
 from app.modules.billing.models import (
     Invoice, InvoiceLine, Payment, PaymentAllocation,
     LateFeeRule, PaymentMethod
@@ -18,19 +21,17 @@ router = APIRouter(prefix="/api/billing", tags=["Billing"])
 
 # ─── Invoices ───
 @router.get("/invoices")
-def list_invoices(status: Optional[str] = None, tenant_id: Optional[int] = None,
-                  skip: int = 0, limit: int = 50,
-                  db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
-    q = db.query(Invoice)
+async def list_invoices(status: Optional[str] = None, tenant_id: Optional[int] = None,
+                        page: PageParams = Depends(),
+                        db: AsyncSession = Depends(get_async_read_db), user: UserAccount = Depends(get_current_user)):
+    q = select(Invoice)
     if user.tenant_org_id:
-        q = q.filter(Invoice.tenant_org_id == user.tenant_org_id)
+        q = q.where(Invoice.tenant_org_id == user.tenant_org_id)
     if status:
-        q = q.filter(Invoice.invoice_status == status)
+        q = q.where(Invoice.invoice_status == status)
     if tenant_id:
-        q = q.filter(Invoice.tenant_id == tenant_id)
-    total = q.count()
-    items = q.order_by(Invoice.id.desc()).offset(skip).limit(limit).all()
-    return {"total": total, "items": [_to_dict(i) for i in items]}
+        q = q.where(Invoice.tenant_id == tenant_id)
+    return await paginate_async(db, q, [Invoice.id], page, _to_dict)
 
 
 @router.post("/invoices", status_code=201)
@@ -51,11 +52,13 @@ def create_invoice(data: dict, db: Session = Depends(get_db), user: UserAccount
 
 
 @router.get("/invoices/{inv_id}")
-def get_invoice(inv_id: int, db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
-    inv = db.query(Invoice).filter(Invoice.id == inv_id).first()
+def get_invoice(inv_id: int, fields: Optional[str] = None, db: Session = Depends(get_read_db),
+                user: UserAccount = Depends(get_current_user)):
+    selected = parse_fields(Invoice, fields)
+    inv = load_fields(db.query(Invoice), Invoice, selected).filter(Invoice.id == inv_id).first()
     if not inv:
         raise HTTPException(404, "Invoice not found")
-    d = _to_dict(inv)
+    d = to_dict(inv, selected)
     d["lines"] = [_to_dict(l) for l in db.query(InvoiceLine).filter(InvoiceLine.invoice_id == inv_id).all()]
     return d
 
@@ -97,16 +100,14 @@ def void_invoice(inv_id: int, db: Session = Depends(get_db), user: UserAccount =
 
 # ─── Payments ───
 @router.get("/payments")
-def list_payments(tenant_id: Optional[int] = None, skip: int = 0, limit: int = 50,
-                  db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
-    q = db.query(Payment)
+async def list_payments(tenant_id: Optional[int] = None, page: PageParams = Depends(),
+                        db: AsyncSession = Depends(get_async_read_db), user: UserAccount = Depends(get_current_user)):
+    q = select(Payment)
     if user.tenant_org_id:
-        q = q.filter(Payment.tenant_org_id == user.tenant_org_id)
+        q = q.where(Payment.tenant_org_id == user.tenant_org_id)
     if tenant_id:
-        q = q.filter(Payment.tenant_id == tenant_id)
-    total = q.count()
-    items = q.order_by(Payment.id.desc()).offset(skip).limit(limit).all()
-    return {"total": total, "items": [_to_dict(p) for p in items]}
+        q = q.where(Payment.tenant_id == tenant_id)
+    return await paginate_async(db, q, [Payment.id], page, _to_dict)
 
 
 @router.post("/payments", status_code=201)
@@ -137,7 +138,7 @@ def create_payment(data: dict, db: Session = Depends(get_db), user: UserAccount
 
 
 @router.get("/payments/{pmt_id}")
-def get_payment(pmt_id: int, db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
+def get_payment(pmt_id: int, db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
     pmt = db.query(Payment).filter(Payment.id == pmt_id).first()
     if not pmt:
         raise HTTPException(404, "Payment not found")
@@ -164,7 +165,7 @@ def void_payment(pmt_id: int, db: Session = Depends(get_db), user: UserAccount =
 
 # ─── Late Fee Rules ───
 @router.get("/late-fee-rules")
-def list_late_fee_rules(db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
+def list_late_fee_rules(db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
     items = db.query(LateFeeRule).all()
     return {"total": len(items), "items": [_to_dict(r) for r in items]}
 
@@ -205,7 +206,7 @@ def delete_late_fee_rule(rule_id: int, db: Session = Depends(get_db), user: User
 
 # ─── Payment Methods ───
 @router.get("/payment-methods")
-def list_payment_methods(db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
+def list_payment_methods(db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
     items = db.query(PaymentMethod).all()
     return {"total": len(items), "items": [_to_dict(m) for m in items]}
 
@@ -233,4 +234,4 @@ def update_payment_method(method_id: int, data: dict, db: Session = Depends(get_
 
 
 def _to_dict(obj):
-    return {c.name: getattr(obj, c.name) for c in obj.__table__.columns}
+    return to_dict(obj)
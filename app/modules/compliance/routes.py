@@ -3,9 +3,11 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import Optional
 from datetime import date
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.auth.dependencies import get_current_user
 from app.auth.models import UserAccount
+from app.utils.pagination import PageParams, lookup_page, paginate
+from app.utils.serialization import to_dict
 from app.modules.compliance.models import (
     ComplianceRequirement, Document, DocumentType, Inspection, ComplianceItem
 )
@@ -15,7 +17,7 @@ router = APIRouter(prefix="/api/compliance", tags=["Compliance"])
 
 # --- Requirements ---
 @router.get("/requirements")
-def list_requirements(entity_type: Optional[str] = None, db: Session = Depends(get_db),
+def list_requirements(entity_type: Optional[str] = None, db: Session = Depends(get_read_db),
                       user: UserAccount = Depends(get_current_user)):
     q = db.query(ComplianceRequirement).filter(ComplianceRequirement.is_active == True)
     if entity_type:
@@ -52,7 +54,7 @@ def update_requirement(req_id: int, data: dict, db: Session = Depends(get_db), u
 
 # --- Document Types ---
 @router.get("/document-types")
-def list_document_types(db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
+def list_document_types(db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
     items = db.query(DocumentType).all()
     return {"total": len(items), "items": [_dict(x) for x in items]}
 
@@ -91,15 +93,14 @@ def delete_document_type(dt_id: int, db: Session = Depends(get_db), user: UserAc
 
 # --- Documents ---
 @router.get("/documents")
-def list_documents(expiry_before: Optional[date] = None, db: Session = Depends(get_db),
-                   user: UserAccount = Depends(get_current_user)):
+def list_documents(expiry_before: Optional[date] = None, page: PageParams = Depends(lookup_page),
+                   db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
     q = db.query(Document)
     if expiry_before:
         q = q.filter(Document.expiry_date <= expiry_before)
     if user.tenant_org_id:
         q = q.filter(Document.tenant_org_id == user.tenant_org_id)
-    items = q.all()
-    return {"total": len(items), "items": [_dict(x) for x in items]}
+    return paginate(q, [Document.id], page, _dict, descending=False)
 
 
 @router.post("/documents", status_code=201)
@@ -115,15 +116,14 @@ def create_document(data: dict, db: Session = Depends(get_db), user: UserAccount
 
 # --- Inspections ---
 @router.get("/inspections")
-def list_inspections(status: Optional[str] = None, db: Session = Depends(get_db),
-                     user: UserAccount = Depends(get_current_user)):
+def list_inspections(status: Optional[str] = None, page: PageParams = Depends(lookup_page),
+                     db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
     q = db.query(Inspection)
     if status:
         q = q.filter(Inspection.status == status)
     if user.tenant_org_id:
         q = q.filter(Inspection.tenant_org_id == user.tenant_org_id)
-    items = q.all()
-    return {"total": len(items), "items": [_dict(x) for x in items]}
+    return paginate(q, [Inspection.id], page, _dict, descending=False)
 
 
 @router.post("/inspections", status_code=201)
@@ -153,14 +153,14 @@ def update_inspection(insp_id: int, data: dict, db: Session = Depends(get_db), u
 # --- Compliance Items ---
 @router.get("/items")
 def list_compliance_items(status: Optional[str] = None, entity_type: Optional[str] = None,
-                          db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
+                          page: PageParams = Depends(lookup_page),
+                          db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
     q = db.query(ComplianceItem)
     if status:
         q = q.filter(ComplianceItem.status == status)
     if entity_type:
         q = q.filter(ComplianceItem.entity_type == entity_type)
-    items = q.all()
-    return {"total": len(items), "items": [_dict(x) for x in items]}
+    return paginate(q, [ComplianceItem.id], page, _dict, descending=False)
 
 
 @router.post("/items", status_code=201)
@@ -186,4 +186,4 @@ def update_compliance_item(item_id: int, data: dict, db: Session = Depends(get_d
 
 
 def _dict(obj):
-    return {c.name: getattr(obj, c.name) for c in obj.__table__.columns}
+    return to_dict(obj)
@@ -4,9 +4,11 @@ from sqlalchemy.orm import Session
 from sqlalchemy import or_
 from typing import List, Optional
 from datetime import datetime
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.auth.dependencies import get_current_user
 from app.auth.models import UserAccount
+from app.utils.pagination import PageParams, lookup_page, paginate
+from app.utils.serialization import to_dict
 from app.modules.crm.models import (
     Contact, CommunicationThread, Message, Task
 )
@@ -19,7 +21,8 @@ router = APIRouter(prefix="/api/crm", tags=["CRM"])
 def list_contacts(
     search: Optional[str] = None,
     type: Optional[str] = None,
-    db: Session = Depends(get_db),
+    page: PageParams = Depends(lookup_page),
+    db: Session = Depends(get_read_db),
     user: UserAccount = Depends(get_current_user)
 ):
     q = db.query(Contact).filter(Contact.status == "Active")
@@ -31,8 +34,7 @@ def list_contacts(
             Contact.last_name.ilike(f"%{search}%"),
             Contact.email.ilike(f"%{search}%")
         ))
-    items = q.all()
-    return {"total": len(items), "items": [_dict(x) for x in items]}
+    return paginate(q, [Contact.id], page, _dict, descending=False)
 
 @router.post("/contacts", status_code=201)
 def create_contact(data: dict, db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
@@ -49,7 +51,8 @@ def create_contact(data: dict, db: Session = Depends(get_db), user: UserAccount
 @router.get("/threads")
 def list_threads(
     status: Optional[str] = None,
-    db: Session = Depends(get_db),
+    page: PageParams = Depends(lookup_page),
+    db: Session = Depends(get_read_db),
     user: UserAccount = Depends(get_current_user)
 ):
     q = db.query(CommunicationThread)
@@ -60,8 +63,7 @@ def list_threads(
     if user.tenant_org_id:
         q = q.filter(CommunicationThread.tenant_org_id == user.tenant_org_id)
         
-    items = q.order_by(CommunicationThread.updated_at.desc() if hasattr(CommunicationThread, 'updated_at') else CommunicationThread.created_at.desc()).all()
-    return {"total": len(items), "items": [_dict(x) for x in items]}
+    return paginate(q, [CommunicationThread.created_at, CommunicationThread.id], page, _dict)
 
 @router.post("/threads", status_code=201)
 def create_thread(data: dict, db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
@@ -76,7 +78,7 @@ def create_thread(data: dict, db: Session = Depends(get_db), user: UserAccount =
 
 # --- Messages ---
 @router.get("/threads/{thread_id}/messages")
-def list_messages(thread_id: int, db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
+def list_messages(thread_id: int, db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
     items = db.query(Message).filter(Message.thread_id == thread_id).order_by(Message.sent_at).all()
     return {"total": len(items), "items": [_dict(x) for x in items]}
 
@@ -103,7 +105,8 @@ def add_message(thread_id: int, data: dict, db: Session = Depends(get_db), user:
 def list_tasks(
     status: Optional[str] = None,
     assigned_to_me: bool = False,
-    db: Session = Depends(get_db),
+    page: PageParams = Depends(lookup_page),
+    db: Session = Depends(get_read_db),
     user: UserAccount = Depends(get_current_user)
 ):
     q = db.query(Task)
@@ -114,8 +117,7 @@ def list_tasks(
     elif user.tenant_org_id:
          q = q.filter(Task.tenant_org_id == user.tenant_org_id)
          
-    items = q.order_by(Task.due_date).all()
-    return {"total": len(items), "items": [_dict(x) for x in items]}
+    return paginate(q, [Task.due_date, Task.id], page, _dict, descending=False)
 
 @router.post("/tasks", status_code=201)
 def create_task(data: dict, db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
@@ -131,4 +133,4 @@ def create_task(data: dict, db: Session = Depends(get_db), user: UserAccount = D
 
 
 def _dict(obj):
-    return {c.name: getattr(obj, c.name) for c in obj.__table__.columns}
+    return to_dict(obj)
@@ -1,5 +1,5 @@
 """Leasing models – Lease, LeaseUnitLink, LeasePartyLink, RentSchedule, SecurityDeposit, etc."""
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Date, Text, Float, Numeric, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Date, Text, Float, Numeric, ForeignKey, JSON, Index
 from sqlalchemy.sql import func
 from app.database import Base
 
@@ -41,6 +41,10 @@ class Lease(Base):
     updated_by = Column(Integer)
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        Index("ix_leases_org_status_end", "tenant_org_id", "lease_status", "end_date"),
+    )
+
 
 class LeaseUnitLink(Base):
     __tablename__ = "lease_unit_links"
@@ -80,6 +84,11 @@ class RentSchedule(Base):
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        Index("ix_rent_schedules_org_due", "tenant_org_id", "due_date"),
+        Index("ix_rent_schedules_lease_due", "lease_id", "due_date"),
+    )
+
 
 class SecurityDeposit(Base):
     __tablename__ = "security_deposits"
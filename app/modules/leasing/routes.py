@@ -1,14 +1,17 @@
 """Leasing CRUD routes."""
 import logging
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import or_, select
 from typing import Optional
 from datetime import date, timedelta
 from dateutil.relativedelta import relativedelta
-from app.database import get_db
+from app.database import get_async_read_db, get_db, get_read_db
 from app.auth.dependencies import get_current_user
 from app.auth.models import UserAccount
+from app.utils.pagination import PageParams, paginate_async
+from app.utils.serialization import load_fields, parse_fields, to_dict
 from app.modules.leasing.models import Lease, RentSchedule, SecurityDeposit, LeaseUnitLink
 from app.modules.properties.models import Unit
 
@@ -17,25 +20,23 @@ router = APIRouter(prefix="/api/leases", tags=["Leasing"])
 
 
 @router.get("")
-def list_leases(search: Optional[str] = None, status: Optional[str] = None,
-                property_id: Optional[int] = None, unit_id: Optional[int] = None,
-                skip: int = 0, limit: int = 50,
-                db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
-    q = db.query(Lease).filter(Lease.is_deleted == False)
+async def list_leases(search: Optional[str] = None, status: Optional[str] = None,
+                      property_id: Optional[int] = None, unit_id: Optional[int] = None,
+                      page: PageParams = Depends(),
+                      db: AsyncSession = Depends(get_async_read_db), user: UserAccount = Depends(get_current_user)):
+    q = select(Lease).where(Lease.is_deleted == False)
     # Multi-tenant isolation
     if user.tenant_org_id:
-        q = q.filter(Lease.tenant_org_id == user.tenant_org_id)
+        q = q.where(Lease.tenant_org_id == user.tenant_org_id)
     if status:
-        q = q.filter(Lease.lease_status == status)
+        q = q.where(Lease.lease_status == status)
     if property_id:
-        q = q.filter(Lease.property_id == property_id)
+        q = q.where(Lease.property_id == property_id)
     if unit_id:
-        q = q.filter(Lease.unit_id == unit_id)
+        q = q.where(Lease.unit_id == unit_id)
     if search:
-        q = q.filter(or_(Lease.lease_number.ilike(f"%{search}%")))
-    total = q.count()
-    items = q.order_by(Lease.id.desc()).offset(skip).limit(limit).all()
-    return {"total": total, "items": [_to_dict(l) for l in items]}
+        q = q.where(or_(Lease.lease_number.ilike(f"%{search}%")))
+    return await paginate_async(db, q, [Lease.id], page, _to_dict)
 
 
 @router.post("", status_code=201)
@@ -111,11 +112,13 @@ def create_lease(data: dict, db: Session = Depends(get_db), user: UserAccount =
 
 
 @router.get("/{lease_id}")
-def get_lease(lease_id: int, db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
-    lease = db.query(Lease).filter(Lease.id == lease_id).first()
+def get_lease(lease_id: int, fields: Optional[str] = None, db: Session = Depends(get_read_db),
+              user: UserAccount = Depends(get_current_user)):
+    selected = parse_fields(Lease, fields)
+    lease = load_fields(db.query(Lease), Lease, selected).filter(Lease.id == lease_id).first()
     if not lease:
         raise HTTPException(404, "Lease not found")
-    d = _to_dict(lease)
+    d = to_dict(lease, selected)
     d["rent_schedules"] = [_to_dict(rs) for rs in db.query(RentSchedule).filter(RentSchedule.lease_id == lease_id).all()]
     d["deposits"] = [_to_dict(sd) for sd in db.query(SecurityDeposit).filter(SecurityDeposit.lease_id == lease_id).all()]
     return d
@@ -212,4 +215,4 @@ def generate_rent_schedule(db: Session, lease: Lease):
 
 
 def _to_dict(obj):
-    return {c.name: getattr(obj, c.name) for c in obj.__table__.columns}
+    return to_dict(obj)
@@ -1,5 +1,5 @@
 """Maintenance models – Request, WorkOrder, SLA, Cost, Attachment."""
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Date, Numeric, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Date, Numeric, ForeignKey, Text, Index
 from sqlalchemy.sql import func
 from app.database import Base
 
@@ -42,6 +42,10 @@ class MaintenanceRequest(Base):
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        Index("ix_maintenance_requests_org_status", "tenant_org_id", "status", "created_at"),
+    )
+
 
 class WorkOrder(Base):
     __tablename__ = "work_orders"
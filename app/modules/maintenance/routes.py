@@ -3,9 +3,11 @@ import logging
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import Optional
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.auth.dependencies import get_current_user
 from app.auth.models import UserAccount
+from app.utils.pagination import PageParams, paginate
+from app.utils.serialization import to_dict
 from app.modules.maintenance.models import (
     MaintenanceRequest, WorkOrder, MaintenanceSLA, MaintenanceAttachment
 )
@@ -17,8 +19,8 @@ router = APIRouter(prefix="/api/maintenance", tags=["Maintenance"])
 # ─── Requests ───
 @router.get("/requests")
 def list_requests(status: Optional[str] = None, priority: Optional[str] = None,
-                  property_id: Optional[int] = None, skip: int = 0, limit: int = 50,
-                  db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
+                  property_id: Optional[int] = None, page: PageParams = Depends(),
+                  db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
     q = db.query(MaintenanceRequest)
     if user.tenant_org_id:
         q = q.filter(MaintenanceRequest.tenant_org_id == user.tenant_org_id)
@@ -28,9 +30,7 @@ def list_requests(status: Optional[str] = None, priority: Optional[str] = None,
         q = q.filter(MaintenanceRequest.priority == priority)
     if property_id:
         q = q.filter(MaintenanceRequest.property_id == property_id)
-    total = q.count()
-    items = q.order_by(MaintenanceRequest.id.desc()).offset(skip).limit(limit).all()
-    return {"total": total, "items": [_to_dict(r) for r in items]}
+    return paginate(q, [MaintenanceRequest.id], page, _to_dict)
 
 
 @router.post("/requests", status_code=201)
@@ -45,7 +45,7 @@ def create_request(data: dict, db: Session = Depends(get_db), user: UserAccount
 
 
 @router.get("/requests/{req_id}")
-def get_request(req_id: int, db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
+def get_request(req_id: int, db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
     req = db.query(MaintenanceRequest).filter(MaintenanceRequest.id == req_id).first()
     if not req:
         raise HTTPException(404, "Request not found")
@@ -82,16 +82,14 @@ def escalate_request(req_id: int, data: dict, db: Session = Depends(get_db), use
 
 # ─── Work Orders ───
 @router.get("/work-orders")
-def list_work_orders(status: Optional[str] = None, skip: int = 0, limit: int = 50,
-                     db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
+def list_work_orders(status: Optional[str] = None, page: PageParams = Depends(),
+                     db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
     q = db.query(WorkOrder)
     if user.tenant_org_id:
         q = q.filter(WorkOrder.tenant_org_id == user.tenant_org_id)
     if status:
         q = q.filter(WorkOrder.status == status)
-    total = q.count()
-    items = q.order_by(WorkOrder.id.desc()).offset(skip).limit(limit).all()
-    return {"total": total, "items": [_to_dict(wo) for wo in items]}
+    return paginate(q, [WorkOrder.id], page, _to_dict)
 
 
 @router.post("/work-orders", status_code=201)
@@ -106,7 +104,7 @@ def create_work_order(data: dict, db: Session = Depends(get_db), user: UserAccou
 
 
 @router.get("/work-orders/{wo_id}")
-def get_work_order(wo_id: int, db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
+def get_work_order(wo_id: int, db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
     wo = db.query(WorkOrder).filter(WorkOrder.id == wo_id).first()
     if not wo:
         raise HTTPException(404, "Work order not found")
@@ -138,7 +136,7 @@ def delete_work_order(wo_id: int, db: Session = Depends(get_db), user: UserAccou
 
 # ─── SLA Rules ───
 @router.get("/sla-rules")
-def list_sla_rules(db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
+def list_sla_rules(db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
     items = db.query(MaintenanceSLA).all()
     return {"total": len(items), "items": [_to_dict(s) for s in items]}
 
@@ -179,7 +177,7 @@ def delete_sla_rule(sla_id: int, db: Session = Depends(get_db), user: UserAccoun
 
 # ─── Attachments ───
 @router.get("/requests/{req_id}/attachments")
-def list_attachments(req_id: int, db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
+def list_attachments(req_id: int, db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
     items = db.query(MaintenanceAttachment).filter(MaintenanceAttachment.request_id == req_id).all()
     return {"total": len(items), "items": [_to_dict(a) for a in items]}
 
@@ -195,4 +193,4 @@ def create_attachment(req_id: int, data: dict, db: Session = Depends(get_db), us
 
 
 def _to_dict(obj):
-    return {c.name: getattr(obj, c.name) for c in obj.__table__.columns}
+    return to_dict(obj)
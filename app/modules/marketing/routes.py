@@ -3,9 +3,11 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import Optional
 from datetime import datetime
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.auth.dependencies import get_current_user
 from app.auth.models import UserAccount
+from app.utils.pagination import PageParams, lookup_page, paginate
+from app.utils.serialization import to_dict
 from app.modules.marketing.models import (
     Listing, Lead, Application, ScreeningResult
 )
@@ -16,7 +18,8 @@ router = APIRouter(prefix="/api/marketing", tags=["Marketing"])
 # --- Listings ---
 @router.get("/listings")
 def list_listings(status: Optional[str] = None, is_published: Optional[bool] = None,
-                  db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
+                  page: PageParams = Depends(lookup_page),
+                  db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
     q = db.query(Listing)
     if status:
         q = q.filter(Listing.status == status)
@@ -24,8 +27,7 @@ def list_listings(status: Optional[str] = None, is_published: Optional[bool] = N
         q = q.filter(Listing.is_published == is_published)
     if user.tenant_org_id:
         q = q.filter(Listing.tenant_org_id == user.tenant_org_id)
-    items = q.all()
-    return {"total": len(items), "items": [_dict(x) for x in items]}
+    return paginate(q, [Listing.id], page, _dict, descending=False)
 
 
 @router.post("/listings", status_code=201)
@@ -54,15 +56,14 @@ def update_listing(listing_id: int, data: dict, db: Session = Depends(get_db), u
 
 # --- Leads ---
 @router.get("/leads")
-def list_leads(status: Optional[str] = None, db: Session = Depends(get_db),
-               user: UserAccount = Depends(get_current_user)):
+def list_leads(status: Optional[str] = None, page: PageParams = Depends(lookup_page),
+               db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
     q = db.query(Lead)
     if status:
         q = q.filter(Lead.lead_status == status)
     if user.tenant_org_id:
         q = q.filter(Lead.tenant_org_id == user.tenant_org_id)
-    items = q.all()
-    return {"total": len(items), "items": [_dict(x) for x in items]}
+    return paginate(q, [Lead.id], page, _dict, descending=False)
 
 
 @router.post("/leads", status_code=201)
@@ -93,15 +94,14 @@ def update_lead(lead_id: int, data: dict, db: Session = Depends(get_db), user: U
 
 # --- Applications ---
 @router.get("/applications")
-def list_applications(status: Optional[str] = None, db: Session = Depends(get_db),
-                      user: UserAccount = Depends(get_current_user)):
+def list_applications(status: Optional[str] = None, page: PageParams = Depends(lookup_page),
+                      db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
     q = db.query(Application)
     if status:
         q = q.filter(Application.status == status)
     if user.tenant_org_id:
         q = q.filter(Application.tenant_org_id == user.tenant_org_id)
-    items = q.all()
-    return {"total": len(items), "items": [_dict(x) for x in items]}
+    return paginate(q, [Application.id], page, _dict, descending=False)
 
 
 @router.post("/applications", status_code=201)
@@ -141,10 +141,10 @@ def create_screening(app_id: int, data: dict, db: Session = Depends(get_db),
 
 
 @router.get("/applications/{app_id}/screening")
-def list_screening(app_id: int, db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
+def list_screening(app_id: int, db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
     items = db.query(ScreeningResult).filter(ScreeningResult.application_id == app_id).all()
     return {"total": len(items), "items": [_dict(s) for s in items]}
 
 
 def _dict(obj):
-    return {c.name: getattr(obj, c.name) for c in obj.__table__.columns}
+    return to_dict(obj)
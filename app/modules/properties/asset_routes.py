@@ -4,16 +4,18 @@ from sqlalchemy.orm import Session
 from sqlalchemy import or_
 from typing import Optional
 from datetime import datetime
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.auth.dependencies import get_current_user
 from app.auth.models import UserAccount
+from app.utils.pagination import PageParams, lookup_page, paginate
+from app.utils.serialization import to_dict
 from app.modules.properties.models import Asset
 
 router = APIRouter(prefix="/api/assets", tags=["Assets"])
 
 
 def _asset_dict(a):
-    d = {c.name: getattr(a, c.name) for c in a.__table__.columns}
+    d = to_dict(a)
     d["is_allocated"] = a.unit_id is not None
     return d
 
@@ -24,7 +26,8 @@ def list_assets(
     status: Optional[str] = None,
     allocated: Optional[bool] = None,
     property_id: Optional[int] = None,
-    db: Session = Depends(get_db),
+    page: PageParams = Depends(lookup_page),
+    db: Session = Depends(get_read_db),
     user: UserAccount = Depends(get_current_user),
 ):
     q = db.query(Asset)
@@ -45,12 +48,11 @@ def list_assets(
         q = q.filter(Asset.unit_id.is_(None))
     if property_id:
         q = q.filter(Asset.property_id == property_id)
-    items = q.order_by(Asset.created_at.desc()).all()
-    return {"total": len(items), "items": [_asset_dict(a) for a in items]}
+    return paginate(q, [Asset.created_at, Asset.id], page, _asset_dict)
 
 
 @router.get("/{asset_id}")
-def get_asset(asset_id: int, db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
+def get_asset(asset_id: int, db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
     asset = db.query(Asset).filter(Asset.id == asset_id).first()
     if not asset:
         raise HTTPException(404, "Asset not found")
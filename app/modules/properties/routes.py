@@ -1,12 +1,15 @@
 """Property CRUD routes."""
 import logging
 from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import or_, select
 from typing import Optional
-from app.database import get_db
+from app.database import get_async_read_db, get_db, get_read_db
 from app.auth.dependencies import get_current_user
 from app.auth.models import UserAccount
+from app.utils.pagination import PageParams, lookup_page, paginate, paginate_async
+from app.utils.serialization import FastJSONResponse, load_fields, parse_fields, to_dict
 from app.modules.properties.models import (
     Property, Building, Floor, Unit, Asset, UnitAsset, Owner, Tenant, Vendor,
     PropertyOwnerLink, Region, TenantOrg
@@ -22,38 +25,35 @@ router = APIRouter(prefix="/api/properties", tags=["Properties"])
 
 
 @router.get("/tenant-orgs")
-def list_tenant_orgs(db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
-    items = db.query(TenantOrg).all()
-    return {"total": len(items), "items": [_org_dict(o) for o in items]}
+def list_tenant_orgs(page: PageParams = Depends(lookup_page), db: Session = Depends(get_read_db),
+                     user: UserAccount = Depends(get_current_user)):
+    return paginate(db.query(TenantOrg), [TenantOrg.id], page, _org_dict, descending=False)
 
 
 @router.get("")
-def list_properties(
+async def list_properties(
     search: Optional[str] = None,
     property_type: Optional[str] = None,
     status: Optional[str] = "Active",
-    skip: int = Query(0, ge=0),
-    limit: int = Query(50, ge=1, le=200),
-    db: Session = Depends(get_db),
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_read_db),
     user: UserAccount = Depends(get_current_user),
 ):
-    q = db.query(Property).filter(Property.is_deleted == False)
+    q = select(Property).where(Property.is_deleted == False)
     # Multi-tenant isolation
     if user.tenant_org_id:
-        q = q.filter(Property.tenant_org_id == user.tenant_org_id)
+        q = q.where(Property.tenant_org_id == user.tenant_org_id)
     if status:
-        q = q.filter(Property.status == status)
+        q = q.where(Property.status == status)
     if property_type:
-        q = q.filter(Property.property_type == property_type)
+        q = q.where(Property.property_type == property_type)
     if search:
-        q = q.filter(or_(
+        q = q.where(or_(
             Property.property_name.ilike(f"%{search}%"),
             Property.property_code.ilike(f"%{search}%"),
             Property.city.ilike(f"%{search}%"),
         ))
-    total = q.count()
-    items = q.order_by(Property.id.desc()).offset(skip).limit(limit).all()
-    return {"total": total, "items": [_prop_dict(p) for p in items]}
+    return await paginate_async(db, q, [Property.id], page, _prop_dict)
 
 
 @router.post("", status_code=201)
@@ -67,11 +67,14 @@ def create_property(data: dict, db: Session = Depends(get_db), user: UserAccount
 
 
 @router.get("/{prop_id}")
-def get_property(prop_id: int, db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
-    prop = db.query(Property).filter(Property.id == prop_id, Property.is_deleted == False).first()
+def get_property(prop_id: int, fields: Optional[str] = None, db: Session = Depends(get_read_db),
+                 user: UserAccount = Depends(get_current_user)):
+    selected = parse_fields(Property, fields)
+    prop = load_fields(db.query(Property), Property, selected).filter(
+        Property.id == prop_id, Property.is_deleted == False).first()
     if not prop:
         raise HTTPException(404, "Property not found")
-    return _prop_dict(prop)
+    return to_dict(prop, selected)
 
 
 @router.put("/{prop_id}")
@@ -101,20 +104,25 @@ def delete_property(prop_id: int, db: Session = Depends(get_db), user: UserAccou
 
 # --- Units ---
 @router.get("/{prop_id}/units")
-def list_units(prop_id: int, status: Optional[str] = None, db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
-    q = db.query(Unit).filter(Unit.property_id == prop_id, Unit.is_deleted == False)
+def list_units(prop_id: int, status: Optional[str] = None, fields: Optional[str] = None,
+               db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
+    selected = parse_fields(Unit, fields)
+    q = load_fields(db.query(Unit), Unit, selected).filter(Unit.property_id == prop_id, Unit.is_deleted == False)
     if status:
         q = q.filter(Unit.current_status == status)
     items = q.order_by(Unit.unit_number).all()
-    return {"total": len(items), "items": [_unit_dict(u) for u in items]}
+    return FastJSONResponse({"total": len(items), "items": [to_dict(u, selected) for u in items]})
 
 
 @router.get("/{prop_id}/units/{unit_id}")
-def get_unit(prop_id: int, unit_id: int, db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
-    unit = db.query(Unit).filter(Unit.id == unit_id, Unit.property_id == prop_id, Unit.is_deleted == False).first()
+def get_unit(prop_id: int, unit_id: int, fields: Optional[str] = None, db: Session = Depends(get_read_db),
+             user: UserAccount = Depends(get_current_user)):
+    selected = parse_fields(Unit, fields)
+    unit = load_fields(db.query(Unit), Unit, selected).filter(
+        Unit.id == unit_id, Unit.property_id == prop_id, Unit.is_deleted == False).first()
     if not unit:
         raise HTTPException(404, "Unit not found")
-    return _unit_dict(unit)
+    return to_dict(unit, selected)
 
 
 @router.post("/{prop_id}/units", status_code=201)
@@ -204,7 +212,7 @@ def generate_unit_qrcode(prop_id: int, unit_id: int, db: Session = Depends(get_d
 
 # --- Buildings ---
 @router.get("/{prop_id}/buildings")
-def list_buildings(prop_id: int, db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
+def list_buildings(prop_id: int, db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
     items = db.query(Building).filter(Building.property_id == prop_id, Building.is_deleted == False).all()
     return {"total": len(items), "items": [_bldg_dict(b) for b in items]}
 
@@ -247,7 +255,7 @@ def delete_building(prop_id: int, bldg_id: int, db: Session = Depends(get_db), u
 
 # --- Floors ---
 @router.get("/{prop_id}/buildings/{bldg_id}/floors")
-def list_floors(prop_id: int, bldg_id: int, db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
+def list_floors(prop_id: int, bldg_id: int, db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
     items = db.query(Floor).filter(Floor.building_id == bldg_id).all()
     return {"total": len(items), "items": [_floor_dict(f) for f in items]}
 
@@ -287,7 +295,7 @@ def delete_floor(prop_id: int, bldg_id: int, floor_id: int, db: Session = Depend
 
 # --- Unit Assets (nested under properties – backward compat) ---
 @router.get("/{prop_id}/units/{unit_id}/assets")
-def list_unit_assets(prop_id: int, unit_id: int, db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
+def list_unit_assets(prop_id: int, unit_id: int, db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
     items = db.query(Asset).filter(Asset.unit_id == unit_id).all()
     return {"total": len(items), "items": [_asset_dict(a) for a in items]}
 
@@ -311,13 +319,13 @@ def create_unit_asset(prop_id: int, unit_id: int, data: dict, db: Session = Depe
 
 # --- Documents ---
 @router.get("/{prop_id}/units/{unit_id}/documents")
-def list_unit_documents(prop_id: int, unit_id: int, db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
+def list_unit_documents(prop_id: int, unit_id: int, db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
     docs = db.query(Document).filter(Document.owner_entity_type == "Unit", Document.owner_entity_id == unit_id).all()
     return {"total": len(docs), "items": [_doc_dict(x) for x in docs]}
 
 
 @router.post("/{prop_id}/units/{unit_id}/documents", status_code=201)
-async def upload_unit_document(prop_id: int, unit_id: int, file: UploadFile = File(...), db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
+def upload_unit_document(prop_id: int, unit_id: int, file: UploadFile = File(...), db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
     from app.config import get_settings
     settings = get_settings()
     
@@ -344,7 +352,7 @@ async def upload_unit_document(prop_id: int, unit_id: int, file: UploadFile = Fi
 
 
 def _doc_dict(d):
-    return {c.name: getattr(d, c.name) for c in d.__table__.columns}
+    return to_dict(d)
 
 
 # --- Tenants ---
@@ -352,8 +360,8 @@ tenants_router = APIRouter(prefix="/api/tenants", tags=["Tenants"])
 
 
 @tenants_router.get("")
-def list_tenants(search: Optional[str] = None, skip: int = 0, limit: int = 50,
-                 db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
+def list_tenants(search: Optional[str] = None, page: PageParams = Depends(),
+                 db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
     q = db.query(Tenant).filter(Tenant.is_deleted == False)
     # Multi-tenant isolation
     if user.tenant_org_id:
@@ -361,9 +369,7 @@ def list_tenants(search: Optional[str] = None, skip: int = 0, limit: int = 50,
     if search:
         q = q.filter(or_(Tenant.first_name.ilike(f"%{search}%"), Tenant.last_name.ilike(f"%{search}%"),
                          Tenant.email.ilike(f"%{search}%"), Tenant.tenant_code.ilike(f"%{search}%")))
-    total = q.count()
-    items = q.offset(skip).limit(limit).all()
-    return {"total": total, "items": [_tenant_dict(t) for t in items]}
+    return paginate(q, [Tenant.id], page, _tenant_dict, descending=False)
 
 
 @tenants_router.post("", status_code=201)
@@ -376,11 +382,13 @@ def create_tenant(data: dict, db: Session = Depends(get_db), user: UserAccount =
 
 
 @tenants_router.get("/{tenant_id}")
-def get_tenant(tenant_id: int, db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
-    t = db.query(Tenant).filter(Tenant.id == tenant_id).first()
+def get_tenant(tenant_id: int, fields: Optional[str] = None, db: Session = Depends(get_read_db),
+               user: UserAccount = Depends(get_current_user)):
+    selected = parse_fields(Tenant, fields)
+    t = load_fields(db.query(Tenant), Tenant, selected).filter(Tenant.id == tenant_id).first()
     if not t:
         raise HTTPException(404, "Tenant not found")
-    return _tenant_dict(t)
+    return to_dict(t, selected)
 
 
 @tenants_router.put("/{tenant_id}")
@@ -411,12 +419,12 @@ owners_router = APIRouter(prefix="/api/owners", tags=["Owners"])
 
 
 @owners_router.get("")
-def list_owners(db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
+def list_owners(page: PageParams = Depends(lookup_page), db: Session = Depends(get_read_db),
+                user: UserAccount = Depends(get_current_user)):
     q = db.query(Owner).filter(Owner.is_deleted == False)
     if user.tenant_org_id:
         q = q.filter(Owner.tenant_org_id == user.tenant_org_id)
-    items = q.all()
-    return {"total": len(items), "items": [_owner_dict(o) for o in items]}
+    return paginate(q, [Owner.id], page, _owner_dict, descending=False)
 
 
 @owners_router.post("", status_code=201)
@@ -429,7 +437,7 @@ def create_owner(data: dict, db: Session = Depends(get_db), user: UserAccount =
 
 
 @owners_router.get("/{owner_id}")
-def get_owner(owner_id: int, db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
+def get_owner(owner_id: int, db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
     o = db.query(Owner).filter(Owner.id == owner_id, Owner.is_deleted == False).first()
     if not o:
         raise HTTPException(404, "Owner not found")
@@ -464,12 +472,12 @@ vendors_router = APIRouter(prefix="/api/vendors", tags=["Vendors"])
 
 
 @vendors_router.get("")
-def list_vendors(db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
+def list_vendors(page: PageParams = Depends(lookup_page), db: Session = Depends(get_read_db),
+                 user: UserAccount = Depends(get_current_user)):
     q = db.query(Vendor).filter(Vendor.is_deleted == False)
     if user.tenant_org_id:
         q = q.filter(Vendor.tenant_org_id == user.tenant_org_id)
-    items = q.all()
-    return {"total": len(items), "items": [_v_dict(v) for v in items]}
+    return paginate(q, [Vendor.id], page, _v_dict, descending=False)
 
 
 @vendors_router.post("", status_code=201)
@@ -482,7 +490,7 @@ def create_vendor(data: dict, db: Session = Depends(get_db), user: UserAccount =
 
 
 @vendors_router.get("/{vendor_id}")
-def get_vendor(vendor_id: int, db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
+def get_vendor(vendor_id: int, db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
     v = db.query(Vendor).filter(Vendor.id == vendor_id, Vendor.is_deleted == False).first()
     if not v:
         raise HTTPException(404, "Vendor not found")
@@ -514,9 +522,9 @@ def delete_vendor(vendor_id: int, db: Session = Depends(get_db), user: UserAccou
 
 # --- Regions ---
 @router.get("/regions")
-def list_regions(db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
+def list_regions(db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
     items = db.query(Region).all()
-    return {"total": len(items), "items": [{c.name: getattr(r, c.name) for c in r.__table__.columns} for r in items]}
+    return {"total": len(items), "items": [to_dict(r) for r in items]}
 
 
 @router.post("/regions", status_code=201)
@@ -525,33 +533,33 @@ def create_region(data: dict, db: Session = Depends(get_db), user: UserAccount =
     db.add(region)
     db.commit()
     db.refresh(region)
-    return {c.name: getattr(region, c.name) for c in region.__table__.columns}
+    return to_dict(region)
 
 
 # --- Helpers ---
 def _prop_dict(p):
-    return {c.name: getattr(p, c.name) for c in p.__table__.columns}
+    return to_dict(p)
 
 def _unit_dict(u):
-    return {c.name: getattr(u, c.name) for c in u.__table__.columns}
+    return to_dict(u)
 
 def _bldg_dict(b):
-    return {c.name: getattr(b, c.name) for c in b.__table__.columns}
+    return to_dict(b)
 
 def _floor_dict(f):
-    return {c.name: getattr(f, c.name) for c in f.__table__.columns}
+    return to_dict(f)
 
 def _asset_dict(a):
-    return {c.name: getattr(a, c.name) for c in a.__table__.columns}
+    return to_dict(a)
 
 def _tenant_dict(t):
-    return {c.name: getattr(t, c.name) for c in t.__table__.columns}
+    return to_dict(t)
 
 def _owner_dict(o):
-    return {c.name: getattr(o, c.name) for c in o.__table__.columns}
+    return to_dict(o)
 
 def _v_dict(v):
-    return {c.name: getattr(v, c.name) for c in v.__table__.columns}
+    return to_dict(v)
 
 def _org_dict(o):
-    return {c.name: getattr(o, c.name) for c in o.__table__.columns}
+    return to_dict(o)
@@ -1,12 +1,56 @@
 """System administration routes for settings and testing."""
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from pydantic import BaseModel, EmailStr
 from app.auth.dependencies import get_current_user
 from app.auth.models import UserAccount
 from app.utils.email_service import send_email
+from app.utils.audit_service import audit_writer
+from app.utils.cache_service import dashboard_cache
+from app.utils.slow_query_log import slow_query_log
+from app.utils.metrics import CONTENT_TYPE, Gauge, registry
+from app.auth.dependencies import principal_cache
+from app import database
+from app.database import engine, writer_engine
 from app.config import get_settings
 
 router = APIRouter(prefix="/api/system", tags=["System"])
+metrics_router = APIRouter(tags=["System"])
+
+
+def _pool_stats() -> dict:
+    stats = {}
+    for name, eng in (("default", engine), ("writer", writer_engine)):
+        if eng is None:
+            continue
+        for state, attr in (("checked_out", "checkedout"), ("checked_in", "checkedin"),
+                            ("overflow", "overflow"), ("size", "size")):
+            if hasattr(eng.pool, attr):
+                stats[(name, state)] = getattr(eng.pool, attr)()
+    return stats
+
+
+_CACHES = {"dashboard": dashboard_cache, "principal": principal_cache}
+
+registry.register(Gauge("db_pool_connections", "SQLAlchemy connection pool state.", ("engine", "state"), _pool_stats))
+registry.register(Gauge("db_read_replica_failures_total", "Read replica connection failures (fell back to another).",
+                        (), lambda: {(): database.replica_router.failures}, kind="counter"))
+registry.register(Gauge("audit_queue_depth", "Audit events waiting to be written.", (),
+                        lambda: {(): audit_writer.stats()["queue_depth"]}))
+registry.register(Gauge("audit_events_total", "Audit events by outcome.", ("outcome",),
+                        lambda: {(k,): audit_writer.stats()[k] for k in ("written", "dropped", "failed")},
+                        kind="counter"))
+registry.register(Gauge("cache_entries", "Entries held per in-process cache.", ("cache",),
+                        lambda: {(name,): c.stats()["entries"] for name, c in _CACHES.items()}))
+registry.register(Gauge("cache_requests_total", "Cache lookups by result.", ("cache", "result"),
+                        lambda: {k: v for name, c in _CACHES.items()
+                                 for k, v in (((name, "hit"), c.hits), ((name, "miss"), c.misses))},
+                        kind="counter"))
+
+
+@metrics_router.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus text exposition of request latency, pool, scheduler, audit and cache metrics."""
+    return Response(registry.render(), media_type=CONTENT_TYPE)
 
 class EmailTestRequest(BaseModel):
     recipient: EmailStr
@@ -33,3 +77,27 @@ async def test_email(req: EmailTestRequest, user: UserAccount = Depends(get_curr
         return {"message": f"Test email sent to {req.recipient}"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Email failed: {str(e)}")
+
+
+@router.get("/audit-writer")
+def audit_writer_stats(user: UserAccount = Depends(get_current_user)):
+    if user.role_id != 1:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return audit_writer.stats()
+
+
+@router.get("/slow-queries")
+def slow_queries(limit: int = Query(20, ge=1, le=500), user: UserAccount = Depends(get_current_user)):
+    """Slowest statement shapes by total time, with their last route, tenant and EXPLAIN plan."""
+    if user.role_id != 1:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    settings = get_settings()
+    return {"threshold_ms": settings.SLOW_QUERY_MS, "items": slow_query_log.top(limit)}
+
+
+@router.delete("/slow-queries")
+def reset_slow_queries(user: UserAccount = Depends(get_current_user)):
+    if user.role_id != 1:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    slow_query_log.clear()
+    return {"message": "Slow query log cleared"}
@@ -1,5 +1,5 @@
 """Utilities module models."""
-from sqlalchemy import Column, Integer, String, Text, Numeric, Date, DateTime, ForeignKey, func
+from sqlalchemy import Column, Integer, String, Text, Numeric, Date, DateTime, ForeignKey, func, Index
 from app.database import Base
 
 
@@ -24,3 +24,7 @@ class UtilityReading(Base):
     notes = Column(Text)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        Index("ix_utility_readings_org_date", "tenant_org_id", "reading_date"),
+    )
@@ -3,16 +3,18 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy import or_
 from typing import Optional
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.auth.dependencies import get_current_user
 from app.auth.models import UserAccount
+from app.utils.pagination import PageParams, lookup_page, paginate
+from app.utils.serialization import to_dict
 from app.modules.utilities.models import UtilityReading
 
 router = APIRouter(prefix="/api/utilities", tags=["Utilities"])
 
 
 def _reading_dict(r):
-    return {c.name: getattr(r, c.name) for c in r.__table__.columns}
+    return to_dict(r)
 
 
 @router.get("")
@@ -22,7 +24,8 @@ def list_readings(
     property_id: Optional[int] = None,
     unit_id: Optional[int] = None,
     search: Optional[str] = None,
-    db: Session = Depends(get_db),
+    page: PageParams = Depends(lookup_page),
+    db: Session = Depends(get_read_db),
     user: UserAccount = Depends(get_current_user),
 ):
     q = db.query(UtilityReading)
@@ -41,12 +44,11 @@ def list_readings(
             UtilityReading.meter_number.ilike(f"%{search}%"),
             UtilityReading.utility_type.ilike(f"%{search}%"),
         ))
-    items = q.order_by(UtilityReading.reading_date.desc()).all()
-    return {"total": len(items), "items": [_reading_dict(r) for r in items]}
+    return paginate(q, [UtilityReading.reading_date, UtilityReading.id], page, _reading_dict)
 
 
 @router.get("/{reading_id}")
-def get_reading(reading_id: int, db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
+def get_reading(reading_id: int, db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
     r = db.query(UtilityReading).filter(UtilityReading.id == reading_id).first()
     if not r:
         raise HTTPException(404, "Reading not found")
@@ -1,12 +1,14 @@
 """Workflow API routes."""
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional, Any
 from pydantic import BaseModel, Field
 from datetime import datetime
-from app.database import get_db
+from app.database import get_async_db, get_db, get_read_db
 from app.auth.dependencies import get_current_user
 from app.auth.models import UserAccount
+from app.utils.serialization import to_dict
 from app.modules.workflow.models import (
     WorkflowDefinition, WorkflowExecutionLog, JobSchedule, JobExecutionLog
 )
@@ -43,7 +45,7 @@ class JobUpdate(BaseModel):
 @router.get("/definitions")
 def list_workflows(
     is_active: Optional[bool] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     user: UserAccount = Depends(get_current_user)
 ):
     q = db.query(WorkflowDefinition)
@@ -70,7 +72,7 @@ def create_workflow(data: dict, db: Session = Depends(get_db), user: UserAccount
 @router.get("/execution-logs")
 def list_logs(
     status: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     user: UserAccount = Depends(get_current_user)
 ):
     q = db.query(WorkflowExecutionLog)
@@ -87,7 +89,7 @@ def list_logs(
 
 # --- Job Schedules ---
 @router.get("/jobs")
-def list_jobs(db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
+def list_jobs(db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
     q = db.query(JobSchedule)
     if user.tenant_org_id:
         q = q.filter(JobSchedule.tenant_org_id == user.tenant_org_id)
@@ -135,8 +137,9 @@ def delete_job(job_id: int, db: Session = Depends(get_db), user: UserAccount = D
 
 
 @router.post("/jobs/{job_id}/run")
-async def run_job_now(job_id: int, db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
-    j = db.query(JobSchedule).filter(JobSchedule.id == job_id).first()
+async def run_job_now(job_id: int, db: AsyncSession = Depends(get_async_db),
+                      user: UserAccount = Depends(get_current_user)):
+    j = await db.get(JobSchedule, job_id)
     if not j: raise HTTPException(404, "Job not found")
     # Trigger manually in background
     await scheduler._execute_job_wrapper(job_id)
@@ -144,10 +147,10 @@ async def run_job_now(job_id: int, db: Session = Depends(get_db), user: UserAcco
 
 
 @router.get("/jobs/{job_id}/logs")
-def get_job_logs(job_id: int, db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
+def get_job_logs(job_id: int, db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
     items = db.query(JobExecutionLog).filter(JobExecutionLog.job_id == job_id).order_by(JobExecutionLog.triggered_at.desc()).limit(50).all()
     return {"total": len(items), "items": [_dict(x) for x in items]}
 
 
 def _dict(obj):
-    return {c.name: getattr(obj, c.name) for c in obj.__table__.columns}
+    return to_dict(obj)
@@ -0,0 +1,149 @@
+"""Batched audit log writer – bounded in-memory queue drained by a background task."""
+import asyncio
+import logging
+import time
+from typing import Optional
+from sqlalchemy import insert
+from app.database import SessionLocal
+from app.auth.models import AuditLog
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class AuditWriter:
+    """Collects audit events off the request path and bulk-inserts them.
+
+    Events are queued on a bounded asyncio.Queue and written by one drain task
+    whenever batch_size events are waiting or flush_interval seconds have
+    passed. A full queue makes the producer wait up to enqueue_timeout seconds
+    (back-pressure) before the event is dropped and counted. Until start() has
+    run (e.g. no lifespan), events are written directly, one per call.
+    """
+
+    def __init__(self, max_queue: int = 10000, batch_size: int = 200, flush_interval: float = 1.0,
+                 enqueue_timeout: float = 0.5):
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._inflight: Optional[asyncio.Future] = None
+        self._collecting: list[dict] = []
+        self.enqueued = self.written = self.dropped = self.failed = 0
+        self.full_waits = self.batches = self.high_water = 0
+        self.last_batch_ms = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._task = asyncio.create_task(self._drain())
+        logger.info("Audit writer started (batch=%d, interval=%.1fs)", self.batch_size, self.flush_interval)
+
+    async def stop(self):
+        """Stop the drain task, then write everything it held or that is still queued."""
+        if not self.running:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        if self._inflight is not None:
+            await self._inflight
+        if self._collecting:
+            await asyncio.to_thread(self._write, self._collecting)
+        self._collecting = []
+        await self.flush()
+        self._task = None
+        logger.info("Audit writer stopped (%d written, %d dropped)", self.written, self.dropped)
+
+    async def enqueue(self, event: dict):
+        if not self.running:
+            await asyncio.to_thread(self._write, [event])
+            return
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.full_waits += 1
+            try:
+                await asyncio.wait_for(self._queue.put(event), timeout=self.enqueue_timeout)
+            except asyncio.TimeoutError:
+                self.dropped += 1
+                logger.warning("Audit queue full – dropped event %s", event.get("action"))
+                return
+        self.enqueued += 1
+        self.high_water = max(self.high_water, self._queue.qsize())
+
+    async def flush(self):
+        """Write whatever is queued right now, in batches."""
+        while self._queue is not None and not self._queue.empty():
+            batch = [self._queue.get_nowait() for _ in range(min(self.batch_size, self._queue.qsize()))]
+            await asyncio.to_thread(self._write, batch)
+
+    async def _drain(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            self._collecting = [await self._queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(self._collecting) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                # Not asyncio.wait_for: on 3.11 it swallows a stop() cancel that races with a completed get
+                getter = asyncio.ensure_future(self._queue.get())
+                try:
+                    await asyncio.wait((getter,), timeout=timeout)
+                except asyncio.CancelledError:
+                    if getter.done():
+                        self._collecting.append(getter.result())  # written by stop()
+                    else:
+                        getter.cancel()
+                    raise
+                if not getter.done():
+                    getter.cancel()  # an event that just arrived stays queued for the next batch
+                    break
+                self._collecting.append(getter.result())
+            batch, self._collecting = self._collecting, []
+            # Shielded so a shutdown cancel never abandons a half-written batch
+            self._inflight = asyncio.ensure_future(asyncio.to_thread(self._write, batch))
+            await asyncio.shield(self._inflight)
+            self._inflight = None
+
+    def _write(self, batch: list[dict]):
+        t0 = time.perf_counter()
+        db = SessionLocal()
+        try:
+            db.execute(insert(AuditLog), batch)
+            db.commit()
+            self.written += len(batch)
+            self.batches += 1
+        except Exception as e:
+            db.rollback()
+            self.failed += len(batch)
+            logger.error("Failed to write %d audit logs: %s", len(batch), e)
+        finally:
+            db.close()
+            self.last_batch_ms = round((time.perf_counter() - t0) * 1000, 2)
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running, "queue_depth": self._queue.qsize() if self._queue else 0,
+            "max_queue": self.max_queue, "high_water": self.high_water, "enqueued": self.enqueued,
+            "written": self.written, "batches": self.batches, "dropped": self.dropped, "failed": self.failed,
+            "full_waits": self.full_waits, "last_batch_ms": self.last_batch_ms,
+        }
+
+
+audit_writer = AuditWriter(
+    max_queue=settings.AUDIT_QUEUE_SIZE,
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+)
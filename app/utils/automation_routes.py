@@ -7,7 +7,7 @@ from app.database import get_db
 from app.auth.dependencies import get_current_user
 from app.auth.models import UserAccount
 from app.utils.lease_service import detect_expiring_leases, renew_lease, auto_terminate_expired
-from app.utils.billing_service import generate_invoices_for_today, apply_late_fees
+from app.utils.billing_service import generate_invoices, run_late_fees
 
 router = APIRouter(prefix="/api/automation", tags=["Automation"])
 
@@ -37,12 +37,15 @@ def api_auto_terminate(user: UserAccount = Depends(get_current_user)):
 
 
 @router.post("/generate-invoices")
-def api_generate_invoices(user: UserAccount = Depends(get_current_user)):
-    count = generate_invoices_for_today()
-    return {"invoices_created": count}
+def api_generate_invoices(start_date: Optional[date] = None, end_date: Optional[date] = None,
+                          user: UserAccount = Depends(get_current_user)):
+    result = generate_invoices(start_date, end_date)
+    if result.get("error"):
+        raise HTTPException(400, result["error"])
+    return result
 
 
 @router.post("/apply-late-fees")
-def api_apply_late_fees(user: UserAccount = Depends(get_current_user)):
-    count = apply_late_fees()
-    return {"fees_applied": count}
+def api_apply_late_fees(dry_run: bool = False, as_of: Optional[date] = None,
+                        user: UserAccount = Depends(get_current_user)):
+    return run_late_fees(as_of=as_of, dry_run=dry_run)
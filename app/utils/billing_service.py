@@ -1,8 +1,9 @@
 """Automated billing – rent invoice generation + late fee application."""
 import logging
 from datetime import date, timedelta
+from typing import Callable, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, insert, select, update, bindparam, or_
 from app.database import SessionLocal
 from app.modules.leasing.models import Lease, RentSchedule
 from app.modules.billing.models import Invoice, InvoiceLine, LateFeeRule
@@ -10,122 +11,200 @@ from app.modules.billing.models import Invoice, InvoiceLine, LateFeeRule
 logger = logging.getLogger(__name__)
 
 
-def generate_invoices_for_today():
-    """Generate invoices from rent schedules due today that haven't been billed yet."""
+def generate_invoices(start_date: Optional[date] = None, end_date: Optional[date] = None,
+                      chunk_size: int = 1000, on_progress: Optional[Callable[[dict], None]] = None) -> dict:
+    """Generate rent invoices for schedules due in [start_date, end_date].
+
+    Set-based: each chunk is one join of due schedules to their active leases
+    with an anti-join against existing invoices, followed by bulk inserts of
+    the invoices and their lines, committed per chunk. Invoice numbers are
+    derived from lease number + due date, so a rerun (or a run over a range
+    that overlaps an earlier one) only fills in what is missing.
+
+    Returns {"error": ...} for an invalid range; anything else that fails
+    rolls back the current chunk and raises.
+    """
+    today = date.today()
+    start_date = start_date or today
+    end_date = end_date or start_date
+    if end_date < start_date:
+        return {"error": "end_date must not be before start_date"}
     db = SessionLocal()
+    summary = {"start_date": str(start_date), "end_date": str(end_date), "invoices_created": 0, "chunks": 0}
     try:
-        today = date.today()
-        schedules = db.query(RentSchedule).filter(
-            RentSchedule.due_date == today,
-            RentSchedule.status.in_(["Scheduled", "Pending"])
-        ).all()
-
-        created = 0
-        for sched in schedules:
-            lease = db.query(Lease).filter(Lease.id == sched.lease_id).first()
-            if not lease or lease.lease_status not in ("Active", "Renewed"):
-                continue
-
-            # Check if invoice already exists for this schedule
-            existing = db.query(Invoice).filter(
-                Invoice.lease_id == lease.id,
-                Invoice.due_date == sched.due_date
-            ).first()
-            if existing:
-                continue
-
-            inv = Invoice(
-                tenant_org_id=lease.tenant_org_id,
-                tenant_id=lease.tenant_id,
-                property_id=lease.property_id,
-                lease_id=lease.id,
-                invoice_number=f"INV-{lease.lease_number}-{today.strftime('%Y%m%d')}",
-                invoice_date=today,
-                due_date=sched.due_date,
-                total_amount=float(sched.amount_due or 0),
-                currency=lease.base_rent_currency or "USD",
-                invoice_status="Posted"
-            )
-            db.add(inv)
-            db.flush()
-
-            line = InvoiceLine(
-                invoice_id=inv.id,
-                description=f"Rent – {sched.due_date.strftime('%B %Y')}",
-                quantity=1,
-                unit_price=float(sched.amount_due or 0),
-                line_total=float(sched.amount_due or 0)
-            )
-            db.add(line)
-            sched.status = "Invoiced"
-            created += 1
-
-        db.commit()
-        logger.info("Auto-billing: created %d invoices", created)
-        return created
-    except Exception as e:
+        amount = func.coalesce(RentSchedule.total_amount, RentSchedule.scheduled_amount)
+        already_invoiced = select(Invoice.id).where(
+            Invoice.lease_id == RentSchedule.lease_id, Invoice.due_date == RentSchedule.due_date
+        ).exists()
+        due_q = db.query(
+            RentSchedule.id, RentSchedule.due_date, amount, RentSchedule.currency,
+            Lease.id, Lease.lease_number, Lease.tenant_org_id, Lease.tenant_id,
+            Lease.property_id, Lease.unit_id, Lease.base_rent_currency,
+        ).join(Lease, Lease.id == RentSchedule.lease_id).filter(
+            RentSchedule.due_date >= start_date,
+            RentSchedule.due_date <= end_date,
+            Lease.lease_status.in_(["Active", "Renewed"]),
+            Lease.is_deleted == False,
+            ~already_invoiced,
+        ).order_by(RentSchedule.id)
+
+        last_id = 0
+        while True:
+            rows = due_q.filter(RentSchedule.id > last_id).limit(chunk_size).all()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+
+            invoices, lines = [], {}
+            for (_, due, amt, sched_ccy, lease_id, lease_number, org_id, tenant_id,
+                 property_id, unit_id, lease_ccy) in rows:
+                amt = float(amt or 0)
+                number = f"INV-{lease_number}-{due.strftime('%Y%m%d')}"
+                invoices.append({
+                    "tenant_org_id": org_id, "tenant_id": tenant_id, "property_id": property_id,
+                    "unit_id": unit_id, "lease_id": lease_id, "invoice_number": number,
+                    "invoice_type": "Rent", "invoice_date": today, "due_date": due,
+                    "document_currency": sched_ccy or lease_ccy or "USD", "document_amount": amt,
+                    "total_amount": amt, "invoice_status": "Posted",
+                })
+                lines[number] = {
+                    "description": f"Rent – {due.strftime('%B %Y')}", "charge_type": "Rent",
+                    "quantity": 1, "unit_price": amt, "line_amount": amt, "line_total_amount": amt,
+                }
+
+            db.execute(insert(Invoice), invoices)
+            ids = db.query(Invoice.invoice_number, Invoice.id).filter(
+                Invoice.invoice_number.in_(list(lines))).all()
+            db.execute(insert(InvoiceLine), [{"invoice_id": inv_id, **lines[number]} for number, inv_id in ids])
+            db.commit()
+
+            summary["invoices_created"] += len(invoices)
+            summary["chunks"] += 1
+            progress = {**summary, "last_schedule_id": last_id}
+            logger.info("Auto-billing: chunk %d committed %d invoices (%d total)",
+                        summary["chunks"], len(invoices), summary["invoices_created"])
+            if on_progress:
+                on_progress(progress)
+
+        logger.info("Auto-billing: created %d invoices for %s..%s",
+                    summary["invoices_created"], start_date, end_date)
+        return summary
+    except Exception:
         db.rollback()
-        logger.error("Auto-billing error: %s", e)
-        return 0
+        logger.exception("Auto-billing failed after %d invoices", summary["invoices_created"])
+        raise
     finally:
         db.close()
 
 
-def apply_late_fees():
-    """Apply late fees to overdue invoices based on rules."""
-    db = SessionLocal()
+def generate_invoices_for_today():
+    """Generate invoices from rent schedules due today that haven't been billed yet."""
     try:
-        today = date.today()
-        rules = db.query(LateFeeRule).filter(LateFeeRule.is_active == True).all()
-        applied = 0
-
-        for rule in rules:
-            grace_days = rule.grace_period_days or 5
-            cutoff = today - timedelta(days=grace_days)
-
-            overdue = db.query(Invoice).filter(
-                Invoice.due_date <= cutoff,
-                Invoice.invoice_status.in_(["Posted", "PartiallyPaid"]),
-                Invoice.tenant_org_id == rule.tenant_org_id
-            ).all()
-
-            for inv in overdue:
-                # Check if late fee already applied
-                existing_fee = db.query(InvoiceLine).filter(
-                    InvoiceLine.invoice_id == inv.id,
-                    InvoiceLine.description.like("%Late Fee%")
-                ).first()
-                if existing_fee:
-                    continue
+        return generate_invoices(date.today(), date.today())["invoices_created"]
+    except Exception:
+        return 0  # logged by generate_invoices
 
-                if rule.fee_type == "Flat":
-                    fee = float(rule.flat_fee or 0)
-                elif rule.fee_type == "Percentage":
-                    fee = float(inv.total_amount or 0) * float(rule.percentage or 0) / 100
-                else:
-                    continue
 
-                if rule.max_fee and fee > float(rule.max_fee):
-                    fee = float(rule.max_fee)
+LATE_FEE_CHARGE = "LateFee"
+
 
+def _late_fee(rule: LateFeeRule, amount: float) -> float:
+    if rule.fee_type in ("Flat", "FlatFee"):
+        fee = float(rule.fee_value or 0)
+    elif rule.fee_type in ("Percentage", "Percent"):
+        fee = amount * float(rule.fee_value or 0) / 100
+    else:
+        return 0.0
+    if rule.max_fee_amount and fee > float(rule.max_fee_amount):
+        fee = float(rule.max_fee_amount)
+    return round(fee, 2)
+
+
+def run_late_fees(as_of: Optional[date] = None, dry_run: bool = False, chunk_size: int = 1000) -> dict:
+    """Evaluate every active late-fee rule in one pass over overdue invoices.
+
+    An invoice gets at most one late fee: the first active rule (by id) for
+    its org whose grace period has elapsed. Invoices that already carry a
+    LateFee line are excluded in SQL, so runs are idempotent. Fee lines are
+    bulk-inserted and invoice totals bumped in-database, per chunk. With
+    dry_run the fees are computed and returned without writing anything.
+    A failure rolls back the current chunk and raises.
+    """
+    as_of = as_of or date.today()
+    db = SessionLocal()
+    result = {"as_of": str(as_of), "dry_run": dry_run, "fees_applied": 0, "total_fees": 0.0, "fees": []}
+    try:
+        rules_by_org: dict[Optional[int], list[LateFeeRule]] = {}
+        for rule in db.query(LateFeeRule).filter(LateFeeRule.is_active == True).order_by(LateFeeRule.id).all():
+            rules_by_org.setdefault(rule.tenant_org_id, []).append(rule)
+        if not rules_by_org:
+            return result
+
+        min_grace = min(r.grace_period_days or 5 for rules in rules_by_org.values() for r in rules)
+        has_fee = select(InvoiceLine.id).where(
+            InvoiceLine.invoice_id == Invoice.id, InvoiceLine.charge_type == LATE_FEE_CHARGE
+        ).exists()
+        org_ids = [o for o in rules_by_org if o is not None]
+        org_filter = Invoice.tenant_org_id.in_(org_ids)
+        if None in rules_by_org:
+            org_filter = or_(org_filter, Invoice.tenant_org_id.is_(None))
+        overdue_q = db.query(Invoice.id, Invoice.tenant_org_id, Invoice.due_date, Invoice.total_amount).filter(
+            Invoice.due_date <= as_of - timedelta(days=min_grace),
+            Invoice.invoice_status.in_(["Posted", "PartiallyPaid"]),
+            org_filter,
+            ~has_fee,
+        ).order_by(Invoice.id)
+
+        bump = update(Invoice.__table__).where(Invoice.__table__.c.id == bindparam("inv_id")).values(
+            total_amount=Invoice.__table__.c.total_amount + bindparam("fee"))
+        last_id = 0
+        while True:
+            rows = overdue_q.filter(Invoice.id > last_id).limit(chunk_size).all()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+
+            fees = []
+            for inv_id, org_id, due, total in rows:
+                days_late = (as_of - due).days
+                rule = next((r for r in rules_by_org.get(org_id, []) if days_late >= (r.grace_period_days or 5)), None)
+                if not rule:
+                    continue
+                fee = _late_fee(rule, float(total or 0))
                 if fee > 0:
-                    line = InvoiceLine(
-                        invoice_id=inv.id,
-                        description=f"Late Fee ({rule.rule_name})",
-                        quantity=1,
-                        unit_price=fee,
-                        line_total=fee
-                    )
-                    db.add(line)
-                    inv.total_amount = float(inv.total_amount or 0) + fee
-                    applied += 1
-
-        db.commit()
-        logger.info("Late fees: applied %d fees", applied)
-        return applied
-    except Exception as e:
+                    fees.append({"invoice_id": inv_id, "rule_id": rule.id, "rule_name": rule.rule_name,
+                                 "days_late": days_late, "fee": fee})
+            if not fees:
+                continue
+
+            if not dry_run:
+                db.execute(insert(InvoiceLine), [{
+                    "invoice_id": f["invoice_id"], "description": f"Late Fee ({f['rule_name']})",
+                    "charge_type": LATE_FEE_CHARGE, "quantity": 1, "unit_price": f["fee"],
+                    "line_amount": f["fee"], "line_total_amount": f["fee"],
+                } for f in fees])
+                db.execute(bump, [{"inv_id": f["invoice_id"], "fee": f["fee"]} for f in fees])
+                db.commit()
+                logger.info("Late fees: chunk up to invoice %d applied %d fees", last_id, len(fees))
+
+            result["fees_applied"] += len(fees)
+            result["total_fees"] = round(result["total_fees"] + sum(f["fee"] for f in fees), 2)
+            if dry_run:
+                result["fees"].extend(fees)
+
+        logger.info("Late fees: %s %d fees", "would apply" if dry_run else "applied", result["fees_applied"])
+        return result
+    except Exception:
         db.rollback()
-        logger.error("Late fee error: %s", e)
-        return 0
+        logger.exception("Late fee run failed after %d fees", result["fees_applied"])
+        raise
     finally:
         db.close()
+
+
+def apply_late_fees():
+    """Apply late fees to overdue invoices based on rules."""
+    try:
+        return run_late_fees()["fees_applied"]
+    except Exception:
+        return 0  # logged by run_late_fees
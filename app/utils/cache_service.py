@@ -0,0 +1,170 @@
+"""In-process TTL/LRU cache for dashboard payloads with write-driven invalidation."""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from itertools import chain
+from typing import Any, Callable, Hashable, Iterable, Optional
+from sqlalchemy import column, event, or_, table, update
+from sqlalchemy.orm import Session
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Tables whose writes change at least one dashboard figure
+DASHBOARD_TABLES = {
+    "properties", "units", "leases", "rent_schedules", "invoices", "invoice_lines", "payments",
+    "maintenance_requests", "work_orders", "owner_distributions", "kpi_snapshots",
+}
+# Written by the snapshot refresh itself, so it never makes a snapshot stale
+SNAPSHOT_TABLE = "kpi_snapshots"
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire after ttl seconds.
+
+    Keys are tuples whose second element is the tenant_org_id the entry was
+    computed for, which is what invalidate_orgs() matches on.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return False, None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return True, entry[1]
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_set(self, key: Hashable, compute: Callable[[], Any]) -> tuple[bool, Any]:
+        hit, value = self.get(key)
+        if not hit:
+            value = compute()
+            self.set(key, value)
+        return hit, value
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            if self._data.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def invalidate_orgs(self, org_ids: Iterable[Optional[int]]):
+        """Drop entries for the given orgs plus cross-org (None) entries; None drops everything."""
+        org_ids = set(org_ids)
+        with self._lock:
+            if None in org_ids:
+                dropped = list(self._data)
+            else:
+                dropped = [k for k in self._data if k[1] is None or k[1] in org_ids]
+            for k in dropped:
+                del self._data[k]
+            self.invalidations += len(dropped)
+
+    def clear(self):
+        with self._lock:
+            self.invalidations += len(self._data)
+            self._data.clear()
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._data), "maxsize": self.maxsize, "ttl_seconds": self.ttl,
+            "hits": self.hits, "misses": self.misses, "hit_ratio": round(self.hit_ratio, 4),
+            "evictions": self.evictions, "invalidations": self.invalidations,
+        }
+
+
+dashboard_cache = TTLCache(maxsize=settings.DASHBOARD_CACHE_MAX_ENTRIES, ttl=settings.DASHBOARD_CACHE_TTL_SECONDS)
+
+
+# ─── Snapshot staleness: stamped on the kpi_snapshots rows by the writing transaction ───
+_snapshots = table(SNAPSHOT_TABLE, column("tenant_org_id"), column("as_of"), column("stale_since"))
+
+
+def mark_snapshots_stale(connection, org_ids: Iterable[Optional[int]], when: datetime):
+    """Stamp the KPI snapshots that a write to org_ids makes stale (see KpiSnapshot.is_stale).
+
+    The stamp is stored with the snapshot, so other processes and a restarted
+    one see it too. A write without an org (bulk statements) stales every
+    snapshot, and any write stales the cross-org (NULL) view. Rows that are
+    already stale are skipped, so only the first write after a refresh updates them.
+    """
+    org_ids = set(org_ids)
+    stmt = update(_snapshots).where(or_(_snapshots.c.stale_since.is_(None),
+                                        _snapshots.c.stale_since <= _snapshots.c.as_of))
+    if None not in org_ids:
+        stmt = stmt.where(or_(_snapshots.c.tenant_org_id.in_(org_ids), _snapshots.c.tenant_org_id.is_(None)))
+    connection.execute(stmt.values(stale_since=when))
+
+
+# ─── Invalidation: collect touched orgs per session, drop them on commit ───
+_DIRTY_KEY = "dashboard_dirty_orgs"
+_WRITTEN_KEY = "dashboard_written_orgs"
+
+
+def _collect(session, table_name: str, org_id: Optional[int]):
+    session.info.setdefault(_DIRTY_KEY, set()).add(org_id)
+    if table_name != SNAPSHOT_TABLE:
+        session.info.setdefault(_WRITTEN_KEY, set()).add(org_id)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed(session, flush_context):
+    for obj in chain(session.new, session.dirty, session.deleted):
+        table_name = getattr(obj, "__tablename__", None)
+        if table_name in DASHBOARD_TABLES:
+            _collect(session, table_name, getattr(obj, "tenant_org_id", None))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk(orm_execute_state):
+    # Bulk insert/update/delete statements carry no per-row org, so they invalidate every org
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table_name = getattr(getattr(orm_execute_state.statement, "table", None), "name", None)
+        if table_name in DASHBOARD_TABLES:
+            _collect(orm_execute_state.session, table_name, None)
+
+
+@event.listens_for(Session, "before_commit")
+def _stamp_on_commit(session):
+    session.flush()  # collect what the commit would flush too
+    written = session.info.pop(_WRITTEN_KEY, None)
+    if written:
+        mark_snapshots_stale(session.connection(), written, datetime.now())
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session):
+    orgs = session.info.pop(_DIRTY_KEY, None)
+    if orgs:
+        dashboard_cache.invalidate_orgs(orgs)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session):
+    session.info.pop(_DIRTY_KEY, None)
+    session.info.pop(_WRITTEN_KEY, None)
@@ -0,0 +1,220 @@
+"""Dashboard KPI aggregation – each dashboard payload built from a few grouped queries."""
+import logging
+import time
+from datetime import date, datetime, timedelta
+from typing import Optional
+from sqlalchemy.orm import Session
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import func, select, case, true, false, extract, or_
+from app.database import SessionLocal
+from app.dashboards.models import KpiSnapshot
+from app.modules.properties.models import Property, TenantOrg, Unit
+from app.modules.leasing.models import Lease
+from app.modules.billing.models import Invoice, Payment
+from app.modules.maintenance.models import MaintenanceRequest
+
+logger = logging.getLogger(__name__)
+
+OPEN_INVOICE_STATUSES = ["Posted", "PartiallyPaid"]
+OPEN_MAINTENANCE_STATUSES = ["New", "Acknowledged", "InProgress"]
+# Revenue horizon stored in finance snapshots; longer requests are computed live
+SNAPSHOT_REVENUE_MONTHS = 24
+
+
+def _scoped(stmt, model, tenant_org_id: Optional[int]):
+    """Apply tenant_org_id filter when scoping to an org."""
+    if tenant_org_id:
+        return stmt.where(model.tenant_org_id == tenant_org_id)
+    return stmt
+
+
+def _count_if(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def portfolio_kpis(db: Session, tenant_org_id: Optional[int] = None) -> dict:
+    """Portfolio dashboard payload in three queries.
+
+    Lease, invoice, payment and maintenance figures come from one statement of
+    conditional-aggregate scalar subqueries; unit and property counts are
+    derived from their status/type breakdowns.
+    """
+    today = date.today()
+    leases = _scoped(select(
+        _count_if(Lease.lease_status == "Active"),
+        _count_if((Lease.lease_status == "Active") & (Lease.end_date >= today)
+                  & (Lease.end_date <= today + timedelta(days=90))),
+    ), Lease, tenant_org_id).subquery()
+    invoices = _scoped(select(
+        func.coalesce(func.sum(Invoice.total_amount), 0),
+        func.coalesce(func.sum(case((Invoice.invoice_status.in_(OPEN_INVOICE_STATUSES), Invoice.total_amount),
+                                    else_=0)), 0),
+    ), Invoice, tenant_org_id).subquery()
+    revenue = _scoped(select(func.coalesce(func.sum(Payment.amount), 0)), Payment, tenant_org_id)
+    maintenance = _scoped(select(func.count(MaintenanceRequest.id)).where(
+        MaintenanceRequest.status.in_(OPEN_MAINTENANCE_STATUSES)), MaintenanceRequest, tenant_org_id)
+
+    ((active_leases, expiring, total_invoiced, outstanding, total_revenue, open_maintenance),) = db.execute(
+        select(*leases.c, *invoices.c, revenue.scalar_subquery(), maintenance.scalar_subquery())
+        .select_from(leases.join(invoices, true()))
+    ).all()
+
+    unit_statuses = dict(db.execute(_scoped(
+        select(Unit.current_status, func.count(Unit.id)).where(Unit.is_deleted == False),
+        Unit, tenant_org_id).group_by(Unit.current_status)).all())
+    prop_types = dict(db.execute(_scoped(
+        select(Property.property_type, func.count(Property.id)).where(Property.is_deleted == False),
+        Property, tenant_org_id).group_by(Property.property_type)).all())
+
+    total_units = sum(unit_statuses.values())
+    occupied = unit_statuses.get("Occupied", 0)
+    total_revenue, total_invoiced = float(total_revenue or 0), float(total_invoiced or 0)
+    return {
+        "total_properties": sum(prop_types.values()),
+        "total_units": total_units,
+        "occupied_units": occupied,
+        "vacant_units": unit_statuses.get("Vacant", 0),
+        "occupancy_rate": round((occupied / total_units * 100) if total_units > 0 else 0, 1),
+        "active_leases": int(active_leases or 0),
+        "expiring_leases_90d": int(expiring or 0),
+        "total_revenue": total_revenue,
+        "total_invoiced": total_invoiced,
+        "outstanding_amount": float(outstanding or 0),
+        "collection_rate": round(total_revenue / total_invoiced * 100, 1) if total_invoiced > 0 else 0,
+        "open_maintenance_requests": int(open_maintenance or 0),
+        "unit_status_breakdown": unit_statuses,
+        "property_type_breakdown": prop_types,
+    }
+
+
+def finance_kpis(db: Session, tenant_org_id: Optional[int] = None, months: int = 6) -> dict:
+    """Finance dashboard payload in two queries.
+
+    Aging buckets are a CASE-bucketed sum over open overdue invoices, with the
+    bucket edges precomputed as due-date cut-offs. Monthly revenue is one
+    GROUP BY year/month over the horizon; months with no payments report 0.
+    """
+    today = date.today()
+    amount = Invoice.total_amount
+    aging = _scoped(select(*[
+        func.coalesce(func.sum(case((cond, amount), else_=0)), 0) for cond in (
+            Invoice.due_date >= today - timedelta(days=30),
+            (Invoice.due_date < today - timedelta(days=30)) & (Invoice.due_date >= today - timedelta(days=60)),
+            (Invoice.due_date < today - timedelta(days=60)) & (Invoice.due_date >= today - timedelta(days=90)),
+            Invoice.due_date < today - timedelta(days=90),
+        )
+    ]).where(Invoice.invoice_status.in_(OPEN_INVOICE_STATUSES), Invoice.due_date < today), Invoice, tenant_org_id)
+    values = [float(v or 0) for v in db.execute(aging).one()]
+    buckets = dict(zip(["0-30", "31-60", "61-90", "90+"], values))
+
+    first_month = today.replace(day=1) - relativedelta(months=months - 1)
+    year, month = extract("year", Payment.payment_date), extract("month", Payment.payment_date)
+    revenue = {
+        (int(y), int(m)): float(total or 0)
+        for y, m, total in db.execute(_scoped(
+            select(year, month, func.coalesce(func.sum(Payment.amount), 0)).where(
+                Payment.payment_date >= first_month,
+                Payment.payment_date < today.replace(day=1) + relativedelta(months=1)),
+            Payment, tenant_org_id).group_by(year, month)).all()
+    }
+    monthly_revenue = []
+    for i in range(months):
+        m_start = first_month + relativedelta(months=i)
+        monthly_revenue.append({"month": m_start.strftime("%b %Y"),
+                                "revenue": revenue.get((m_start.year, m_start.month), 0.0)})
+
+    return {
+        "aging_buckets": buckets,
+        "total_arrears": sum(buckets.values()),
+        "monthly_revenue": monthly_revenue,
+    }
+
+
+def maintenance_kpis(db: Session, tenant_org_id: Optional[int] = None) -> dict:
+    """Maintenance dashboard payload – request counts by status, priority and category."""
+    base = _scoped(select(MaintenanceRequest.status, MaintenanceRequest.priority, MaintenanceRequest.category,
+                          MaintenanceRequest.sla_resolution_breached, func.count(MaintenanceRequest.id)),
+                   MaintenanceRequest, tenant_org_id)
+    by_status, by_priority, by_category = {}, {}, {}
+    total_open = sla_breached = 0
+    for status, priority, category, breached, n in db.execute(base.group_by(
+        MaintenanceRequest.status, MaintenanceRequest.priority, MaintenanceRequest.category,
+        MaintenanceRequest.sla_resolution_breached,
+    )).all():
+        by_status[status] = by_status.get(status, 0) + n
+        by_category[category] = by_category.get(category, 0) + n
+        if status in OPEN_MAINTENANCE_STATUSES:
+            by_priority[priority] = by_priority.get(priority, 0) + n
+            total_open += n
+        if breached:
+            sla_breached += n
+
+    return {
+        "total_open": total_open,
+        "sla_breached": sla_breached,
+        "by_status": by_status,
+        "by_priority": by_priority,
+        "by_category": by_category,
+    }
+
+
+# ─── KPI snapshots (read model refreshed by the scheduler) ───
+SNAPSHOT_KPIS = {
+    "portfolio": portfolio_kpis,
+    "finance": lambda db, org: finance_kpis(db, org, SNAPSHOT_REVENUE_MONTHS),
+    "maintenance": maintenance_kpis,
+}
+
+
+def refresh_kpi_snapshots(db: Session, tenant_org_ids: Optional[list] = None) -> int:
+    """Recompute and upsert snapshots for the given orgs (default: every org plus the cross-org view)."""
+    if tenant_org_ids is None:
+        tenant_org_ids = [None] + [o for (o,) in db.query(TenantOrg.id).all()]
+    existing = {
+        (s.tenant_org_id, s.kpi_key): s
+        for s in db.query(KpiSnapshot).filter(or_(
+            KpiSnapshot.tenant_org_id.in_([o for o in tenant_org_ids if o is not None]),
+            KpiSnapshot.tenant_org_id.is_(None) if None in tenant_org_ids else false(),
+        )).all()
+    }
+    refreshed = 0
+    for org_id in tenant_org_ids:
+        for key, compute in SNAPSHOT_KPIS.items():
+            # as_of is taken before reading, so a write committed mid-refresh still stales the row
+            as_of, t0 = datetime.now(), time.perf_counter()
+            payload = compute(db, org_id)
+            values = {"payload": payload, "as_of": as_of,
+                      "refresh_ms": int((time.perf_counter() - t0) * 1000)}
+            snap = existing.get((org_id, key))
+            if snap:
+                for k, v in values.items():
+                    setattr(snap, k, v)
+            else:
+                db.add(KpiSnapshot(tenant_org_id=org_id, kpi_key=key, **values))
+            refreshed += 1
+    db.commit()
+    return refreshed
+
+
+def refresh_all_kpi_snapshots() -> int:
+    """Scheduler entry point – refresh every org's snapshots in its own session."""
+    db = SessionLocal()
+    try:
+        count = refresh_kpi_snapshots(db)
+        logger.info("KPI snapshots: refreshed %d", count)
+        return count
+    except Exception as e:
+        db.rollback()
+        logger.error("KPI snapshot refresh error: %s", e)
+        return 0
+    finally:
+        db.close()
+
+
+def get_kpi_snapshot(db: Session, kpi_key: str, tenant_org_id: Optional[int] = None) -> Optional[KpiSnapshot]:
+    q = db.query(KpiSnapshot).filter(KpiSnapshot.kpi_key == kpi_key)
+    if tenant_org_id:
+        q = q.filter(KpiSnapshot.tenant_org_id == tenant_org_id)
+    else:
+        q = q.filter(KpiSnapshot.tenant_org_id.is_(None))
+    return q.order_by(KpiSnapshot.as_of.desc()).first()
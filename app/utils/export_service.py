@@ -7,7 +7,7 @@ from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import Optional
 from datetime import date
-from app.database import get_db
+from app.database import get_read_db
 from app.auth.dependencies import get_current_user
 from app.auth.models import UserAccount
 from app.modules.properties.models import Property, Unit
@@ -41,7 +41,7 @@ def _to_dict(obj):
 
 
 @router.get("/properties")
-def export_properties(db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
+def export_properties(db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
     q = db.query(Property).filter(Property.is_deleted == False)
     if user.tenant_org_id:
         q = q.filter(Property.tenant_org_id == user.tenant_org_id)
@@ -52,7 +52,7 @@ def export_properties(db: Session = Depends(get_db), user: UserAccount = Depends
 
 
 @router.get("/units")
-def export_units(property_id: Optional[int] = None, db: Session = Depends(get_db),
+def export_units(property_id: Optional[int] = None, db: Session = Depends(get_read_db),
                  user: UserAccount = Depends(get_current_user)):
     q = db.query(Unit).filter(Unit.is_deleted == False)
     if user.tenant_org_id:
@@ -66,7 +66,7 @@ def export_units(property_id: Optional[int] = None, db: Session = Depends(get_db
 
 
 @router.get("/leases")
-def export_leases(db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
+def export_leases(db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
     q = db.query(Lease)
     if user.tenant_org_id:
         q = q.filter(Lease.tenant_org_id == user.tenant_org_id)
@@ -77,7 +77,7 @@ def export_leases(db: Session = Depends(get_db), user: UserAccount = Depends(get
 
 
 @router.get("/invoices")
-def export_invoices(status: Optional[str] = None, db: Session = Depends(get_db),
+def export_invoices(status: Optional[str] = None, db: Session = Depends(get_read_db),
                     user: UserAccount = Depends(get_current_user)):
     q = db.query(Invoice)
     if user.tenant_org_id:
@@ -91,7 +91,7 @@ def export_invoices(status: Optional[str] = None, db: Session = Depends(get_db),
 
 
 @router.get("/payments")
-def export_payments(db: Session = Depends(get_db), user: UserAccount = Depends(get_current_user)):
+def export_payments(db: Session = Depends(get_read_db), user: UserAccount = Depends(get_current_user)):
     q = db.query(Payment)
     if user.tenant_org_id:
         q = q.filter(Payment.tenant_org_id == user.tenant_org_id)
@@ -0,0 +1,216 @@
+"""General-ledger period balances – incremental posting into GLAccountBalance and period close."""
+import logging
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Optional
+from dateutil.relativedelta import relativedelta
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, func, extract, insert, or_
+from sqlalchemy.exc import IntegrityError
+from app.modules.accounting.models import (
+    ChartOfAccount, AccountingPeriod, GLAccountBalance, JournalEntry, JournalEntryLine
+)
+
+logger = logging.getLogger(__name__)
+
+ZERO = Decimal("0")
+
+
+# ─── Period helpers (period_id = "YYYY-MM") ───
+def period_of(d: date) -> str:
+    return d.strftime("%Y-%m")
+
+
+def period_bounds(period_id: str) -> tuple[date, date]:
+    """First and last day of a period. Raises ValueError on a malformed id."""
+    year, month = period_id.split("-")
+    start = date(int(year), int(month), 1)
+    return start, start + relativedelta(months=1) - timedelta(days=1)
+
+
+def next_period(period_id: str) -> str:
+    return period_of(period_bounds(period_id)[0] + relativedelta(months=1))
+
+
+def prev_period(period_id: str) -> str:
+    return period_of(period_bounds(period_id)[0] - relativedelta(months=1))
+
+
+def last_closed_period(db: Session, tenant_org_id: Optional[int] = None) -> Optional[str]:
+    """Latest closed period visible to a tenant org.
+
+    Closes are always sequential, so every period up to the returned one is
+    closed and has a GLAccountBalance snapshot. A close made without a tenant
+    org covers every account, so it also counts for each org.
+    """
+    q = db.query(func.max(AccountingPeriod.period_id)).filter(AccountingPeriod.status == "Closed")
+    if tenant_org_id:
+        q = q.filter(or_(AccountingPeriod.tenant_org_id == tenant_org_id, AccountingPeriod.tenant_org_id.is_(None)))
+    else:
+        q = q.filter(AccountingPeriod.tenant_org_id.is_(None))
+    return q.scalar()
+
+
+def _account_ids(db: Session, tenant_org_id: Optional[int]):
+    q = db.query(ChartOfAccount.id)
+    if tenant_org_id:
+        q = q.filter(ChartOfAccount.tenant_org_id == tenant_org_id)
+    return q
+
+
+# ─── Incremental posting ───
+def _bump(db: Session, account_id: int, period_id: str, dr: Decimal, cr: Decimal) -> int:
+    """In-database increment of one balance row; returns the number of rows updated."""
+    return db.query(GLAccountBalance).filter(
+        GLAccountBalance.account_id == account_id, GLAccountBalance.period_id == period_id
+    ).update({
+        GLAccountBalance.debits: GLAccountBalance.debits + dr,
+        GLAccountBalance.credits: GLAccountBalance.credits + cr,
+        GLAccountBalance.closing_balance: GLAccountBalance.closing_balance + dr - cr,
+    }, synchronize_session=False)
+
+
+def post_journal_entry(db: Session, je: JournalEntry, lines: list[JournalEntryLine]):
+    """Add a journal entry's lines to its period's GLAccountBalance rows.
+
+    Existing rows are bumped with an in-database increment so concurrent
+    postings to the same account do not lose updates. A missing row opens at
+    the account's latest earlier closing balance; when a concurrent posting
+    inserts it first (unique account_id + period_id), the increment goes to
+    that row instead. The net change is also carried into the account's later
+    periods, so back-dated entries roll forward. The caller commits.
+    """
+    totals: dict[int, list[Decimal]] = {}
+    for line in lines:
+        acc = totals.setdefault(line.account_id, [ZERO, ZERO])
+        acc[0] += Decimal(str(line.debit_amount or 0))
+        acc[1] += Decimal(str(line.credit_amount or 0))
+
+    missing = [a for a, (dr, cr) in totals.items() if not _bump(db, a, je.period_id, dr, cr)]
+    if missing:
+        # New rows open at the latest earlier closing balance, however many idle months back
+        latest = db.query(
+            GLAccountBalance.account_id, func.max(GLAccountBalance.period_id).label("period_id")
+        ).filter(
+            GLAccountBalance.account_id.in_(missing), GLAccountBalance.period_id < je.period_id
+        ).group_by(GLAccountBalance.account_id).subquery()
+        prior = dict(db.query(GLAccountBalance.account_id, GLAccountBalance.closing_balance).join(
+            latest, and_(GLAccountBalance.account_id == latest.c.account_id,
+                         GLAccountBalance.period_id == latest.c.period_id)
+        ).all())
+        for account_id in missing:
+            dr, cr = totals[account_id]
+            opening = Decimal(prior.get(account_id) or 0)
+            try:
+                with db.begin_nested():
+                    db.execute(insert(GLAccountBalance).values(
+                        account_id=account_id, period_id=je.period_id, opening_balance=opening,
+                        debits=dr, credits=cr, closing_balance=opening + dr - cr,
+                    ))
+            except IntegrityError:
+                _bump(db, account_id, je.period_id, dr, cr)
+
+    for account_id, (dr, cr) in totals.items():
+        if dr != cr:
+            db.query(GLAccountBalance).filter(
+                GLAccountBalance.account_id == account_id, GLAccountBalance.period_id > je.period_id
+            ).update({
+                GLAccountBalance.opening_balance: GLAccountBalance.opening_balance + dr - cr,
+                GLAccountBalance.closing_balance: GLAccountBalance.closing_balance + dr - cr,
+            }, synchronize_session=False)
+
+
+# ─── Period close ───
+def close_period(db: Session, period_id: str, tenant_org_id: Optional[int] = None,
+                 closed_by: Optional[int] = None) -> dict:
+    """Close a period and roll its closing balances into the next period's opening.
+
+    Period activity is recomputed from the journal, so the snapshot is exact
+    even for lines that never went through post_journal_entry. The first close
+    for an org also snapshots every earlier month that has journal activity.
+    """
+    try:
+        start, end = period_bounds(period_id)
+    except (ValueError, AttributeError):
+        return {"error": "period_id must be in YYYY-MM format"}
+
+    last = last_closed_period(db, tenant_org_id)
+    if last and period_id <= last:
+        return {"error": f"Period {period_id} is already closed"}
+    if last and period_id != next_period(last):
+        return {"error": f"Period {next_period(last)} must be closed before {period_id}"}
+
+    account_ids = [a for (a,) in _account_ids(db, tenant_org_id).all()]
+    scoped = JournalEntryLine.account_id.in_(_account_ids(db, tenant_org_id))
+
+    if last:
+        first = period_id
+        opening = {a: Decimal(c or 0) for a, c in db.query(
+            GLAccountBalance.account_id, GLAccountBalance.closing_balance
+        ).filter(GLAccountBalance.period_id == last, GLAccountBalance.account_id.in_(account_ids)).all()}
+    else:
+        earliest = db.query(func.min(JournalEntry.entry_date)).join(
+            JournalEntryLine, JournalEntryLine.journal_entry_id == JournalEntry.id
+        ).filter(scoped, JournalEntry.entry_date <= end).scalar()
+        first = min(period_of(earliest), period_id) if earliest else period_id
+        opening = {}
+
+    # Monthly activity per account for every period being closed, in one grouped query
+    year, month = extract("year", JournalEntry.entry_date), extract("month", JournalEntry.entry_date)
+    activity: dict[str, dict[int, tuple[Decimal, Decimal]]] = {}
+    for account_id, y, m, dr, cr in db.query(
+        JournalEntryLine.account_id, year, month,
+        func.coalesce(func.sum(JournalEntryLine.debit_amount), 0),
+        func.coalesce(func.sum(JournalEntryLine.credit_amount), 0),
+    ).join(JournalEntry, JournalEntryLine.journal_entry_id == JournalEntry.id).filter(
+        scoped, JournalEntry.entry_date >= period_bounds(first)[0], JournalEntry.entry_date <= end,
+    ).group_by(JournalEntryLine.account_id, year, month).all():
+        activity.setdefault(f"{int(y):04d}-{int(m):02d}", {})[account_id] = (Decimal(str(dr)), Decimal(str(cr)))
+
+    following = next_period(period_id)
+    existing = {
+        (r.account_id, r.period_id): r
+        for r in db.query(GLAccountBalance).filter(
+            GLAccountBalance.period_id >= first, GLAccountBalance.period_id <= following,
+            GLAccountBalance.account_id.in_(account_ids),
+        ).all()
+    }
+    new_rows = []
+
+    closed = []
+    pid = first
+    while pid <= period_id:
+        for account_id in account_ids:
+            dr, cr = activity.get(pid, {}).get(account_id, (ZERO, ZERO))
+            op = opening.get(account_id, ZERO)
+            values = {"opening_balance": op, "debits": dr, "credits": cr, "closing_balance": round(op + dr - cr, 2)}
+            row = existing.get((account_id, pid))
+            if row:
+                for k, v in values.items():
+                    setattr(row, k, v)
+            else:
+                new_rows.append({"account_id": account_id, "period_id": pid, **values})
+            opening[account_id] = values["closing_balance"]
+        p_start, p_end = period_bounds(pid)
+        db.add(AccountingPeriod(tenant_org_id=tenant_org_id, period_id=pid, start_date=p_start,
+                                end_date=p_end, status="Closed", closed_by=closed_by))
+        closed.append(pid)
+        pid = next_period(pid)
+
+    # Roll closing balances forward; postings already made to the next period are kept
+    for account_id in account_ids:
+        op = opening.get(account_id, ZERO)
+        row = existing.get((account_id, following))
+        if row:
+            row.opening_balance = op
+            row.closing_balance = op + Decimal(row.debits or 0) - Decimal(row.credits or 0)
+        else:
+            new_rows.append({"account_id": account_id, "period_id": following, "opening_balance": op,
+                             "debits": 0, "credits": 0, "closing_balance": op})
+
+    if new_rows:
+        db.execute(insert(GLAccountBalance), new_rows)
+    db.commit()
+    logger.info("Closed periods %s for org %s (%d accounts)", closed, tenant_org_id, len(account_ids))
+    return {"period_id": period_id, "periods_closed": closed, "accounts": len(account_ids),
+            "next_period": following}
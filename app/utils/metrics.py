@@ -0,0 +1,127 @@
+"""In-process metrics in the Prometheus text exposition format."""
+import bisect
+import functools
+import time
+from typing import Callable, Iterable
+
+# Seconds; roughly the Prometheus client defaults
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by a tuple of label values.
+
+    Each label set owns one flat list [bucket counts..., +Inf count, sum];
+    observe() only bumps two of its slots, with no lock. Updates happen on the
+    event loop (or under the GIL from a worker thread), so a scrape may see a
+    sample half-applied but never a corrupted series.
+    """
+
+    def __init__(self, name: str, help_text: str, label_names: Iterable[str] = (),
+                 buckets: tuple = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, value: float, *label_values):
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series.setdefault(label_values, [0] * (len(self.buckets) + 1) + [0.0])
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for values, series in list(self._series.items()):
+            cumulative = 0
+            for bound, n in zip(self.buckets + ("+Inf",), series[:-1]):
+                cumulative += n
+                le = 'le="%s"' % bound
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, values, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, values)} {series[-1]:.6f}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, values)} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """A value read at scrape time from a callback returning {label values: number}.
+
+    kind="counter" exposes a monotonically increasing value kept elsewhere
+    (e.g. the audit writer's written count) without copying it.
+    """
+
+    def __init__(self, name: str, help_text: str, label_names: Iterable[str], collect: Callable[[], dict],
+                 kind: str = "gauge"):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(label_names)
+        self.collect = collect
+        self.kind = kind
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for values, value in self.collect().items():
+            lines.append(f"{self.name}{_labels(self.label_names, values)} {value}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: list = []
+        self.in_flight = 0
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+request_latency = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route", "status")))
+job_duration = registry.register(Histogram(
+    "scheduler_job_duration_seconds", "Scheduled job run time.", ("job", "status"),
+    buckets=(0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0, 900.0)))
+registry.register(Gauge("http_requests_in_flight", "Requests currently being handled.", (),
+                        lambda: {(): registry.in_flight}))
+
+
+def route_template(scope) -> str:
+    """The matched route's path template (e.g. /api/leases/{lease_id}); "unmatched" keeps cardinality bounded."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def timed_job(name: str, func: Callable) -> Callable:
+    """Wrap a scheduled callable so each run is observed in job_duration."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        status = "error"
+        try:
+            result = func(*args, **kwargs)
+            status = "ok"
+            return result
+        finally:
+            job_duration.observe(time.perf_counter() - start, name, status)
+    return wrapper
@@ -0,0 +1,273 @@
+"""Shared list pagination – opaque keyset cursors, optional/estimated totals and NDJSON streaming."""
+import base64
+import json
+import logging
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Callable, Literal, Optional, Sequence
+from fastapi import HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, false, func, literal, or_, select, text
+from app.utils.serialization import FastJSONResponse, dumps, load_fields, model_serializer, parse_fields
+
+logger = logging.getLogger(__name__)
+
+# Above this many rows an "estimate" total stops counting and reports the cap
+ESTIMATE_CAP = 10000
+# Rows fetched per round trip when streaming NDJSON
+STREAM_BATCH_SIZE = 500
+
+
+class PageParams:
+    """Common list query parameters: skip/limit (legacy), cursor, total mode, format and fields.
+
+    limit None (lookup lists without ?limit=) returns every row.
+    total: "exact" runs a full COUNT, "estimate" uses the planner's row
+    estimate on PostgreSQL and MySQL and a count capped at ESTIMATE_CAP
+    elsewhere, "none" skips counting. format=ndjson streams every matching row instead of a page.
+    fields is a comma-separated list of columns to select and return.
+    """
+
+    def __init__(
+        self,
+        skip: int = Query(0, ge=0),
+        limit: Optional[int] = Query(50, ge=1, le=500),
+        cursor: Optional[str] = None,
+        total: Literal["exact", "estimate", "none"] = "exact",
+        format: Literal["json", "ndjson"] = "json",
+        fields: Optional[str] = None,
+    ):
+        self.skip = skip
+        self.limit = limit
+        self.cursor = cursor
+        self.total = total
+        self.format = format
+        self.fields = fields
+
+
+def page_params(default_limit: Optional[int] = 50, max_limit: int = 500):
+    """PageParams dependency with a per-endpoint default and maximum page size.
+
+    default_limit=None returns every row unless the caller passes limit.
+    """
+    def dependency(
+        skip: int = Query(0, ge=0),
+        limit: Optional[int] = Query(default_limit, ge=1, le=max_limit),
+        cursor: Optional[str] = None,
+        total: Literal["exact", "estimate", "none"] = "exact",
+        format: Literal["json", "ndjson"] = "json",
+        fields: Optional[str] = None,
+    ) -> PageParams:
+        return PageParams(skip, limit, cursor, total, format, fields)
+    return dependency
+
+
+# Lists the UI loads whole (dropdowns, small tables): every row by default, so
+# callers that never follow next_cursor see them all; ?limit= pages them
+lookup_page = page_params(default_limit=None, max_limit=1000)
+
+
+def encode_cursor(values: Sequence) -> str:
+    # Decimals travel as strings so Numeric sort keys round-trip exactly
+    raw = json.dumps([v.isoformat() if isinstance(v, (date, datetime)) else
+                      str(v) if isinstance(v, Decimal) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: Sequence) -> list:
+    """Decode a cursor back into typed sort-key values. Raises HTTP 400 when malformed."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError("wrong arity")
+        typed = []
+        for key, value in zip(keys, values):
+            python_type = key.type.python_type
+            if python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif python_type is date:
+                value = date.fromisoformat(value)
+            elif python_type is Decimal and value is not None:
+                value = Decimal(str(value))
+            typed.append(value)
+        return typed
+    except (ValueError, TypeError, ArithmeticError, NotImplementedError, json.JSONDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _after(keys: Sequence, values: Sequence, descending: bool):
+    """Row-value comparison (k1, k2, ...) </> (v1, v2, ...) spelled out for portability.
+
+    NULLs of nullable keys are ordered last (see _order), so NULL sorts after
+    every value in either direction.
+    """
+    clauses = []
+    for i, key in enumerate(keys):
+        value = values[i]
+        if value is None:
+            step = false()
+        else:
+            step = key < value if descending else key > value
+            if key.nullable:
+                step = or_(step, key.is_(None))
+        equal = [keys[j].is_(None) if values[j] is None else keys[j] == values[j] for j in range(i)]
+        clauses.append(and_(*equal, step))
+    return or_(*clauses)
+
+
+def _order(keys: Sequence, descending: bool) -> list:
+    """ORDER BY for keys, with NULLs of nullable keys last in either direction.
+
+    Spelled as "key IS NULL, key" rather than NULLS LAST, which MySQL rejects.
+    """
+    order = []
+    for key in keys:
+        if key.nullable:
+            order.append(key.is_(None))
+        order.append(key.desc() if descending else key.asc())
+    return order
+
+
+def stream_ndjson(q, serialize: Callable, batch_size: int = STREAM_BATCH_SIZE) -> StreamingResponse:
+    """Stream every row of q as one JSON object per line.
+
+    Rows are fetched batch_size at a time with yield_per, so memory stays flat
+    no matter how many rows match.
+    """
+    def lines():
+        for row in q.yield_per(batch_size):
+            yield dumps(serialize(row)) + b"\n"
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+def stream_ndjson_async(db, stmt, serialize: Callable, batch_size: int = STREAM_BATCH_SIZE) -> StreamingResponse:
+    """stream_ndjson for an AsyncSession and a select() of one entity; rows are read as the body is sent."""
+    async def lines():
+        result = await db.stream_scalars(stmt.execution_options(yield_per=batch_size))
+        async for row in result:
+            yield dumps(serialize(row)) + b"\n"
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+def _count_statement(q, mode: str):
+    """COUNT statement for a total in mode ("estimate" caps it at ESTIMATE_CAP); q is a Query or a select()."""
+    stmt = q.statement if hasattr(q, "statement") else q
+    if mode == "estimate":
+        capped = stmt.with_only_columns(literal(1), maintain_column_froms=True).order_by(None).limit(ESTIMATE_CAP).subquery()
+        return select(func.count()).select_from(capped)
+    return select(func.count()).select_from(stmt.order_by(None).subquery())
+
+
+def _estimate_sql(bind, q) -> Optional[str]:
+    """EXPLAIN statement whose plan carries a row estimate (PostgreSQL, MySQL); None elsewhere."""
+    if bind.dialect.name not in ("postgresql", "mysql"):
+        return None
+    stmt = q.statement if hasattr(q, "statement") else q
+    sql = stmt.compile(bind, compile_kwargs={"literal_binds": True})
+    return f"EXPLAIN (FORMAT JSON) {sql}" if bind.dialect.name == "postgresql" else f"EXPLAIN {sql}"
+
+
+def _estimate_from(dialect_name: str, result) -> int:
+    if dialect_name == "postgresql":
+        return int(result.scalar()[0]["Plan"]["Plan Rows"])
+    # MySQL: the estimated output is the product of rows x filtered% over the plan's tables
+    estimate = 1.0
+    for row in result.mappings():
+        estimate *= float(row["rows"] or 0) * float(row["filtered"] or 100) / 100
+    return int(estimate)
+
+
+def count_rows(q, mode: str) -> Optional[int]:
+    if mode == "none":
+        return None
+    if mode == "estimate":
+        session = q.session
+        bind = session.get_bind()
+        explain = _estimate_sql(bind, q)
+        if explain:
+            return _estimate_from(bind.dialect.name, session.execute(text(explain)))
+        return session.execute(_count_statement(q, mode)).scalar()
+    return q.order_by(None).count()
+
+
+async def count_rows_async(db, stmt, mode: str) -> Optional[int]:
+    """count_rows for an AsyncSession and a select()."""
+    if mode == "none":
+        return None
+    if mode == "estimate":
+        bind = db.get_bind()
+        explain = _estimate_sql(bind, stmt)
+        if explain:
+            return _estimate_from(bind.dialect.name, await db.execute(text(explain)))
+    return (await db.execute(_count_statement(stmt, mode))).scalar()
+
+
+def _page_query(q, keys: Sequence, page: PageParams, serialize: Callable, descending: bool):
+    """Field projection, keyset order and cursor bound shared by paginate and paginate_async."""
+    if page.fields:
+        model = q.column_descriptions[0]["entity"]
+        fields = parse_fields(model, page.fields)
+        q = load_fields(q, model, fields, [k.key for k in keys])
+        serialize = model_serializer(model, fields)
+    ordered = q.order_by(*_order(keys, descending))
+    if page.cursor:
+        ordered = ordered.filter(_after(keys, decode_cursor(page.cursor, keys), descending))
+    return q, ordered, serialize
+
+
+def _page_response(rows: list, keys: Sequence, page: PageParams, total: Optional[int],
+                   serialize: Callable, prefetch: Optional[Callable] = None) -> FastJSONResponse:
+    more = page.limit is not None and len(rows) > page.limit
+    rows = rows[:page.limit]
+    if prefetch and rows and not page.fields:
+        prefetch(rows)
+    next_cursor = None
+    if more and rows:
+        next_cursor = encode_cursor([getattr(rows[-1], k.key) for k in keys])
+    result = {"total": total, "items": [serialize(r) for r in rows], "next_cursor": next_cursor}
+    if page.total == "estimate":
+        result["total_is_estimate"] = True
+    return FastJSONResponse(result)
+
+
+def paginate(q, keys: Sequence, page: PageParams, serialize: Callable, descending: bool = True,
+             prefetch: Optional[Callable[[list], None]] = None):
+    """Run one page of q ordered by keys (last key must be unique, e.g. the id).
+
+    With a cursor the page starts strictly after the encoded key values, so
+    deep pages cost the same as the first; without one skip/limit apply as
+    before. next_cursor is set only when more rows follow. With format=ndjson
+    the whole (cursor-bounded) result is streamed instead. The page is returned
+    as a FastJSONResponse so it skips the jsonable_encoder pass.
+
+    With page.fields only those columns (plus the sort keys) are selected and
+    returned; the route's serialize, and any computed keys it adds, is bypassed.
+
+    prefetch, when given, is called with a JSON page's rows before they are
+    serialized, so related data for the whole page can be loaded in one query.
+    """
+    q, ordered, serialize = _page_query(q, keys, page, serialize, descending)
+    if page.format == "ndjson":
+        return stream_ndjson(ordered, serialize)
+
+    total = count_rows(q, page.total)
+    if not page.cursor:
+        ordered = ordered.offset(page.skip)
+    if page.limit is not None:
+        ordered = ordered.limit(page.limit + 1)
+    return _page_response(ordered.all(), keys, page, total, serialize, prefetch)
+
+
+async def paginate_async(db, stmt, keys: Sequence, page: PageParams, serialize: Callable, descending: bool = True):
+    """paginate for an AsyncSession and a select() of one entity; same parameters and response."""
+    stmt, ordered, serialize = _page_query(stmt, keys, page, serialize, descending)
+    if page.format == "ndjson":
+        return stream_ndjson_async(db, ordered, serialize)
+
+    total = await count_rows_async(db, stmt, page.total)
+    if not page.cursor:
+        ordered = ordered.offset(page.skip)
+    if page.limit is not None:
+        ordered = ordered.limit(page.limit + 1)
+    rows = (await db.scalars(ordered)).all()
+    return _page_response(list(rows), keys, page, total, serialize)
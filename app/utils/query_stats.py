@@ -0,0 +1,116 @@
+"""Per-request query accounting – statement counts, DB time, repeated-statement (N+1) detection
+and the hand-off of slow statements to the slow query log."""
+import logging
+import time
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.config import get_settings
+from app.utils.slow_query_log import slow_query_log
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+_current: ContextVar[Optional["QueryStats"]] = ContextVar("query_stats", default=None)
+
+
+class QueryStats:
+    """Statements executed (by SQL text) and time spent in the database for one unit of work."""
+
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.tenant_org_id: Optional[int] = None  # set once the request is authenticated
+        self.count = 0
+        self.db_ms = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, elapsed_ms: float):
+        self.count += 1
+        self.db_ms += elapsed_ms
+        self.shapes[statement] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statement shapes executed more than threshold times, most frequent first."""
+        return [(sql, n) for sql, n in self.shapes.most_common() if n > threshold]
+
+    def server_timing(self) -> str:
+        noun = "query" if self.count == 1 else "queries"
+        return f'db;dur={self.db_ms:.2f};desc="{self.count} {noun}"'
+
+    def as_dict(self) -> dict:
+        return {"label": self.label, "queries": self.count, "db_ms": round(self.db_ms, 2),
+                "top_statements": [{"sql": sql[:200], "count": n} for sql, n in self.shapes.most_common(5)]}
+
+
+class _Recent:
+    """Bounded map of request id -> finished QueryStats, for tests and debugging."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._items: OrderedDict = OrderedDict()
+        self._lock = Lock()
+
+    def add(self, key: str, stats: QueryStats):
+        with self._lock:
+            self._items[key] = stats
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def get(self, key: str) -> Optional[QueryStats]:
+        with self._lock:
+            return self._items.get(key)
+
+
+recent_requests = _Recent()
+
+
+def current() -> Optional[QueryStats]:
+    return _current.get()
+
+
+@contextmanager
+def track_queries(label: str = ""):
+    """Count every statement executed (on any engine) inside the block."""
+    stats = QueryStats(label)
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def warn_repeated(stats: QueryStats, threshold: int):
+    for sql, n in stats.repeated(threshold):
+        logger.warning("Possible N+1 in %s: statement ran %d times: %s", stats.label or "request", n,
+                       " ".join(sql.split())[:300])
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None or settings.SLOW_QUERY_MS > 0:
+        conn.info.setdefault("query_stats_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("query_stats_start")
+    if not starts:
+        return
+    elapsed_ms = (time.perf_counter() - starts.pop()) * 1000
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, elapsed_ms)
+    if 0 < settings.SLOW_QUERY_MS <= elapsed_ms:
+        slow_query_log.record(conn, context, statement, parameters, executemany, elapsed_ms,
+                              stats.label if stats else None, stats.tenant_org_id if stats else None)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context):
+    starts = context.connection.info.get("query_stats_start") if context.connection is not None else None
+    if starts:
+        starts.pop()
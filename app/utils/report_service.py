@@ -0,0 +1,135 @@
+"""Financial report engine – per-account debit/credit totals from closed-period snapshots plus open journal lines."""
+import logging
+from datetime import date
+from typing import Optional, Sequence
+from sqlalchemy.orm import Session
+from sqlalchemy import func, select, union_all, or_
+from app.modules.accounting.models import ChartOfAccount, GLAccountBalance, JournalEntry, JournalEntryLine
+from app.utils.ledger_service import last_closed_period, period_of, period_bounds, next_period, prev_period
+
+logger = logging.getLogger(__name__)
+
+
+def _closed_window(db: Session, tenant_org_id: Optional[int],
+                   start_date: Optional[date], end_date: Optional[date]) -> Optional[tuple]:
+    """Closed periods lying entirely inside [start_date, end_date], as (first, last) period ids.
+
+    first is None when the range is open-ended, i.e. every closed period up to last.
+    """
+    last_closed = last_closed_period(db, tenant_org_id)
+    if not last_closed:
+        return None
+    first = None
+    if start_date:
+        first = period_of(start_date)
+        if start_date != period_bounds(first)[0]:
+            first = next_period(first)
+    last = last_closed
+    if end_date:
+        last = period_of(end_date)
+        if end_date != period_bounds(last)[1]:
+            last = prev_period(last)
+        last = min(last, last_closed)
+    if first and first > last:
+        return None
+    return first, last
+
+
+def account_balances(db: Session, tenant_org_id: Optional[int] = None,
+                     account_types: Optional[Sequence[str]] = None,
+                     start_date: Optional[date] = None, end_date: Optional[date] = None) -> list[dict]:
+    """Return debit/credit totals for every matching account.
+
+    Closed periods inside the range are read from their GLAccountBalance
+    snapshot; only journal lines outside those periods (open periods and
+    partial months at either end) are scanned. Both sources are aggregated per
+    account and outer-joined to the chart of accounts in a single statement,
+    so cost grows with accounts and periods rather than journal history.
+    Accounts without activity report zero.
+    """
+    scoped = select(ChartOfAccount.id)
+    if tenant_org_id:
+        scoped = scoped.where(ChartOfAccount.tenant_org_id == tenant_org_id)
+    window = _closed_window(db, tenant_org_id, start_date, end_date)
+
+    lines = select(
+        JournalEntryLine.account_id.label("account_id"),
+        JournalEntryLine.debit_amount.label("debit"),
+        JournalEntryLine.credit_amount.label("credit"),
+    ).join(JournalEntry, JournalEntryLine.journal_entry_id == JournalEntry.id
+    ).where(JournalEntryLine.account_id.in_(scoped))
+    if start_date:
+        lines = lines.where(JournalEntry.entry_date >= start_date)
+    if end_date:
+        lines = lines.where(JournalEntry.entry_date <= end_date)
+    parts = [lines]
+
+    if window:
+        first, last = window
+        snapshot = select(GLAccountBalance.account_id, GLAccountBalance.debits, GLAccountBalance.credits
+        ).where(GLAccountBalance.account_id.in_(scoped), GLAccountBalance.period_id <= last)
+        after = JournalEntry.entry_date > period_bounds(last)[1]
+        if first:
+            snapshot = snapshot.where(GLAccountBalance.period_id >= first)
+            parts[0] = lines.where(or_(JournalEntry.entry_date < period_bounds(first)[0], after))
+        else:
+            parts[0] = lines.where(after)
+        parts.append(snapshot)
+
+    combined = union_all(*parts).subquery() if len(parts) > 1 else parts[0].subquery()
+    totals = select(
+        combined.c.account_id,
+        func.coalesce(func.sum(combined.c.debit), 0).label("debit"),
+        func.coalesce(func.sum(combined.c.credit), 0).label("credit"),
+    ).group_by(combined.c.account_id).subquery()
+
+    q = db.query(
+        ChartOfAccount.id, ChartOfAccount.account_code, ChartOfAccount.account_name,
+        ChartOfAccount.account_type,
+        func.coalesce(totals.c.debit, 0), func.coalesce(totals.c.credit, 0),
+    ).outerjoin(totals, totals.c.account_id == ChartOfAccount.id)
+    if tenant_org_id:
+        q = q.filter(ChartOfAccount.tenant_org_id == tenant_org_id)
+    if account_types:
+        q = q.filter(ChartOfAccount.account_type.in_(list(account_types)))
+
+    return [
+        {"account_id": acc_id, "account_code": code, "account_name": name, "account_type": acc_type,
+         "debit": float(dr or 0), "credit": float(cr or 0)}
+        for acc_id, code, name, acc_type, dr, cr in q.order_by(ChartOfAccount.id).all()
+    ]
+
+
+def balance_sheet(db: Session, as_of: date, tenant_org_id: Optional[int] = None) -> list[dict]:
+    """Asset/Liability/Equity balances as of a date (credit-normal accounts reported positive)."""
+    report = []
+    for row in account_balances(db, tenant_org_id, ["Asset", "Liability", "Equity"], end_date=as_of):
+        balance = row["debit"] - row["credit"]
+        if row["account_type"] in ("Liability", "Equity"):
+            balance = -balance
+        report.append({"account_code": row["account_code"], "account_name": row["account_name"],
+                       "type": row["account_type"], "balance": balance})
+    return report
+
+
+def income_statement(db: Session, start_date: date, end_date: date,
+                     tenant_org_id: Optional[int] = None) -> list[dict]:
+    """Revenue/Expense activity between two dates (expenses reported positive)."""
+    report = []
+    for row in account_balances(db, tenant_org_id, ["Revenue", "Expense"],
+                                start_date=start_date, end_date=end_date):
+        balance = row["credit"] - row["debit"]
+        if row["account_type"] == "Expense":
+            balance = -balance
+        report.append({"account_code": row["account_code"], "account_name": row["account_name"],
+                       "type": row["account_type"], "balance": balance})
+    return report
+
+
+def trial_balance(db: Session, as_of: date, tenant_org_id: Optional[int] = None) -> list[dict]:
+    """Cumulative debits and credits per account as of a date."""
+    return [
+        {"account_code": row["account_code"], "account_name": row["account_name"],
+         "debit": row["debit"], "credit": row["credit"]}
+        for row in account_balances(db, tenant_org_id, end_date=as_of)
+    ]
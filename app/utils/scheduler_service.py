@@ -1,4 +1,5 @@
 """Job Scheduler service using APScheduler."""
+import asyncio
 import logging
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
@@ -6,11 +7,20 @@ from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.triggers.date import DateTrigger
 from datetime import datetime, time
 from sqlalchemy.orm import Session
+from app.config import get_settings
 from app.database import SessionLocal
 from app.modules.workflow.models import JobSchedule, JobExecutionLog
+from app.utils.dashboard_service import refresh_all_kpi_snapshots
+from app.utils.metrics import timed_job
 from typing import Dict, Any
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Built-in actions, run by JobSchedule rows of the matching job_type
+JOB_ACTIONS = {
+    "KpiSnapshot": refresh_all_kpi_snapshots,
+}
 
 class JobScheduler:
     _instance = None
@@ -26,6 +36,7 @@ class JobScheduler:
         if not cls._scheduler.running:
             cls._scheduler.start()
             logger.info("APScheduler started.")
+            cls.register_system_jobs()
             cls.load_all_jobs()
 
     @classmethod
@@ -34,6 +45,22 @@ class JobScheduler:
             cls._scheduler.shutdown()
             logger.info("APScheduler stopped.")
 
+    @classmethod
+    def register_system_jobs(cls):
+        """Register built-in interval jobs that do not need a JobSchedule row."""
+        if settings.KPI_SNAPSHOT_REFRESH_MINUTES > 0:
+            cls._scheduler.add_job(
+                timed_job("system_kpi_snapshots", refresh_all_kpi_snapshots),
+                IntervalTrigger(minutes=settings.KPI_SNAPSHOT_REFRESH_MINUTES),
+                id="system_kpi_snapshots",
+                next_run_time=datetime.now(),
+                replace_existing=True,
+                coalesce=True,
+                max_instances=1,
+                misfire_grace_time=300
+            )
+            logger.info(f"Scheduled KPI snapshot refresh every {settings.KPI_SNAPSHOT_REFRESH_MINUTES} min")
+
     @classmethod
     def load_all_jobs(cls):
         """Load all active jobs from the database into the scheduler."""
@@ -109,6 +136,11 @@ class JobScheduler:
 
     @staticmethod
     async def _execute_job_wrapper(job_id: int):
+        """Run the job off the event loop; its session and action are blocking."""
+        await asyncio.to_thread(JobScheduler._run_job, job_id)
+
+    @staticmethod
+    def _run_job(job_id: int):
         """Wrapper to handle database session and logging for job execution."""
         db = SessionLocal()
         job = db.query(JobSchedule).filter(JobSchedule.id == job_id).first()
@@ -126,8 +158,9 @@ class JobScheduler:
             job.last_run_at = datetime.now()
             db.commit()
             
-            # Placeholder for actual job logic
-            # await cls._perform_job_action(job)
+            action = JOB_ACTIONS.get(job.job_type)
+            if action:
+                timed_job(job.job_name, action)()
             
             log.status = "Completed"
             log.completed_at = datetime.now()
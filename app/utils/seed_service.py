@@ -0,0 +1,182 @@
+"""Bulk data generator – large, deterministic datasets via Core executemany inserts.
+
+Used by the load test and benchmarks in scripts/ and by tests. Rows are
+built from one random.Random(seed) consumed in a fixed order, so the same
+arguments always produce the same data, whatever the batch size. Primary
+keys are assigned here (continuing from each table's current max id), which
+lets child rows reference their parents without reading anything back.
+"""
+import logging
+import random
+import time
+from datetime import date, timedelta
+from typing import Optional, Union
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import func, insert, select
+from sqlalchemy.engine import Connection, Engine
+from app.modules.properties.models import Property, Unit, Tenant
+from app.modules.leasing.models import Lease, RentSchedule
+from app.modules.billing.models import Invoice, InvoiceLine, Payment, PaymentAllocation
+from app.modules.maintenance.models import MaintenanceRequest
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 10000
+PROPERTY_TYPES = ["Residential", "Commercial", "Mixed"]
+MAINTENANCE_STATUSES = ["New", "InProgress", "Completed", "Closed"]
+
+
+class _Batches:
+    """Row buffers per model, flushed together in foreign-key order."""
+
+    ORDER = (RentSchedule, Invoice, InvoiceLine, Payment, PaymentAllocation)
+
+    def __init__(self, conn: Connection, batch_size: int):
+        self.conn = conn
+        self.batch_size = batch_size
+        self.rows = {model: [] for model in self.ORDER}
+        self.counts = {model.__tablename__: 0 for model in self.ORDER}
+
+    def add(self, model, row: dict):
+        buf = self.rows[model]
+        buf.append(row)
+        if len(buf) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        for model in self.ORDER:
+            buf = self.rows[model]
+            if buf:
+                self.conn.execute(insert(model), buf)
+                self.counts[model.__tablename__] += len(buf)
+                buf.clear()
+
+
+def _next_id(conn: Connection, model) -> int:
+    return (conn.execute(select(func.max(model.id))).scalar() or 0) + 1
+
+
+def _insert_batched(conn: Connection, model, rows, batch_size: int) -> int:
+    n, buf = 0, []
+    for row in rows:
+        buf.append(row)
+        if len(buf) >= batch_size:
+            conn.execute(insert(model), buf)
+            n += len(buf)
+            buf = []
+    if buf:
+        conn.execute(insert(model), buf)
+        n += len(buf)
+    return n
+
+
+def seed_bulk(bind: Union[Engine, Connection], units: int = 1000, seed: int = 42, months: int = 12,
+              as_of: Optional[date] = None, occupancy: float = 0.8, units_per_property: int = 50,
+              tenant_org_id: Optional[int] = None, batch_size: int = BATCH_SIZE) -> dict:
+    """Insert a portfolio of `units` units and return row counts per table.
+
+    Properties hold units_per_property units each; occupancy of the units get
+    a tenant and a lease with `months` monthly rent schedules, starting
+    months // 2 months before as_of (default today) so half the schedules
+    are history. Schedules due before as_of's month are invoiced (invoice
+    numbers follow billing_service, so a billing run only fills the gaps),
+    and most of those invoices are paid. Pass as_of for fully reproducible
+    dates. 1M rent schedules is units≈104,000 at the defaults.
+    """
+    if isinstance(bind, Engine):
+        with bind.begin() as conn:
+            return seed_bulk(conn, units, seed, months, as_of, occupancy, units_per_property,
+                             tenant_org_id, batch_size)
+    conn = bind
+    t0 = time.perf_counter()
+    rnd = random.Random(seed)
+    as_of = as_of or date.today()
+    billed_before = as_of.replace(day=1)
+    first_month = billed_before - relativedelta(months=months // 2)
+    org = tenant_org_id
+
+    prop0, unit0, tenant0, lease0 = (_next_id(conn, m) for m in (Property, Unit, Tenant, Lease))
+    sched_id, inv_id, pay_id = (_next_id(conn, m) for m in (RentSchedule, Invoice, Payment))
+    n_props = max(units // units_per_property, 1)
+    n_leases = int(units * occupancy)
+    counts = {}
+
+    counts["properties"] = _insert_batched(conn, Property, (
+        {"id": prop0 + i, "tenant_org_id": org, "property_code": f"P{prop0 + i:06d}",
+         "property_name": f"Property {prop0 + i}", "property_type": rnd.choice(PROPERTY_TYPES),
+         "status": "Active", "is_deleted": False}
+        for i in range(n_props)), batch_size)
+    counts["units"] = _insert_batched(conn, Unit, (
+        {"id": unit0 + i, "tenant_org_id": org, "property_id": prop0 + i % n_props,
+         "unit_number": f"U{unit0 + i:07d}", "is_deleted": False,
+         "current_status": "Occupied" if i < n_leases else rnd.choice(["Vacant", "Vacant", "UnderMaintenance"])}
+        for i in range(units)), batch_size)
+    counts["tenants"] = _insert_batched(conn, Tenant, (
+        {"id": tenant0 + i, "tenant_org_id": org, "tenant_code": f"T{tenant0 + i:07d}", "first_name": "Tenant",
+         "last_name": str(tenant0 + i), "email": f"tenant{tenant0 + i}@example.com"}
+        for i in range(n_leases)), batch_size)
+
+    leases = []
+    for i in range(n_leases):
+        start = first_month + timedelta(days=rnd.randrange(28))
+        leases.append({
+            "id": lease0 + i, "tenant_org_id": org, "lease_number": f"L{lease0 + i:07d}",
+            "property_id": prop0 + i % n_props, "unit_id": unit0 + i, "tenant_id": tenant0 + i,
+            "lease_status": "Terminated" if rnd.random() < 0.1 else "Active", "start_date": start,
+            "end_date": start + relativedelta(months=months, days=-1), "base_rent_amount": rnd.randrange(800, 3000, 25),
+        })
+    counts["leases"] = _insert_batched(conn, Lease, leases, batch_size)
+
+    batches = _Batches(conn, batch_size)
+    for lease in leases:
+        rent, lease_id, tenant_id = lease["base_rent_amount"], lease["id"], lease["tenant_id"]
+        for m in range(months):
+            due = lease["start_date"] + relativedelta(months=m)
+            billed = due < billed_before
+            # Older months are almost all settled; last month is still being collected
+            if not billed:
+                paid = 0
+            elif due < billed_before - relativedelta(months=1):
+                paid = rent if rnd.random() < 0.95 else 0
+            else:
+                r = rnd.random()
+                paid = rent if r < 0.6 else rent // 2 if r < 0.75 else 0
+            batches.add(RentSchedule, {
+                "id": sched_id, "tenant_org_id": org, "lease_id": lease_id, "due_date": due, "period_start": due,
+                "period_end": due + relativedelta(months=1, days=-1), "scheduled_amount": rent, "total_amount": rent,
+                "is_paid": paid == rent, "outstanding_amount": rent - paid,
+            })
+            sched_id += 1
+            if not billed:
+                continue
+            batches.add(Invoice, {
+                "id": inv_id, "tenant_org_id": org, "invoice_number": f"INV-{lease['lease_number']}-{due:%Y%m%d}",
+                "invoice_type": "Rent", "lease_id": lease_id, "tenant_id": tenant_id,
+                "property_id": lease["property_id"], "unit_id": lease["unit_id"], "invoice_date": due,
+                "due_date": due, "document_amount": rent, "total_amount": rent,
+                "invoice_status": "Paid" if paid == rent else "PartiallyPaid" if paid else "Posted",
+            })
+            batches.add(InvoiceLine, {
+                "invoice_id": inv_id, "description": f"Rent – {due:%B %Y}", "charge_type": "Rent", "quantity": 1,
+                "unit_price": rent, "line_amount": rent, "line_total_amount": rent,
+            })
+            if paid:
+                batches.add(Payment, {
+                    "id": pay_id, "tenant_org_id": org, "payment_number": f"PMT{pay_id:09d}",
+                    "tenant_id": tenant_id, "payment_date": due + timedelta(days=rnd.randrange(10)), "amount": paid,
+                })
+                batches.add(PaymentAllocation, {"payment_id": pay_id, "invoice_id": inv_id, "allocated_amount": paid})
+                pay_id += 1
+            inv_id += 1
+    batches.flush()
+    counts.update(batches.counts)
+
+    mr0 = _next_id(conn, MaintenanceRequest)
+    counts["maintenance_requests"] = _insert_batched(conn, MaintenanceRequest, (
+        {"id": mr0 + i, "tenant_org_id": org, "request_number": f"MR{mr0 + i:07d}", "property_id": prop0 + i % n_props,
+         "unit_id": unit0 + i * 10 % units, "description": "Leak", "status": rnd.choice(MAINTENANCE_STATUSES)}
+        for i in range(max(units // 10, 1))), batch_size)
+
+    logger.info("Bulk seed: %d units, %d rent schedules, %d invoices in %.1fs", units,
+                counts["rent_schedules"], counts["invoices"], time.perf_counter() - t0)
+    return counts
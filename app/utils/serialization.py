@@ -0,0 +1,84 @@
+"""Shared model serialization – compiled column accessors and an orjson response class."""
+from decimal import Decimal
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Callable, Iterable, Optional
+import orjson
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only
+
+
+def json_default(value: Any):
+    """Encode what orjson does not handle natively, the way jsonable_encoder does."""
+    if isinstance(value, Decimal):
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=json_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson (Decimal, date and datetime handled natively).
+
+    Returning one directly from a route also skips FastAPI's jsonable_encoder pass.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def model_columns(model) -> tuple[str, ...]:
+    return tuple(attr.key for attr in inspect(model).column_attrs)
+
+
+@lru_cache(maxsize=1024)
+def model_serializer(model, fields: Optional[tuple[str, ...]] = None) -> Callable[[Any], dict]:
+    """Build (once per model and field set) a function turning a row into a dict.
+
+    Columns are read with a single operator.attrgetter instead of walking
+    __table__.columns on every call. Unknown field names are ignored.
+    """
+    names = model_columns(model)
+    if fields is not None:
+        names = tuple(n for n in names if n in fields)
+    if not names:
+        return lambda obj: {}
+    if len(names) == 1:
+        name = names[0]
+        return lambda obj: {name: getattr(obj, name)}
+    getter = attrgetter(*names)
+    return lambda obj: dict(zip(names, getter(obj)))
+
+
+def to_dict(obj, fields: Optional[Iterable[str]] = None) -> dict:
+    """Column values of a model instance, optionally limited to fields."""
+    return model_serializer(type(obj), tuple(sorted(fields)) if fields is not None else None)(obj)
+
+
+def parse_fields(model, fields: Optional[str]) -> Optional[tuple[str, ...]]:
+    """Validate a comma-separated ?fields= value against model columns (None = all columns)."""
+    if not fields:
+        return None
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested.difference(model_columns(model))
+    if unknown:
+        raise HTTPException(400, f"Unknown field(s): {', '.join(sorted(unknown))}")
+    return tuple(sorted(requested))
+
+
+def load_fields(q, model, fields: Optional[tuple[str, ...]], required: Iterable[str] = ()):
+    """Restrict the SELECT of q to fields (plus required, e.g. sort keys) with load_only.
+
+    The primary key is always loaded; anything else stays unloaded, so it must
+    not be touched afterwards (serialize with to_dict(obj, fields)).
+    """
+    if fields is None:
+        return q
+    names = set(fields).union(required)
+    return q.options(load_only(*(getattr(model, n) for n in sorted(names))))
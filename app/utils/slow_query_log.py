@@ -0,0 +1,152 @@
+"""Slow query log – statements over SLOW_QUERY_MS with their EXPLAIN plan, route and tenant."""
+import json
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import RotatingFileHandler
+from threading import Lock
+from typing import Optional
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+_IN_LIST = re.compile(r"\((?:\s*(?:\?|%s|%\(\w+\)s|:\w+)\s*,)+\s*(?:\?|%s|%\(\w+\)s|:\w+)\s*\)")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_EXPLAIN_PREFIX = {"sqlite": "EXPLAIN QUERY PLAN ", "postgresql": "EXPLAIN ", "mysql": "EXPLAIN "}
+
+
+def normalize(statement: str) -> str:
+    """Collapse whitespace, IN-lists and inline literals so one query shape aggregates as one entry."""
+    sql = " ".join(statement.split())
+    sql = _IN_LIST.sub("(?, ...)", sql)
+    return _LITERAL.sub("?", sql)
+
+
+def params_shape(parameters, executemany: bool) -> str:
+    """Parameter types only – values are never logged."""
+    if executemany:
+        rows = list(parameters or [])
+        return f"executemany x{len(rows)}" + (f" of {params_shape(rows[0], False)}" if rows else "")
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{k}: {type(v).__name__}" for k, v in parameters.items()) + "}"
+    return "(" + ", ".join(type(v).__name__ for v in (parameters or ())) + ")"
+
+
+def _streaming(context) -> bool:
+    """Server-side cursor (yield_per / stream_results): the connection is busy until it is exhausted."""
+    options = context.execution_options if context is not None else {}
+    return bool(options.get("stream_results") or options.get("yield_per"))
+
+
+class SlowQueryLog:
+    """Aggregates slow statements by normalized SQL and appends each one to a rotating JSON-lines file.
+
+    The EXPLAIN plan is captured once per kept statement shape, off the
+    request path: a background thread runs it on its own pooled connection
+    (raw DBAPI, so it does not re-enter the engine events) and then writes the
+    file line. Streamed statements are never explained, since a second query
+    would break the open server-side cursor. At most max_statements shapes are
+    kept; past that, new shapes are only written to the file, without a plan.
+    """
+
+    def __init__(self, max_statements: int = 500):
+        self.max_statements = max_statements
+        self._entries: dict[str, dict] = {}
+        self._explaining: set[str] = set()
+        self._lock = Lock()
+        self._file_logger: Optional[logging.Logger] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+
+    def _file(self) -> Optional[logging.Logger]:
+        if not settings.SLOW_QUERY_LOG_FILE:
+            return None
+        if self._file_logger is None:
+            os.makedirs(os.path.dirname(settings.SLOW_QUERY_LOG_FILE) or ".", exist_ok=True)
+            file_logger = logging.getLogger("app.slow_queries.file")
+            file_logger.propagate = False
+            file_logger.setLevel(logging.INFO)
+            file_logger.addHandler(RotatingFileHandler(settings.SLOW_QUERY_LOG_FILE, maxBytes=10 * 1024 * 1024,
+                                                       backupCount=5, encoding="utf-8"))
+            self._file_logger = file_logger
+        return self._file_logger
+
+    @staticmethod
+    def _explain(engine, statement: str, parameters) -> Optional[list]:
+        prefix = _EXPLAIN_PREFIX.get(engine.dialect.name)
+        if prefix is None or not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            return None
+        try:
+            raw = engine.raw_connection()
+        except Exception as e:
+            return [f"EXPLAIN failed: {e}"]
+        try:
+            cursor = raw.cursor()
+            try:
+                cursor.execute(prefix + statement, parameters or ())
+                return [" | ".join(str(col) for col in row) for row in cursor.fetchall()]
+            finally:
+                cursor.close()
+        except Exception as e:
+            return [f"EXPLAIN failed: {e}"]
+        finally:
+            raw.close()
+
+    def _write(self, line: dict):
+        file_logger = self._file()
+        if file_logger:
+            file_logger.info(json.dumps(line))
+
+    def _explain_and_write(self, engine, statement: str, parameters, sql: str, line: dict):
+        plan = self._explain(engine, statement, parameters)
+        with self._lock:
+            self._explaining.discard(sql)
+            entry = self._entries.get(sql)
+            if entry is not None:
+                entry["plan"] = plan
+        self._write({**line, "plan": plan})
+
+    def record(self, conn, context, statement: str, parameters, executemany: bool, elapsed_ms: float,
+               route: Optional[str], tenant_org_id: Optional[int]):
+        sql = normalize(statement)
+        shape = params_shape(parameters, executemany)
+        with self._lock:
+            entry = self._entries.get(sql)
+            if entry is None and len(self._entries) < self.max_statements:
+                entry = self._entries[sql] = {"sql": sql, "count": 0, "total_ms": 0.0, "max_ms": 0.0, "plan": None}
+            if entry is not None:
+                entry["count"] += 1
+                entry["total_ms"] += elapsed_ms
+                entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+                entry.update(params_shape=shape, last_route=route, last_tenant_org_id=tenant_org_id)
+            plan = entry["plan"] if entry is not None else None
+            explain = (entry is not None and plan is None and sql not in self._explaining
+                       and not executemany and not _streaming(context))
+            if explain:
+                self._explaining.add(sql)
+        logger.warning("Slow query %.1fms on %s: %s", elapsed_ms, route or "-", sql[:300])
+        line = {"elapsed_ms": round(elapsed_ms, 2), "sql": sql, "params_shape": shape,
+                "route": route, "tenant_org_id": tenant_org_id, "plan": plan}
+        if explain:
+            self._executor.submit(self._explain_and_write, conn.engine, statement, parameters, sql, line)
+        else:
+            self._write(line)
+
+    def wait(self, timeout: Optional[float] = None):
+        """Block until every EXPLAIN queued so far has run and been written."""
+        self._executor.submit(lambda: None).result(timeout)
+
+    def top(self, limit: int = 20) -> list[dict]:
+        """Statement shapes ordered by total time spent."""
+        with self._lock:
+            entries = sorted(self._entries.values(), key=lambda e: e["total_ms"], reverse=True)[:limit]
+            return [{**e, "total_ms": round(e["total_ms"], 2), "max_ms": round(e["max_ms"], 2),
+                     "avg_ms": round(e["total_ms"] / e["count"], 2)} for e in entries]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+slow_query_log = SlowQueryLog(max_statements=settings.SLOW_QUERY_MAX_STATEMENTS)
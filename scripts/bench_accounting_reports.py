@@ -0,0 +1,121 @@
+"""Benchmark – accounting report latency and query count vs. chart-of-accounts size.
+
+Seeds a throwaway SQLite database per size, then times the grouped report
+engine against the old one-query-per-account loop, and again after closing
+every period through --close-through so closed history is read from the
+GLAccountBalance snapshot instead of journal lines.
+
+    python scripts/bench_accounting_reports.py [--sizes 100,500,2000] [--lines 20000] [--close-through 2025-11]
+"""
+import sys, os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import argparse
+import json
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+from sqlalchemy import create_engine, event, func, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.auth import models as _auth
+from app.modules.properties import models as _pm
+from app.modules.leasing import models as _lm
+from app.modules.billing import models as _bm
+from app.modules.accounting.models import ChartOfAccount, JournalEntry, JournalEntryLine
+from app.utils import report_service, ledger_service
+
+ACCOUNT_TYPES = ["Asset", "Liability", "Equity", "Revenue", "Expense"]
+
+
+def _seed(engine, n_accounts: int, n_lines: int):
+    rnd = random.Random(42)
+    with engine.begin() as conn:
+        conn.execute(insert(ChartOfAccount), [
+            {"account_code": f"{i:05d}", "account_name": f"Account {i}",
+             "account_type": ACCOUNT_TYPES[i % len(ACCOUNT_TYPES)], "status": "Active"}
+            for i in range(n_accounts)
+        ])
+        n_entries = max(n_lines // 2, 1)
+        start = date(2024, 1, 1)
+        conn.execute(insert(JournalEntry), [
+            {"journal_number": f"JE-{i:07d}", "entry_date": start + timedelta(days=i % 730),
+             "total_debit": 100, "total_credit": 100}
+            for i in range(n_entries)
+        ])
+        lines = []
+        for je_id in range(1, n_entries + 1):
+            dr, cr = rnd.sample(range(1, n_accounts + 1), 2)
+            lines.append({"journal_entry_id": je_id, "account_id": dr, "debit_amount": 100, "credit_amount": 0})
+            lines.append({"journal_entry_id": je_id, "account_id": cr, "debit_amount": 0, "credit_amount": 100})
+        conn.execute(insert(JournalEntryLine), lines)
+
+
+def _per_account_trial_balance(db, as_of):
+    """The pre-engine implementation: two aggregate queries per account."""
+    report = []
+    for acc in db.query(ChartOfAccount).all():
+        dr = db.query(func.coalesce(func.sum(JournalEntryLine.debit_amount), 0)
+        ).join(JournalEntry, JournalEntryLine.journal_entry_id == JournalEntry.id
+        ).filter(JournalEntryLine.account_id == acc.id, JournalEntry.entry_date <= as_of).scalar() or 0
+        cr = db.query(func.coalesce(func.sum(JournalEntryLine.credit_amount), 0)
+        ).join(JournalEntry, JournalEntryLine.journal_entry_id == JournalEntry.id
+        ).filter(JournalEntryLine.account_id == acc.id, JournalEntry.entry_date <= as_of).scalar() or 0
+        report.append({"account_code": acc.account_code, "debit": float(dr), "credit": float(cr)})
+    return report
+
+
+def _measure(fn, Session, counter, repeat):
+    timings, queries = [], 0
+    for _ in range(repeat):
+        db = Session()
+        counter["n"] = 0
+        t0 = time.perf_counter()
+        fn(db)
+        timings.append((time.perf_counter() - t0) * 1000)
+        queries = counter["n"]
+        db.close()
+    return {"median_ms": round(statistics.median(timings), 2), "queries": queries}
+
+
+def run(sizes, n_lines, repeat, close_through=None):
+    results = []
+    as_of = date(2026, 1, 1)
+    for n_accounts in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+            Base.metadata.create_all(bind=engine)
+            _seed(engine, n_accounts, n_lines)
+            counter = {"n": 0}
+
+            @event.listens_for(engine, "before_cursor_execute")
+            def _count(*args):
+                counter["n"] += 1
+
+            Session = sessionmaker(bind=engine)
+            grouped = _measure(lambda db: report_service.trial_balance(db, as_of), Session, counter, repeat)
+            naive = _measure(lambda db: _per_account_trial_balance(db, as_of), Session, counter, repeat)
+            result = {"accounts": n_accounts, "journal_lines": n_lines, "grouped": grouped, "per_account": naive}
+            if close_through:
+                db = Session()
+                ledger_service.close_period(db, close_through)
+                db.close()
+                result["grouped_after_close"] = _measure(
+                    lambda db: report_service.trial_balance(db, as_of), Session, counter, repeat)
+            results.append(result)
+            engine.dispose()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="100,500,2000")
+    parser.add_argument("--lines", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--close-through", default="2025-11", help="YYYY-MM, empty to skip")
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",")]
+    print(json.dumps(run(sizes, args.lines, args.repeat, args.close_through or None), indent=2))
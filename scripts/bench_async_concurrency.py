@@ -0,0 +1,115 @@
+"""Benchmark – async vs sync list endpoint under 50/200/1000 concurrent clients.
+
+Seeds a throwaway SQLite database with seed_service.seed_bulk, then drives
+GET /api/leases (async handler on an AsyncSession, see app.database.get_async_read_db)
+and a sync twin of the same route mounted here (def handler on get_read_db
+and paginate, i.e. the threadpool path it replaced) with --clients concurrent
+clients over httpx's ASGI transport. For every level it reports throughput
+and p50/p95/p99 latency as JSON.
+
+    python scripts/bench_async_concurrency.py [--units 2000] [--clients 50,200,1000] [--requests 2000]
+"""
+import sys, os
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+WORK_DIR = tempfile.mkdtemp(prefix="bench-async-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(WORK_DIR, 'bench.db')}"
+os.environ.setdefault("DEBUG", "false")
+os.environ.setdefault("SLOW_QUERY_MS", "0")
+
+import argparse
+import asyncio
+import json
+import shutil
+import time
+import httpx
+from fastapi import Depends
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.main import app
+from app.database import async_session_factory, engine, get_read_db, init_db
+from app.auth.dependencies import create_access_token, get_current_user, hash_password
+from app.auth.models import Role, UserAccount
+from app.modules.leasing.models import Lease
+from app.modules.leasing.routes import _to_dict
+from app.utils.pagination import PageParams, paginate
+from app.utils.seed_service import seed_bulk
+
+
+@app.get("/bench/leases-sync", include_in_schema=False)
+def list_leases_sync(page: PageParams = Depends(), db: Session = Depends(get_read_db),
+                     user: UserAccount = Depends(get_current_user)):
+    q = db.query(Lease).filter(Lease.is_deleted == False)
+    return paginate(q, [Lease.id], page, _to_dict)
+
+
+PATHS = {"async": "/api/leases", "sync": "/bench/leases-sync"}
+
+
+def _percentile(sorted_ms: list, pct: float) -> float:
+    return sorted_ms[max(0, min(len(sorted_ms) - 1, int(round(pct / 100 * len(sorted_ms))) - 1))]
+
+
+async def _level(client, headers, path: str, clients: int, n: int) -> dict:
+    sem = asyncio.Semaphore(clients)
+    timings, errors = [], 0
+
+    async def one():
+        nonlocal errors
+        async with sem:
+            t0 = time.perf_counter()
+            r = await client.get(path, params={"limit": 50}, headers=headers)
+            await r.aread()
+            timings.append((time.perf_counter() - t0) * 1000)
+            if r.status_code >= 400:
+                errors += 1
+
+    await client.get(path, params={"limit": 50}, headers=headers)
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(n)))
+    elapsed = time.perf_counter() - t0
+    timings.sort()
+    return {
+        "clients": clients, "requests": n, "errors": errors, "req_per_s": round(n / elapsed, 1),
+        "p50_ms": round(_percentile(timings, 50), 2), "p95_ms": round(_percentile(timings, 95), 2),
+        "p99_ms": round(_percentile(timings, 99), 2),
+    }
+
+
+async def _drive(levels: list, n: int) -> dict:
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': '1'})}"}
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    results = {}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench",
+                                 timeout=600, limits=limits) as client:
+        for mode, path in PATHS.items():
+            results[mode] = [await _level(client, headers, path, c, max(n, c)) for c in levels]
+    await async_session_factory().kw["bind"].dispose()
+    return results
+
+
+def run(n_units: int, levels: list, n_requests: int) -> dict:
+    init_db()
+    with engine.begin() as conn:
+        conn.execute(insert(Role), [{"id": 1, "role_name": "admin", "permissions": {"all": True}, "is_system": True}])
+        conn.execute(insert(UserAccount), [{"id": 1, "username": "bench", "email": "bench@example.com",
+                                            "password_hash": hash_password("bench"), "role_id": 1,
+                                            "is_active": True}])
+        seed_bulk(conn, units=n_units)
+    results = asyncio.run(_drive(levels, n_requests))
+    engine.dispose()
+    return {"units": n_units, **results}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--units", type=int, default=2000)
+    parser.add_argument("--clients", default="50,200,1000")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per level (at least --clients)")
+    args = parser.parse_args()
+    try:
+        print(json.dumps(run(args.units, [int(c) for c in args.clients.split(",")], args.requests), indent=2))
+    finally:
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
@@ -0,0 +1,79 @@
+"""Benchmark – per-request auth overhead with and without the principal cache.
+
+Resolves a bearer token to (user, role) the way an HTML page route does
+(get_current_user_from_token followed by a role lookup) against a throwaway
+SQLite database, and reports mean microseconds and queries per request.
+
+    python scripts/bench_auth.py [--requests 5000]
+"""
+import sys, os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import argparse
+import json
+import tempfile
+import time
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.auth.models import UserAccount, Role
+from app.auth import dependencies as auth
+from app.modules.properties import models as _pm
+
+settings = auth.settings
+
+
+def _resolve(db, credentials, cached: bool):
+    user = auth.get_current_user_from_token(None, credentials, db)
+    if cached:
+        return auth.get_user_role(db, user)
+    return db.query(Role).filter(Role.id == user.role_id).first()
+
+
+def _measure(Session, counter, credentials, n: int, cached: bool):
+    ttl = settings.PRINCIPAL_CACHE_TTL_SECONDS
+    settings.PRINCIPAL_CACHE_TTL_SECONDS = ttl if cached else 0
+    auth.principal_cache.clear()
+    try:
+        counter["n"] = 0
+        t0 = time.perf_counter()
+        for _ in range(n):
+            db = Session()
+            _resolve(db, credentials, cached)
+            db.close()
+        elapsed = time.perf_counter() - t0
+    finally:
+        settings.PRINCIPAL_CACHE_TTL_SECONDS = ttl
+    return {"us_per_request": round(elapsed / n * 1e6, 1), "queries_per_request": round(counter["n"] / n, 3)}
+
+
+def run(n: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine)
+        db = Session()
+        db.add(Role(id=1, role_name="admin", permissions={"all": True}))
+        db.add(UserAccount(id=1, username="bench", email="bench@example.com", password_hash="x", role_id=1))
+        db.commit()
+        db.close()
+        counter = {"n": 0}
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _count(*args):
+            counter["n"] += 1
+
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=auth.create_access_token({"sub": "1"}))
+        before = _measure(Session, counter, credentials, n, cached=False)
+        after = _measure(Session, counter, credentials, n, cached=True)
+        engine.dispose()
+    return {"requests": n, "uncached": before, "principal_cache": after}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.requests), indent=2))
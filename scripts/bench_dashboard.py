@@ -0,0 +1,115 @@
+"""Benchmark – portfolio dashboard query count and p50/p95 latency on a large seed.
+
+Seeds a throwaway SQLite database with --units units via seed_service.seed_bulk
+(properties, leases, schedules, invoices, payments, maintenance), then calls
+GET /api/dashboard/portfolio?live=true (bypassing cache and snapshots) through
+the ASGI app and compares it with the previous one-query-per-KPI implementation.
+
+    python scripts/bench_dashboard.py [--units 100000] [--repeat 30]
+"""
+import sys, os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import argparse
+import json
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+from types import SimpleNamespace
+from sqlalchemy import create_engine, event, func
+from sqlalchemy.orm import sessionmaker
+from fastapi.testclient import TestClient
+
+from app.database import Base, get_db
+from app.auth import models as _auth
+from app.auth.dependencies import get_current_user
+from app.modules.properties.models import Property, Unit
+from app.modules.leasing.models import Lease
+from app.modules.billing.models import Invoice, Payment
+from app.modules.maintenance.models import MaintenanceRequest
+from app.modules.accounting import models as _am
+from app.main import app
+from app.utils.seed_service import seed_bulk
+
+
+def _legacy_portfolio(db):
+    """The previous implementation: one COUNT/SUM per KPI."""
+    today = date.today()
+    unit_q = db.query(Unit).filter(Unit.is_deleted == False)
+    db.query(Property).filter(Property.is_deleted == False).count()
+    unit_q.count()
+    unit_q.filter(Unit.current_status == "Occupied").count()
+    unit_q.filter(Unit.current_status == "Vacant").count()
+    db.query(Lease).filter(Lease.lease_status == "Active").count()
+    db.query(func.coalesce(func.sum(Payment.amount), 0)).scalar()
+    db.query(func.coalesce(func.sum(Invoice.total_amount), 0)).scalar()
+    db.query(func.coalesce(func.sum(Invoice.total_amount), 0)).filter(
+        Invoice.invoice_status.in_(["Posted", "PartiallyPaid"])).scalar()
+    db.query(func.count(MaintenanceRequest.id)).filter(
+        MaintenanceRequest.status.in_(["New", "Acknowledged", "InProgress"])).scalar()
+    db.query(func.count(Lease.id)).filter(Lease.lease_status == "Active", Lease.end_date <= today + timedelta(days=90),
+                                          Lease.end_date >= today).scalar()
+    db.query(Unit.current_status, func.count(Unit.id)).filter(Unit.is_deleted == False).group_by(Unit.current_status).all()
+    db.query(Property.property_type, func.count(Property.id)).filter(
+        Property.is_deleted == False).group_by(Property.property_type).all()
+
+
+def _stats(timings, queries):
+    timings = sorted(timings)
+    p95 = timings[min(len(timings) - 1, int(round(len(timings) * 0.95)) - 1)]
+    return {"p50_ms": round(statistics.median(timings), 2), "p95_ms": round(p95, 2), "queries": queries}
+
+
+def run(n_units: int, repeat: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        seed_bulk(engine, units=n_units, seed=7)
+        Session = sessionmaker(bind=engine)
+        counter = {"n": 0}
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _count(*args):
+            counter["n"] += 1
+
+        def _db():
+            db = Session()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = _db
+        app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(tenant_org_id=None)
+        client = TestClient(app)
+        try:
+            timings = []
+            for _ in range(repeat):
+                counter["n"] = 0
+                t0 = time.perf_counter()
+                assert client.get("/api/dashboard/portfolio", params={"live": True}).status_code == 200
+                timings.append((time.perf_counter() - t0) * 1000)
+            endpoint = _stats(timings, counter["n"])
+        finally:
+            app.dependency_overrides.clear()
+
+        timings = []
+        for _ in range(repeat):
+            db = Session()
+            counter["n"] = 0
+            t0 = time.perf_counter()
+            _legacy_portfolio(db)
+            timings.append((time.perf_counter() - t0) * 1000)
+            db.close()
+        legacy = _stats(timings, counter["n"])
+        engine.dispose()
+    return {"units": n_units, "repeat": repeat, "endpoint": endpoint, "legacy_per_kpi": legacy}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--units", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+    print(json.dumps(run(args.units, args.repeat), indent=2))
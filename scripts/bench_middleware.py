@@ -0,0 +1,88 @@
+"""Benchmark – requests/sec for /api/health through the old and new middleware stacks.
+
+Both stacks carry an audit and a request-id/timing middleware in front of the
+same trivial endpoint: the old one built on BaseHTTPMiddleware (as the audit
+middleware used to be), the new one the pure ASGI classes from app.middleware.
+Requests are driven in-process over httpx's ASGI transport, so the numbers
+isolate middleware overhead from network and server costs.
+
+    python scripts/bench_middleware.py [--requests 5000] [--concurrency 50]
+"""
+import sys, os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+import httpx
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.middleware.audit import AuditMiddleware
+from app.middleware.request_context import RequestContextMiddleware
+
+
+class LegacyAuditMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+        if request.method in ["POST", "PUT", "PATCH", "DELETE"] and 200 <= response.status_code < 300:
+            AuditMiddleware.token_user_id(request)
+        return response
+
+
+class LegacyRequestContextMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        start = time.perf_counter()
+        request.state.request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request.state.request_id
+        response.headers["X-Response-Time"] = f"{(time.perf_counter() - start) * 1000:.2f}ms"
+        return response
+
+
+def _app(legacy: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/health")
+    def health_check():
+        return {"status": "healthy"}
+
+    app.add_middleware(LegacyAuditMiddleware if legacy else AuditMiddleware)
+    app.add_middleware(LegacyRequestContextMiddleware if legacy else RequestContextMiddleware)
+    return app
+
+
+async def _drive(app, n: int, concurrency: int) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(min(n, 200)):  # warm-up
+            await client.get("/api/health")
+        sem = asyncio.Semaphore(concurrency)
+
+        async def one():
+            async with sem:
+                r = await client.get("/api/health")
+                assert r.status_code == 200
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(n)))
+        elapsed = time.perf_counter() - t0
+    return {"requests": n, "req_per_s": round(n / elapsed, 1), "us_per_request": round(elapsed / n * 1e6, 1)}
+
+
+def run(n: int, concurrency: int) -> dict:
+    return {
+        "concurrency": concurrency,
+        "base_http_middleware": asyncio.run(_drive(_app(legacy=True), n, concurrency)),
+        "pure_asgi": asyncio.run(_drive(_app(legacy=False), n, concurrency)),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    print(json.dumps(run(args.requests, args.concurrency), indent=2))
@@ -0,0 +1,91 @@
+"""Benchmark – serializing a page of Invoice and Unit rows, old path vs compiled serializer.
+
+Loads --rows rows of each model from a throwaway SQLite database, then times
+turning them into a JSON body two ways: the per-module
+{c.name: getattr(...) for c in __table__.columns} dict followed by
+jsonable_encoder + json.dumps (what FastAPI did for every list page), and
+app.utils.serialization.to_dict followed by the orjson renderer used by
+FastJSONResponse. Database time is excluded.
+
+    python scripts/bench_serialization.py [--rows 200] [--repeat 500]
+"""
+import sys, os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import argparse
+import json
+import tempfile
+import time
+from datetime import date, timedelta
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.auth import models as _auth
+from app.modules.properties.models import Property, Unit
+from app.modules.billing.models import Invoice
+from app.modules.leasing import models as _lm
+from app.modules.accounting import models as _am
+from app.utils.serialization import dumps, to_dict
+
+
+def _legacy(obj):
+    return {c.name: getattr(obj, c.name) for c in obj.__table__.columns}
+
+
+def _seed(engine, n: int):
+    today = date.today()
+    with engine.begin() as conn:
+        conn.execute(insert(Property), [{"property_code": "P1", "property_name": "Bench", "is_deleted": False}])
+        conn.execute(insert(Unit), [
+            {"property_id": 1, "unit_number": f"U{i:05d}", "current_status": "Occupied", "area_sqft": 850.5,
+             "market_rent": 1250, "is_deleted": False}
+            for i in range(n)
+        ])
+        conn.execute(insert(Invoice), [
+            {"invoice_number": f"INV-{i:06d}", "tenant_id": 1, "invoice_date": today,
+             "due_date": today + timedelta(days=30), "document_amount": 1234.56, "tax_amount": 61.73,
+             "total_amount": 1296.29, "balance_due": 1296.29, "status": "Posted"}
+            for i in range(n)
+        ])
+
+
+def _time(fn, repeat: int) -> float:
+    fn()
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat * 1e6
+
+
+def _compare(rows, repeat: int) -> dict:
+    legacy = _time(lambda: json.dumps(jsonable_encoder([_legacy(r) for r in rows])).encode(), repeat)
+    compiled = _time(lambda: dumps([to_dict(r) for r in rows]), repeat)
+    return {"legacy_us_per_page": round(legacy, 1), "compiled_orjson_us_per_page": round(compiled, 1),
+            "speedup": round(legacy / compiled, 2)}
+
+
+def run(n: int, repeat: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        _seed(engine, n)
+        db = sessionmaker(bind=engine)()
+        result = {"rows": n, "repeat": repeat}
+        for model in (Invoice, Unit):
+            rows = db.query(model).all()
+            assert json.loads(dumps([to_dict(r) for r in rows])) == \
+                json.loads(json.dumps(jsonable_encoder([_legacy(r) for r in rows])))
+            result[model.__name__] = _compare(rows, repeat)
+        db.close()
+        engine.dispose()
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+    print(json.dumps(run(args.rows, args.repeat), indent=2))
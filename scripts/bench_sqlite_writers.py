@@ -0,0 +1,131 @@
+"""Benchmark – SQLite write throughput and "database is locked" errors with N concurrent writers.
+
+For each --writers count, runs that many writer threads (each transaction:
+read a count, insert an audit row, update a property, commit) alongside
+--readers threads running aggregate reads, against a fresh SQLite file. It
+compares the plain engine (rollback journal, no pragmas, every session on
+its own connection) with the production profile from app.database (WAL +
+pragmas, reader pool, single writer connection).
+
+    python scripts/bench_sqlite_writers.py [--writers 1,4,16] [--readers 4] [--seconds 5]
+"""
+import sys, os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("DEBUG", "false")
+os.environ.setdefault("SLOW_QUERY_MS", "0")
+
+import argparse
+import json
+import statistics
+import tempfile
+import threading
+import time
+from datetime import datetime
+from sqlalchemy import create_engine, func, insert
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeout
+from sqlalchemy.orm import sessionmaker
+
+from app.main import app  # noqa: F401 – registers every model before create_all
+from app.database import Base, create_engines
+from app.auth.models import AuditLog
+from app.modules.properties.models import Property
+
+
+def _sessions(mode: str, url: str):
+    """(write sessions, read sessions, engines); the writer engine is last."""
+    if mode == "plain":
+        eng = create_engine(url, connect_args={"check_same_thread": False})
+        Session = sessionmaker(bind=eng, autoflush=False)
+        return Session, Session, [eng]
+    readers, writer = create_engines(url)
+    return (sessionmaker(bind=writer, autoflush=False), sessionmaker(bind=readers, autoflush=False),
+            [readers, writer])
+
+
+def _write(Session, i: int):
+    db = Session()
+    try:
+        db.query(func.count(AuditLog.id)).scalar()
+        db.execute(insert(AuditLog), [{"user_id": 1, "action": f"POST /bench/{i}", "entity_type": "bench",
+                                       "timestamp": datetime.utcnow()}])
+        prop = db.get(Property, i % 100 + 1)
+        prop.property_name = f"Property {i}"
+        db.commit()
+    finally:
+        db.close()
+
+
+def _read(Session):
+    db = Session()
+    try:
+        db.query(Property.property_type, func.count(Property.id)).group_by(Property.property_type).all()
+        db.query(func.count(AuditLog.id)).scalar()
+    finally:
+        db.close()
+
+
+def run_one(mode: str, n_writers: int, n_readers: int, seconds: float) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        WriteSession, ReadSession, engines = _sessions(mode, url)
+        Base.metadata.create_all(bind=engines[-1])
+        with engines[-1].begin() as conn:
+            conn.execute(insert(Property), [{"property_code": f"P{i}", "property_name": f"Property {i}",
+                                             "property_type": ["Residential", "Commercial"][i % 2]}
+                                            for i in range(100)])
+        stop = time.perf_counter() + seconds
+        lock = threading.Lock()
+        result = {"write_ms": [], "locked": 0, "reads": 0}
+
+        def writer(w: int):
+            i = w
+            while time.perf_counter() < stop:
+                t0 = time.perf_counter()
+                try:
+                    _write(WriteSession, i)
+                    with lock:
+                        result["write_ms"].append((time.perf_counter() - t0) * 1000)
+                except (OperationalError, PoolTimeout):
+                    with lock:
+                        result["locked"] += 1
+                i += n_writers
+
+        def reader():
+            while time.perf_counter() < stop:
+                try:
+                    _read(ReadSession)
+                    with lock:
+                        result["reads"] += 1
+                except OperationalError:
+                    with lock:
+                        result["locked"] += 1
+
+        threads = [threading.Thread(target=writer, args=(w,)) for w in range(n_writers)]
+        threads += [threading.Thread(target=reader) for _ in range(n_readers)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        for eng in engines:
+            eng.dispose()
+    timings = sorted(result["write_ms"])
+    return {
+        "writers": n_writers, "commits_per_s": round(len(timings) / seconds, 1),
+        "reads_per_s": round(result["reads"] / seconds, 1), "locked_errors": result["locked"],
+        "write_p50_ms": round(statistics.median(timings), 2) if timings else None,
+        "write_p95_ms": round(timings[max(0, int(round(len(timings) * 0.95)) - 1)], 2) if timings else None,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", default="1,4,16")
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+    counts = [int(n) for n in args.writers.split(",")]
+    print(json.dumps({
+        "readers": args.readers, "seconds": args.seconds,
+        "plain": [run_one("plain", n, args.readers, args.seconds) for n in counts],
+        "profile": [run_one("profile", n, args.readers, args.seconds) for n in counts],
+    }, indent=2))
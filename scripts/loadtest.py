@@ -0,0 +1,213 @@
+"""Load test – hot endpoints under concurrent clients against a scaled SQLite seed.
+
+Seeds a throwaway SQLite database at --units scale with
+seed_service.seed_bulk (properties, units, tenants, leases with a year of
+rent schedules, invoices, payments, maintenance requests) plus a journal,
+authenticates as an admin with a real
+bearer token, then drives each scenario with --concurrency clients over
+httpx's ASGI transport. For every scenario it reports p50/p95/p99/mean
+latency, throughput and queries per request (from X-DB-Query-Count) as JSON.
+The output can be saved and diffed between commits; --compare prints the
+p95 change against a saved run.
+
+    python scripts/loadtest.py [--units 10000] [--seed 42] [--requests 200] [--concurrency 8]
+                               [--scenarios list_leases,dashboard_portfolio] [--output run.json]
+                               [--compare baseline.json]
+"""
+import sys, os
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+# Point the app at a throwaway database before anything imports app.config
+WORK_DIR = tempfile.mkdtemp(prefix="loadtest-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(WORK_DIR, 'loadtest.db')}"
+os.environ.setdefault("DEBUG", "false")
+os.environ.setdefault("SLOW_QUERY_LOG_FILE", os.path.join(WORK_DIR, "slow_queries.log"))
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import time
+from datetime import date, timedelta
+import httpx
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import insert
+
+from app.main import app
+from app.database import engine, init_db
+from app.auth.dependencies import create_access_token, hash_password
+from app.auth.models import Role, UserAccount
+from app.modules.accounting.models import ChartOfAccount, JournalEntry, JournalEntryLine
+from app.utils.audit_service import audit_writer
+from app.utils.dashboard_service import refresh_all_kpi_snapshots
+from app.utils.seed_service import seed_bulk
+
+TODAY = date.today()
+MONTH_START = TODAY.replace(day=1)
+
+# name -> (method, path, params, requests override or None, concurrency override or None)
+SCENARIOS = {
+    "dashboard_portfolio": ("GET", "/api/dashboard/portfolio", {}, None, None),
+    "dashboard_portfolio_live": ("GET", "/api/dashboard/portfolio", {"live": "true"}, None, None),
+    "dashboard_finance_live": ("GET", "/api/dashboard/finance", {"live": "true"}, None, None),
+    "list_properties": ("GET", "/api/properties", {}, None, None),
+    "list_units": ("GET", "/api/properties/1/units", {}, None, None),
+    "list_leases": ("GET", "/api/leases", {"limit": 50}, None, None),
+    "list_leases_search": ("GET", "/api/leases", {"search": "L0001", "limit": 50}, None, None),
+    "list_invoices": ("GET", "/api/billing/invoices", {"limit": 50}, None, None),
+    "list_invoices_sparse": ("GET", "/api/billing/invoices",
+                             {"limit": 200, "fields": "invoice_number,due_date,total_amount", "total": "none"},
+                             None, None),
+    "list_payments": ("GET", "/api/billing/payments", {"limit": 50}, None, None),
+    "list_maintenance": ("GET", "/api/maintenance/requests", {"limit": 50}, None, None),
+    "report_trial_balance": ("GET", "/api/accounting/reports/trial-balance", {"as_of": TODAY.isoformat()}, None, None),
+    "export_invoices": ("GET", "/api/export/invoices", {}, 5, 2),
+    "billing_run": ("POST", "/api/automation/generate-invoices",
+                    {"start_date": MONTH_START.isoformat(),
+                     "end_date": (MONTH_START + relativedelta(months=1, days=-1)).isoformat()}, 3, 1),
+}
+
+
+def _seed(n_units: int, seed: int):
+    """The bulk portfolio plus an admin login and a journal for the accounting reports."""
+    rnd = random.Random(seed)
+    with engine.begin() as conn:
+        conn.execute(insert(Role), [{"id": 1, "role_name": "admin", "permissions": {"all": True}, "is_system": True}])
+        conn.execute(insert(UserAccount), [{"id": 1, "username": "loadtest", "email": "loadtest@example.com",
+                                            "password_hash": hash_password("loadtest"), "role_id": 1,
+                                            "is_active": True}])
+        seed_bulk(conn, units=n_units, seed=seed)
+        n_accounts = 200
+        conn.execute(insert(ChartOfAccount), [
+            {"account_code": f"{i:05d}", "account_name": f"Account {i}", "status": "Active",
+             "account_type": ["Asset", "Liability", "Equity", "Revenue", "Expense"][i % 5]}
+            for i in range(n_accounts)])
+        n_entries = max(n_units, 1)
+        conn.execute(insert(JournalEntry), [
+            {"journal_number": f"JE-{i:08d}", "entry_date": TODAY - timedelta(days=i % 365),
+             "total_debit": 100, "total_credit": 100}
+            for i in range(n_entries)])
+        lines = []
+        for je_id in range(1, n_entries + 1):
+            dr, cr = rnd.sample(range(1, n_accounts + 1), 2)
+            lines.append({"journal_entry_id": je_id, "account_id": dr, "debit_amount": 100, "credit_amount": 0})
+            lines.append({"journal_entry_id": je_id, "account_id": cr, "debit_amount": 0, "credit_amount": 100})
+        conn.execute(insert(JournalEntryLine), lines)
+
+
+def _percentile(sorted_ms: list, pct: float) -> float:
+    """Nearest-rank percentile."""
+    return sorted_ms[max(0, min(len(sorted_ms) - 1, int(round(pct / 100 * len(sorted_ms))) - 1))]
+
+
+async def _scenario(client, headers, method, path, params, n: int, concurrency: int) -> dict:
+    if method == "GET":
+        await client.request(method, path, params=params, headers=headers)  # warm-up; writes are measured cold
+    sem = asyncio.Semaphore(concurrency)
+    timings, queries, errors = [], [], 0
+
+    async def one():
+        nonlocal errors
+        async with sem:
+            t0 = time.perf_counter()
+            r = await client.request(method, path, params=params, headers=headers)
+            await r.aread()
+            timings.append((time.perf_counter() - t0) * 1000)
+            queries.append(int(r.headers.get("X-DB-Query-Count", 0)))
+            if r.status_code >= 400:
+                errors += 1
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(n)))
+    elapsed = time.perf_counter() - t0
+    timings.sort()
+    return {
+        "requests": n, "concurrency": concurrency, "errors": errors,
+        "p50_ms": round(_percentile(timings, 50), 2), "p95_ms": round(_percentile(timings, 95), 2),
+        "p99_ms": round(_percentile(timings, 99), 2), "mean_ms": round(statistics.fmean(timings), 2),
+        "req_per_s": round(n / elapsed, 1), "queries_per_request": round(statistics.fmean(queries), 2),
+    }
+
+
+async def _drive(names: list, n: int, concurrency: int) -> dict:
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': '1'})}"}
+    await audit_writer.start()
+    results = {}
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest",
+                                     timeout=600) as client:
+            for name in names:
+                method, path, params, n_override, c_override = SCENARIOS[name]
+                results[name] = await _scenario(client, headers, method, path, params,
+                                                n_override or n, c_override or concurrency)
+    finally:
+        await audit_writer.stop()
+    return results
+
+
+def _git_rev() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(__file__)).stdout.strip()
+    except OSError:
+        return ""
+
+
+def run(n_units: int, n_requests: int, concurrency: int, names: list, seed: int = 42) -> dict:
+    t0 = time.perf_counter()
+    init_db()
+    _seed(n_units, seed)
+    refresh_all_kpi_snapshots()
+    seed_s = time.perf_counter() - t0
+    scenarios = asyncio.run(_drive(names, n_requests, concurrency))
+    engine.dispose()
+    return {
+        "meta": {"commit": _git_rev(), "python": platform.python_version(), "units": n_units, "seed": seed,
+                 "requests": n_requests, "concurrency": concurrency, "seed_seconds": round(seed_s, 1)},
+        "scenarios": scenarios,
+    }
+
+
+def compare(current: dict, baseline: dict) -> dict:
+    """p95 and queries-per-request change per scenario present in both runs."""
+    diff = {}
+    for name, cur in current["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if base:
+            diff[name] = {"p95_ms": [base["p95_ms"], cur["p95_ms"]],
+                          "p95_change_pct": round((cur["p95_ms"] / base["p95_ms"] - 1) * 100, 1) if base["p95_ms"] else None,
+                          "queries_per_request": [base["queries_per_request"], cur["queries_per_request"]]}
+    return diff
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--units", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated subset of: "
+                        + ", ".join(SCENARIOS))
+    parser.add_argument("--output", help="also write the JSON result to this file")
+    parser.add_argument("--compare", help="JSON result of an earlier run to diff against")
+    args = parser.parse_args()
+    names = [s for s in args.scenarios.split(",") if s]
+    unknown = [s for s in names if s not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+    try:
+        result = run(args.units, args.requests, args.concurrency, names, args.seed)
+    finally:
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
+    if args.compare:
+        with open(args.compare) as f:
+            result["compare"] = compare(result, json.load(f))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+    print(json.dumps(result, indent=2))
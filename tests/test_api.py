@@ -3,6 +3,8 @@ import sys, os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 os.environ["DATABASE_URL"] = "sqlite:///./test_prop_management.db"
 
+import json
+from datetime import datetime
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
@@ -39,6 +41,22 @@ def setup_db():
         os.remove("./test_prop_management.db")
 
 
+@pytest.fixture
+def query_budget():
+    """Call an endpoint and assert its query count and that no statement repeats (N+1)."""
+    from app.utils.query_stats import recent_requests
+
+    def check(method: str, url: str, max_queries: int, max_repeats: int = 3, **kwargs):
+        r = client.request(method, url, headers=_login(), **kwargs)
+        stats = recent_requests.get(r.headers["X-Request-ID"])
+        assert r.status_code == 200, r.text
+        assert int(r.headers["X-DB-Query-Count"]) == stats.count
+        assert stats.count <= max_queries, stats.as_dict()
+        assert not stats.repeated(max_repeats), stats.as_dict()
+        return r
+    return check
+
+
 def _login():
     """Register + login to get auth token."""
     global _token
@@ -60,6 +78,23 @@ def _login():
     return {"Authorization": f"Bearer {_token}"}
 
 
+def _burst(calls: list, timeout: float = 20):
+    """Send (method, url, json) calls concurrently on one event loop with the app's own
+    session dependencies (no get_db override); returns the status codes."""
+    import asyncio
+    import httpx
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as ac:
+            return await asyncio.wait_for(asyncio.gather(*(
+                ac.request(method, url, json=body, headers=_login()) for method, url, body in calls)), timeout)
+    override = app.dependency_overrides.pop(get_db)
+    try:
+        return [r.status_code for r in asyncio.run(run())]
+    finally:
+        app.dependency_overrides[get_db] = override
+
+
 # ═══════════════════════════════════════
 # Health
 # ═══════════════════════════════════════
@@ -69,6 +104,103 @@ class TestHealth:
         assert r.status_code == 200
         assert r.json()["status"] == "healthy"
 
+    def test_request_id_and_timing_headers(self):
+        r = client.get("/api/health", headers={"X-Request-ID": "abc123"})
+        assert r.headers["X-Request-ID"] == "abc123"
+        assert r.headers["X-Response-Time"].endswith("ms")
+        assert len(client.get("/api/health").headers["X-Request-ID"]) == 32
+
+    def test_key_endpoints_query_budget(self, query_budget):
+        query_budget("GET", "/api/auth/me", 2)
+        for url in ("/api/properties", "/api/tenants", "/api/leases", "/api/billing/invoices",
+                    "/api/billing/payments", "/api/maintenance/requests", "/api/accounting/journal-entries"):
+            r = query_budget("GET", url, 4)
+            assert r.headers["Server-Timing"].startswith("db;dur=")
+        query_budget("GET", "/api/dashboard/portfolio?live=true", 5)
+
+    def test_metrics_endpoint(self):
+        from app.utils.metrics import timed_job
+        client.get("/api/leases/999999", headers=_login())
+        timed_job("test_job", lambda: None)()
+        r = client.get("/metrics")
+        assert r.status_code == 200 and r.headers["content-type"].startswith("text/plain")
+        body = r.text
+        assert 'http_request_duration_seconds_count{method="GET",route="/api/leases/{lease_id}",status="404"}' in body
+        assert 'http_request_duration_seconds_bucket{method="GET",route="/api/leases/{lease_id}",status="404",le="+Inf"}' in body
+        assert "http_requests_in_flight 1" in body
+        assert 'scheduler_job_duration_seconds_count{job="test_job",status="ok"} 1' in body
+        for name in ("db_pool_connections", "audit_queue_depth", "cache_requests_total"):
+            assert f"# TYPE {name}" in body
+
+    def test_slow_query_log_records_plan_and_lists_offenders(self, monkeypatch, tmp_path):
+        from app.auth.models import UserAccount
+        from app.config import get_settings
+        from app.utils.slow_query_log import slow_query_log
+        settings = get_settings()
+        monkeypatch.setattr(settings, "SLOW_QUERY_MS", 0.0001)
+        monkeypatch.setattr(settings, "SLOW_QUERY_LOG_FILE", str(tmp_path / "slow.log"))
+        monkeypatch.setattr(slow_query_log, "_file_logger", None)
+        slow_query_log.clear()
+        db = TestSession()
+        db.query(UserAccount).filter(UserAccount.username.ilike("%admin%")).all()
+        db.query(UserAccount).filter(UserAccount.username == "slowadmin").first()
+        client.post("/api/auth/register", json={
+            "username": "slowadmin", "email": "slow@example.com", "password": "Test1234!"})
+        db.query(UserAccount).filter(UserAccount.username == "slowadmin").first().role_id = 1
+        db.commit()
+        db.close()
+        token = client.post("/api/auth/login", json={
+            "username": "slowadmin", "password": "Test1234!"}).json()["access_token"]
+
+        slow_query_log.wait()  # plans are captured off the request path
+        r = client.get("/api/system/slow-queries", headers={"Authorization": f"Bearer {token}"})
+        assert r.status_code == 200
+        items = r.json()["items"]
+        ilike = next(i for i in items if "lower(user_accounts.username) LIKE lower(?)" in i["sql"])
+        assert ilike["count"] == 1 and ilike["params_shape"] == "(str)"
+        assert ilike["plan"] and "SCAN" in ilike["plan"][0]
+        assert any(i["last_route"] == "POST /api/auth/login" for i in items)
+        assert "lower(user_accounts.username)" in (tmp_path / "slow.log").read_text()
+        assert client.get("/api/system/slow-queries", headers=_login()).status_code == 403
+
+        # No EXPLAIN for a streamed statement (it would break the open cursor) or past the cap
+        slow_query_log.wait()
+        explained = []
+        monkeypatch.setattr(slow_query_log, "_explain", lambda *args: explained.append(args))
+        db = TestSession()
+        assert list(db.query(UserAccount).filter(UserAccount.id > 0).yield_per(10))
+        monkeypatch.setattr(slow_query_log, "max_statements", 0)
+        slow_query_log.clear()
+        db.query(UserAccount).filter(UserAccount.id < 0).all()
+        db.query(UserAccount).filter(UserAccount.id < 0).all()
+        db.close()
+        slow_query_log.wait()
+        assert explained == []
+
+    def test_repeated_statements_flagged(self, caplog):
+        from app.auth.models import UserAccount
+        from app.utils.query_stats import track_queries, warn_repeated
+        db = TestSession()
+        with track_queries("loop") as stats:
+            for i in range(12):
+                db.query(UserAccount).filter(UserAccount.id == i).first()
+        db.close()
+        assert stats.count == 12 and stats.repeated(10)[0][1] == 12
+        warn_repeated(stats, 10)
+        assert "Possible N+1 in loop" in caplog.text
+
+    def test_audit_middleware_logs_writes_and_streams_exports(self):
+        from app.auth.models import AuditLog
+        headers = _login()
+        r = client.post("/api/properties", json={"property_code": "AUD-1", "property_name": "Audit"},
+                        headers=headers)
+        assert r.status_code == 201
+        db = TestSession()
+        assert db.query(AuditLog).filter(AuditLog.action == "POST /api/properties").count() >= 1
+        db.close()
+        r = client.get("/api/export/properties", headers=headers)
+        assert r.status_code == 200 and "AUD-1" in r.text
+
 
 # ═══════════════════════════════════════
 # Auth Flow
@@ -94,6 +226,73 @@ class TestAuth:
         })
         assert r.status_code == 401
 
+    def test_principal_cache_invalidated_on_deactivate(self):
+        from app.auth.models import UserAccount
+        from app.auth.dependencies import principal_cache
+        client.post("/api/auth/register", json={
+            "username": "cacheuser", "email": "cache@example.com", "password": "Test1234!"})
+        token = client.post("/api/auth/login", json={
+            "username": "cacheuser", "password": "Test1234!"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        me = client.get("/api/auth/me", headers=headers)
+        assert me.status_code == 200
+        assert principal_cache.get(me.json()["id"])[0] is True
+
+        db = TestSession()
+        db.query(UserAccount).filter(UserAccount.id == me.json()["id"]).first().is_active = False
+        db.commit()
+        db.close()
+        assert principal_cache.get(me.json()["id"])[0] is False
+        assert client.get("/api/auth/me", headers=headers).status_code == 401
+
+    def test_principal_cache_disabled_under_concurrent_requests(self, monkeypatch):
+        from app.auth import dependencies
+        monkeypatch.setattr(dependencies.settings, "PRINCIPAL_CACHE_TTL_SECONDS", 0)
+        before = dependencies.principal_cache.stats()
+        calls = [("GET", "/api/auth/me", None), ("GET", "/api/leases", None),
+                 ("PUT", "/api/auth/users/999999", {"full_name": "Nobody"})] * 8
+        assert _burst(calls) == [200, 200, 403] * 8  # testadmin is not an admin
+        after = dependencies.principal_cache.stats()
+        assert (after["hits"], after["misses"]) == (before["hits"], before["misses"])  # every lookup hit the db
+
+    def test_audit_writer_batches_and_flushes_on_stop(self):
+        import asyncio
+        from app.auth.models import AuditLog
+        from app.utils.audit_service import AuditWriter
+        writer = AuditWriter(max_queue=100, batch_size=5, flush_interval=30)
+
+        async def run():
+            await writer.start()
+            for i in range(12):
+                await writer.enqueue({"user_id": 1, "action": f"TEST batch {i}", "entity_type": "test"})
+            await writer.stop()
+        asyncio.run(run())
+
+        stats = writer.stats()
+        assert stats["enqueued"] == 12 and stats["written"] == 12 and stats["dropped"] == 0
+        assert stats["batches"] >= 3 and not stats["running"]
+        db = TestSession()
+        assert db.query(AuditLog).filter(AuditLog.action.like("TEST batch %")).count() == 12
+        db.close()
+
+    def test_audit_writer_stop_racing_a_completed_get(self, monkeypatch):
+        import asyncio
+        from app.utils.audit_service import AuditWriter
+        writer = AuditWriter(max_queue=100, batch_size=10, flush_interval=30)
+        written = []
+        monkeypatch.setattr(writer, "_write", written.extend)
+
+        async def run():
+            await writer.start()
+            await writer.enqueue({"action": "first"})
+            await asyncio.sleep(0.01)  # the drain task holds "first" and waits for more
+            writer._queue.put_nowait({"action": "raced"})  # completes that wait...
+            stopping = asyncio.ensure_future(writer.stop())  # ...in the same loop turn as the cancel
+            done, _ = await asyncio.wait({stopping}, timeout=2)
+            return bool(done)
+        assert asyncio.run(run()), "stop() hung"
+        assert [e["action"] for e in written] == ["first", "raced"] and not writer.running
+
 
 # ═══════════════════════════════════════
 # Properties CRUD
@@ -122,8 +321,18 @@ class TestProperties:
         assert r.status_code in (200, 201)
 
     def test_list_owners(self):
+        from sqlalchemy import insert
+        from app.modules.properties.models import Owner
+        with engine.begin() as conn:
+            conn.execute(insert(Owner), [{"owner_code": f"LK-{i}", "first_name": "Lookup", "is_deleted": False}
+                                         for i in range(250)])
         r = client.get("/api/owners", headers=_login())
         assert r.status_code == 200
+        body = r.json()
+        # Dropdowns load owners in one call, so the lookup list is not cut at a page size
+        assert len(body["items"]) == body["total"] >= 250 and body["next_cursor"] is None
+        paged = client.get("/api/owners", params={"limit": 100}, headers=_login()).json()
+        assert len(paged["items"]) == 100 and paged["next_cursor"]
 
     def test_list_vendors(self):
         r = client.get("/api/vendors", headers=_login())
@@ -142,6 +351,89 @@ class TestBilling:
         r = client.get("/api/billing/payments", headers=_login())
         assert r.status_code == 200
 
+    def test_payments_cursor_pages(self):
+        from datetime import date
+        from app.modules.billing.models import Payment
+        db = TestSession()
+        db.add_all([Payment(payment_number=f"PMT-PAGE-{i}", tenant_id=4242, payment_date=date(2025, 5, 1), amount=i)
+                    for i in range(5)])
+        db.commit()
+        db.close()
+        headers = _login()
+        params = {"tenant_id": 4242, "limit": 2}
+        first = client.get("/api/billing/payments", params=params, headers=headers).json()
+        assert first["total"] == 5 and len(first["items"]) == 2
+        seen = [p["payment_number"] for p in first["items"]]
+        cursor = first["next_cursor"]
+        while cursor:
+            page = client.get("/api/billing/payments", params={**params, "cursor": cursor, "total": "none"},
+                              headers=headers).json()
+            assert page["total"] is None
+            seen += [p["payment_number"] for p in page["items"]]
+            cursor = page["next_cursor"]
+        assert seen == [f"PMT-PAGE-{i}" for i in range(4, -1, -1)]
+        legacy = client.get("/api/billing/payments", params={**params, "skip": 2}, headers=headers).json()
+        assert [p["payment_number"] for p in legacy["items"]] == seen[2:4]
+        estimate = client.get("/api/billing/payments", params={**params, "total": "estimate"}, headers=headers)
+        assert estimate.json()["total"] == 5 and estimate.json()["total_is_estimate"] is True
+        r = client.get("/api/billing/payments", params={"cursor": "not-a-cursor"}, headers=headers)
+        assert r.status_code == 400
+
+    def test_cursor_decimals_and_mysql_estimate(self):
+        from decimal import Decimal
+        from sqlalchemy import select
+        from sqlalchemy.dialects import mysql
+        from app.modules.billing.models import Payment
+        from app.utils import pagination
+        key = [Decimal("12345678901234567.89"), 7]
+        assert pagination.decode_cursor(pagination.encode_cursor(key), [Payment.amount, Payment.id]) == key
+
+        class MySQLBind:
+            dialect = mysql.dialect()
+
+        class Plan:
+            def mappings(self):
+                return [{"rows": 1000, "filtered": 10.0}]
+        sql = pagination._estimate_sql(MySQLBind(), select(Payment).where(Payment.amount > 5))
+        assert sql.startswith("EXPLAIN SELECT") and "payments.amount > 5" in sql
+        assert pagination._estimate_from("mysql", Plan()) == 100
+
+    def test_compiled_serializer_matches_jsonable_encoder(self):
+        from datetime import date
+        from decimal import Decimal
+        from fastapi.encoders import jsonable_encoder
+        from app.modules.billing.models import Invoice
+        from app.utils.serialization import dumps, to_dict
+        inv = Invoice(id=1, invoice_number="INV-SER", tenant_id=1, invoice_date=date(2025, 1, 1),
+                      due_date=date(2025, 1, 31), document_amount=Decimal("100.50"), total_amount=Decimal("100"))
+        legacy = {c.name: getattr(inv, c.name) for c in inv.__table__.columns}
+        assert to_dict(inv) == legacy
+        assert json.loads(dumps(to_dict(inv))) == jsonable_encoder(legacy)
+        assert to_dict(inv, fields=["total_amount", "invoice_number", "nope"]) == {
+            "invoice_number": "INV-SER", "total_amount": Decimal("100")}
+
+    def test_sparse_fields_select_only_requested_columns(self):
+        from sqlalchemy import event
+        from sqlalchemy.engine import Engine
+        headers = _login()
+        statements = []
+
+        def capture(conn, cursor, statement, *args):
+            statements.append(statement)
+        # Any engine: the list runs on the async session path
+        event.listen(Engine, "before_cursor_execute", capture)
+        try:
+            r = client.get("/api/billing/payments", params={"tenant_id": 4242, "fields": "payment_number,amount"},
+                           headers=headers)
+        finally:
+            event.remove(Engine, "before_cursor_execute", capture)
+        assert r.status_code == 200
+        assert all(set(p) == {"payment_number", "amount"} for p in r.json()["items"])
+        page_sql = [s for s in statements if "LIMIT" in s][-1]
+        assert "payment_number" in page_sql and "payment_date" not in page_sql
+        r = client.get("/api/billing/payments", params={"fields": "amount,bogus"}, headers=headers)
+        assert r.status_code == 400 and "bogus" in r.json()["detail"]
+
     def test_list_late_fee_rules(self):
         r = client.get("/api/billing/late-fee-rules", headers=_login())
         assert r.status_code == 200
@@ -205,6 +497,137 @@ class TestAccounting:
         r = client.get("/api/accounting/reports/trial-balance?as_of=2026-02-13", headers=_login())
         assert r.status_code == 200
 
+    def test_reports_aggregate_journal_lines(self):
+        from datetime import date
+        from app.modules.accounting.models import ChartOfAccount, JournalEntry, JournalEntryLine
+        db = TestSession()
+        cash = ChartOfAccount(account_code="T1000", account_name="Test Cash", account_type="Asset")
+        rent = ChartOfAccount(account_code="T4000", account_name="Test Rent", account_type="Revenue")
+        idle = ChartOfAccount(account_code="T5000", account_name="Test Idle", account_type="Expense")
+        db.add_all([cash, rent, idle])
+        db.flush()
+        for i, day in enumerate([date(2026, 1, 10), date(2026, 2, 10), date(2026, 3, 10)]):
+            je = JournalEntry(journal_number=f"TJE-RPT-{i}", entry_date=day, total_debit=100, total_credit=100)
+            db.add(je)
+            db.flush()
+            db.add_all([
+                JournalEntryLine(journal_entry_id=je.id, account_id=cash.id, debit_amount=100, credit_amount=0),
+                JournalEntryLine(journal_entry_id=je.id, account_id=rent.id, debit_amount=0, credit_amount=100),
+            ])
+        db.commit()
+        db.close()
+
+        r = client.get("/api/accounting/reports/balance-sheet?as_of=2026-02-28", headers=_login())
+        rows = {x["account_code"]: x for x in r.json()["data"]}
+        assert rows["T1000"]["balance"] == 200
+
+        r = client.get("/api/accounting/reports/income-statement?start_date=2026-02-01&end_date=2026-03-31",
+                       headers=_login())
+        body = r.json()
+        rows = {x["account_code"]: x for x in body["data"]}
+        assert rows["T4000"]["balance"] == 200
+        assert rows["T5000"]["balance"] == 0
+
+        r = client.get("/api/accounting/reports/trial-balance?as_of=2026-12-31", headers=_login())
+        body = r.json()
+        rows = {x["account_code"]: x for x in body["data"]}
+        assert rows["T1000"] == {"account_code": "T1000", "account_name": "Test Cash", "debit": 300, "credit": 0}
+        assert body["total_debit"] == body["total_credit"]
+
+    def test_period_balances_and_close(self):
+        from app.modules.accounting.models import ChartOfAccount
+        db = TestSession()
+        bank = ChartOfAccount(account_code="P1000", account_name="Period Bank", account_type="Asset")
+        fees = ChartOfAccount(account_code="P4000", account_name="Period Fees", account_type="Revenue")
+        db.add_all([bank, fees])
+        db.commit()
+        bank_id, fees_id = bank.id, fees.id
+        db.close()
+
+        def post(num, day, amount):
+            return client.post("/api/accounting/journal-entries", json={
+                "journal_number": num, "entry_date": day, "lines": [
+                    {"account_id": bank_id, "debit_amount": amount, "credit_amount": 0},
+                    {"account_id": fees_id, "debit_amount": 0, "credit_amount": amount},
+                ]}, headers=_login())
+
+        assert post("PJE-1", "2025-01-15", 100).status_code == 201
+        assert post("PJE-2", "2025-02-10", 40).status_code == 201
+        assert post("PJE-3", "2025-02-20", 10).status_code == 201
+
+        r = client.get("/api/accounting/periods/2025-02/balances", headers=_login())
+        rows = {b["account_id"]: b for b in r.json()["items"]}
+        assert float(rows[bank_id]["debits"]) == 50
+
+        assert client.post("/api/accounting/periods/2025-03/close", headers=_login()).status_code == 200
+        r = client.post("/api/accounting/periods/2025-05/close", headers=_login())
+        assert r.status_code == 400
+        assert post("PJE-4", "2025-03-01", 5).status_code == 400
+
+        r = client.get("/api/accounting/periods/2025-04/balances", headers=_login())
+        rows = {b["account_id"]: b for b in r.json()["items"]}
+        assert float(rows[bank_id]["opening_balance"]) == 150
+
+        assert post("PJE-5", "2025-04-03", 7).status_code == 201
+        r = client.get("/api/accounting/reports/balance-sheet?as_of=2025-04-30", headers=_login())
+        rows = {x["account_code"]: x for x in r.json()["data"]}
+        assert rows["P1000"]["balance"] == 157
+        r = client.get("/api/accounting/reports/income-statement?start_date=2025-02-05&end_date=2025-04-30",
+                       headers=_login())
+        rows = {x["account_code"]: x for x in r.json()["data"]}
+        assert rows["P4000"]["balance"] == 57
+
+    def test_posting_opens_at_latest_balance_and_rolls_forward(self):
+        from app.modules.accounting.models import ChartOfAccount
+        db = TestSession()
+        cash = ChartOfAccount(account_code="R1000", account_name="Roll Cash", account_type="Asset")
+        rent = ChartOfAccount(account_code="R4000", account_name="Roll Rent", account_type="Revenue")
+        db.add_all([cash, rent])
+        db.commit()
+        cash_id, rent_id = cash.id, rent.id
+        db.close()
+
+        def post(num, day, amount):
+            r = client.post("/api/accounting/journal-entries", json={
+                "journal_number": num, "entry_date": day, "lines": [
+                    {"account_id": cash_id, "debit_amount": amount, "credit_amount": 0},
+                    {"account_id": rent_id, "debit_amount": 0, "credit_amount": amount},
+                ]}, headers=_login())
+            assert r.status_code == 201, r.text
+
+        def cash_row(period):
+            r = client.get(f"/api/accounting/periods/{period}/balances", headers=_login())
+            row = next(b for b in r.json()["items"] if b["account_id"] == cash_id)
+            return float(row["opening_balance"]), float(row["closing_balance"])
+
+        post("RJE-1", "2026-01-15", "100.10")
+        post("RJE-2", "2026-03-15", "10.20")  # February idle: March still opens at January's close
+        assert cash_row("2026-03") == (100.10, 110.30)
+        post("RJE-3", "2026-02-15", "0.10")  # back-dated: rolls into March
+        assert cash_row("2026-02") == (100.10, 100.20)
+        assert cash_row("2026-03") == (100.20, 110.40)
+
+    def test_journal_entries_keyset_pages(self):
+        seen = []
+        cursor = None
+        while True:
+            url = "/api/accounting/journal-entries?limit=2&include_total=false"
+            r = client.get(url + (f"&cursor={cursor}" if cursor else ""), headers=_login())
+            assert r.status_code == 200
+            body = r.json()
+            assert body["total"] is None
+            assert all(len(je["lines"]) == 2 for je in body["items"])
+            seen.extend(je["id"] for je in body["items"])
+            cursor = body["next_cursor"]
+            if not cursor:
+                break
+        full = client.get("/api/accounting/journal-entries?limit=500&include_lines=false", headers=_login()).json()
+        assert seen == [je["id"] for je in full["items"]]
+        assert full["total"] == len(seen)
+        assert "lines" not in full["items"][0]
+        exact = client.get(f"/api/accounting/journal-entries?limit={len(seen)}", headers=_login()).json()
+        assert exact["next_cursor"] is None
+
 
 # ═══════════════════════════════════════
 # Dashboards (correct URL: /api/dashboard/*)
@@ -214,10 +637,115 @@ class TestDashboards:
         r = client.get("/api/dashboard/portfolio", headers=_login())
         assert r.status_code == 200
 
+    def test_portfolio_dashboard_counts(self):
+        from app.modules.properties.models import Property, Unit
+        headers = _login()
+        before = client.get("/api/dashboard/portfolio", headers=headers).json()
+        db = TestSession()
+        prop = Property(property_code="DASH-1", property_name="Dash", property_type="Commercial")
+        db.add(prop)
+        db.flush()
+        db.add_all([Unit(property_id=prop.id, unit_number="D1", current_status="Occupied"),
+                    Unit(property_id=prop.id, unit_number="D2", current_status="Vacant"),
+                    Unit(property_id=prop.id, unit_number="D3", current_status="Occupied", is_deleted=True)])
+        db.commit()
+        db.close()
+        after = client.get("/api/dashboard/portfolio", headers=headers).json()
+        assert set(after) == set(before)
+        assert after["total_properties"] == before["total_properties"] + 1
+        assert after["total_units"] == before["total_units"] + 2
+        assert after["occupied_units"] == before["occupied_units"] + 1
+        assert after["vacant_units"] == before["vacant_units"] + 1
+        assert after["total_units"] == sum(after["unit_status_breakdown"].values())
+        assert after["property_type_breakdown"]["Commercial"] >= 1
+
     def test_finance_dashboard(self):
         r = client.get("/api/dashboard/finance", headers=_login())
         assert r.status_code == 200
 
+    def test_finance_dashboard_aging_and_horizon(self):
+        from datetime import date, timedelta
+        from app.modules.billing.models import Invoice, Payment
+        headers = _login()
+        before = client.get("/api/dashboard/finance", params={"months": 24}, headers=headers).json()
+        today = date.today()
+        db = TestSession()
+        for i, days in enumerate([10, 45, 75, 200]):
+            db.add(Invoice(invoice_number=f"INV-AGE-{i}", tenant_id=1, invoice_date=today - timedelta(days=days),
+                           due_date=today - timedelta(days=days), document_amount=100, total_amount=100,
+                           invoice_status="Posted"))
+        db.add(Payment(payment_number="PMT-AGE-1", tenant_id=1, payment_date=today, amount=40))
+        db.commit()
+        db.close()
+        after = client.get("/api/dashboard/finance", params={"months": 24}, headers=headers).json()
+        assert len(after["monthly_revenue"]) == 24
+        assert after["monthly_revenue"][-1]["month"] == today.strftime("%b %Y")
+        assert after["monthly_revenue"][-1]["revenue"] == before["monthly_revenue"][-1]["revenue"] + 40
+        for bucket in ("0-30", "31-60", "61-90", "90+"):
+            assert after["aging_buckets"][bucket] == before["aging_buckets"][bucket] + 100
+        assert client.get("/api/dashboard/finance", params={"months": 0}, headers=headers).status_code == 422
+
+    def test_dashboard_cache_hits_and_invalidates_on_write(self):
+        headers = _login()
+        first = client.get("/api/dashboard/portfolio", headers=headers)
+        second = client.get("/api/dashboard/portfolio", headers=headers)
+        assert second.headers["X-Cache"] == "HIT"
+        assert "X-Cache-Hit-Ratio" in second.headers
+        r = client.post("/api/properties", json={"property_code": "CACHE-1", "property_name": "Cache"},
+                        headers=headers)
+        assert r.status_code == 201
+        third = client.get("/api/dashboard/portfolio", headers=headers)
+        assert third.headers["X-Cache"] == "MISS"
+        assert third.json()["total_properties"] == first.json()["total_properties"] + 1
+        from app.utils.cache_service import dashboard_cache
+        assert client.get("/api/dashboard/cache-stats", headers=headers).status_code == 403  # admin only
+        stats = dashboard_cache.stats()
+        assert stats["hits"] >= 1 and stats["invalidations"] >= 1
+
+    def test_ttl_cache_lru_and_expiry(self):
+        from app.utils.cache_service import TTLCache
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set(("a", 1), 1)
+        cache.set(("b", 2), 2)
+        cache.get(("a", 1))
+        cache.set(("c", 1), 3)
+        assert cache.get(("b", 2)) == (False, None)
+        assert cache.get(("a", 1)) == (True, 1)
+        cache.invalidate_orgs([1])
+        assert cache.stats()["entries"] == 0
+        expiring = TTLCache(ttl=-1)
+        expiring.set(("x", None), 1)
+        assert expiring.get(("x", None))[0] is False
+
+    def test_dashboards_serve_kpi_snapshots(self):
+        from app.modules.properties.models import Property
+        from app.dashboards.models import KpiSnapshot
+        from app.utils.cache_service import dashboard_cache
+        headers = _login()
+        r = client.post("/api/dashboard/snapshots/refresh", headers=headers)
+        assert r.status_code == 200 and r.json()["snapshots_refreshed"] >= 3
+        snap = client.get("/api/dashboard/portfolio", headers=headers).json()
+        assert snap["source"] == "snapshot" and "as_of" in snap
+        finance = client.get("/api/dashboard/finance", params={"months": 3}, headers=headers).json()
+        assert finance["source"] == "snapshot" and len(finance["monthly_revenue"]) == 3
+        assert client.get("/api/dashboard/maintenance", headers=headers).json()["source"] == "snapshot"
+
+        db = TestSession()
+        db.add(Property(property_code="SNAP-1", property_name="Snap"))
+        db.commit()
+        # The stamp is stored on the snapshot rows, so a worker with its own (empty) cache sees it too
+        assert all(s.is_stale for s in db.query(KpiSnapshot).filter(KpiSnapshot.tenant_org_id.is_(None)))
+        dashboard_cache.clear()
+        # The write made the snapshot stale, so the default view computes live until the next refresh
+        fresh = client.get("/api/dashboard/portfolio", headers=headers).json()
+        assert fresh["source"] == "live" and fresh["total_properties"] == snap["total_properties"] + 1
+        client.post("/api/dashboard/snapshots/refresh", headers=headers)
+        refreshed = client.get("/api/dashboard/portfolio", headers=headers).json()
+        assert refreshed["source"] == "snapshot" and refreshed["total_properties"] == fresh["total_properties"]
+        db.query(KpiSnapshot).delete()
+        db.commit()
+        db.close()
+
     def test_maintenance_dashboard(self):
         r = client.get("/api/dashboard/maintenance", headers=_login())
         assert r.status_code == 200
@@ -239,6 +767,35 @@ class TestCRM:
         r = client.get("/api/crm/tasks", headers=_login())
         assert r.status_code == 200
 
+    def test_tasks_cursor_pages_and_ndjson_stream(self):
+        from app.modules.crm.models import Task
+        headers = _login()
+        db = TestSession()
+        db.add_all([Task(title="Page test", due_date=due) for due in (datetime(2031, 1, 2), None, datetime(2031, 1, 1))])
+        db.commit()
+        db.close()
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 1, "total": "none", **({"cursor": cursor} if cursor else {})}
+            body = client.get("/api/crm/tasks", params=params, headers=headers).json()
+            seen += [t["id"] for t in body["items"]]
+            cursor = body["next_cursor"]
+            if not cursor:
+                break
+        total = client.get("/api/crm/tasks", headers=headers).json()["total"]
+        assert len(seen) == len(set(seen)) == total
+
+        r = client.get("/api/crm/tasks", params={"format": "ndjson"}, headers=headers)
+        assert r.headers["content-type"].startswith("application/x-ndjson")
+        assert [json.loads(line)["id"] for line in r.text.splitlines()] == seen
+
+        # MySQL has no NULLS LAST; the order must be spelled portably
+        from sqlalchemy import select
+        from sqlalchemy.dialects import mysql
+        from app.utils.pagination import _order
+        sql = str(select(Task).order_by(*_order([Task.due_date, Task.id], True)).compile(dialect=mysql.dialect()))
+        assert "NULLS" not in sql and "tasks.due_date IS NULL" in sql
+
 
 # ═══════════════════════════════════════
 # Marketing
@@ -294,6 +851,229 @@ class TestExportAutomation:
         r = client.post("/api/automation/generate-invoices", headers=_login())
         assert r.status_code == 200
 
+    def test_generate_invoices_range_is_idempotent(self):
+        from datetime import date
+        from app.modules.leasing.models import Lease, RentSchedule
+        from app.modules.billing.models import Invoice, InvoiceLine
+        db = TestSession()
+        lease = Lease(lease_number="LS-BILL-1", property_id=1, tenant_id=1, lease_status="Active",
+                      start_date=date(2025, 1, 1), end_date=date(2025, 12, 31), base_rent_amount=900)
+        db.add(lease)
+        db.flush()
+        for month in (1, 2, 3):
+            db.add(RentSchedule(lease_id=lease.id, due_date=date(2025, month, 1), scheduled_amount=900,
+                                total_amount=900, outstanding_amount=900))
+        db.commit()
+        headers = _login()
+        params = {"start_date": "2025-01-01", "end_date": "2025-02-28"}
+        r = client.post("/api/automation/generate-invoices", params=params, headers=headers)
+        assert r.status_code == 200
+        assert r.json()["invoices_created"] == 2
+        r = client.post("/api/automation/generate-invoices",
+                        params={"start_date": "2025-01-01", "end_date": "2025-03-31"}, headers=headers)
+        assert r.json()["invoices_created"] == 1
+        invoices = db.query(Invoice).filter(Invoice.lease_id == lease.id).all()
+        assert sorted(i.invoice_number for i in invoices) == [
+            "INV-LS-BILL-1-20250101", "INV-LS-BILL-1-20250201", "INV-LS-BILL-1-20250301"]
+        assert db.query(InvoiceLine).filter(InvoiceLine.invoice_id.in_([i.id for i in invoices])).count() == 3
+        r = client.post("/api/automation/generate-invoices", params={"start_date": "2025-03-01",
+                        "end_date": "2025-01-01"}, headers=headers)
+        assert r.status_code == 400
+        db.close()
+
+    def test_billing_failure_is_a_500_without_driver_detail(self, monkeypatch):
+        from sqlalchemy.exc import OperationalError
+        from app.utils import billing_service
+
+        class BrokenSession(TestSession.class_):
+            def query(self, *args, **kwargs):
+                raise OperationalError("SELECT 1", {}, Exception("driver secret"))
+        monkeypatch.setattr(billing_service, "SessionLocal", sessionmaker(bind=engine, class_=BrokenSession))
+        unsafe_client = TestClient(app, raise_server_exceptions=False)
+        for url in ("/api/automation/generate-invoices", "/api/automation/apply-late-fees"):
+            r = unsafe_client.post(url, headers=_login())
+            assert r.status_code == 500 and "secret" not in r.text
+
+    def test_late_fees_dry_run_then_apply_once(self):
+        from datetime import date
+        from app.modules.billing.models import Invoice, InvoiceLine, LateFeeRule
+        db = TestSession()
+        db.add(LateFeeRule(tenant_org_id=77, rule_name="Pct", fee_type="Percentage", fee_value=10,
+                           grace_period_days=5, max_fee_amount=25))
+        db.add_all([
+            Invoice(tenant_org_id=77, invoice_number=f"INV-LATE-{i}", tenant_id=1, invoice_date=date(2025, 1, 1),
+                    due_date=date(2025, 1, d), document_amount=amt, total_amount=amt, invoice_status="Posted")
+            for i, (d, amt) in enumerate([(1, 100), (1, 1000), (28, 100)])
+        ])
+        db.commit()
+        headers = _login()
+        params = {"as_of": "2025-01-31"}
+        r = client.post("/api/automation/apply-late-fees", params={**params, "dry_run": True}, headers=headers)
+        assert r.status_code == 200
+        assert r.json()["fees_applied"] == 2
+        assert sorted(f["fee"] for f in r.json()["fees"]) == [10.0, 25.0]
+        assert db.query(InvoiceLine).filter(InvoiceLine.charge_type == "LateFee").count() == 0
+
+        r = client.post("/api/automation/apply-late-fees", params=params, headers=headers)
+        assert r.json()["fees_applied"] == 2
+        assert r.json()["total_fees"] == 35.0
+        r = client.post("/api/automation/apply-late-fees", params=params, headers=headers)
+        assert r.json()["fees_applied"] == 0
+        totals = dict(db.query(Invoice.invoice_number, Invoice.total_amount).filter(Invoice.tenant_org_id == 77))
+        assert float(totals["INV-LATE-0"]) == 110 and float(totals["INV-LATE-1"]) == 1025
+        db.close()
+
     def test_auto_terminate(self):
         r = client.post("/api/automation/auto-terminate", headers=_login())
         assert r.status_code == 200
+
+
+# ═══════════════════════════════════════
+# Query plans
+# ═══════════════════════════════════════
+class TestQueryPlans:
+    def test_hot_tenant_queries_use_indexes(self):
+        from datetime import date
+        from sqlalchemy import text
+        from app.modules.billing.models import Invoice, Payment
+        from app.modules.leasing.models import Lease, RentSchedule
+        from app.modules.maintenance.models import MaintenanceRequest
+        from app.modules.utilities.models import UtilityReading
+        db = TestSession()
+        today = date(2025, 6, 1)
+        hot = [
+            db.query(Invoice).filter(Invoice.tenant_org_id == 1, Invoice.invoice_status == "Posted",
+                                     Invoice.due_date < today),
+            db.query(Invoice.id).filter(Invoice.lease_id == 1, Invoice.due_date == today),
+            db.query(Lease).filter(Lease.tenant_org_id == 1, Lease.lease_status == "Active", Lease.end_date <= today),
+            db.query(RentSchedule).filter(RentSchedule.tenant_org_id == 1, RentSchedule.due_date.between(today, today)),
+            db.query(MaintenanceRequest).filter(MaintenanceRequest.tenant_org_id == 1,
+                                                MaintenanceRequest.status == "New"),
+            db.query(Payment).filter(Payment.tenant_org_id == 1, Payment.payment_date >= today),
+            db.query(UtilityReading).filter(UtilityReading.tenant_org_id == 1)
+              .order_by(UtilityReading.reading_date.desc()).limit(50),
+        ]
+        for q in hot:
+            sql = str(q.statement.compile(engine, compile_kwargs={"literal_binds": True}))
+            plan = [row[-1] for row in db.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+            assert not [step for step in plan if step.startswith("SCAN")], (sql, plan)
+        db.close()
+
+
+class TestBulkSeed:
+    def test_seed_is_deterministic_across_batch_sizes(self, tmp_path):
+        from datetime import date
+        from sqlalchemy import select
+        from app.modules.billing.models import Invoice, Payment
+        from app.modules.leasing.models import RentSchedule
+        from app.utils.seed_service import seed_bulk
+
+        def seeded(name, batch_size):
+            eng = create_engine(f"sqlite:///{tmp_path / name}")
+            Base.metadata.create_all(bind=eng)
+            counts = seed_bulk(eng, units=60, seed=3, months=6, as_of=date(2025, 6, 15), batch_size=batch_size)
+            with eng.connect() as conn:
+                rows = [conn.execute(select(*(c for c in m.__table__.c if c.name not in ("created_at", "updated_at")))
+                                     .order_by(m.id)).all()
+                        for m in (RentSchedule, Invoice, Payment)]
+            eng.dispose()
+            return counts, rows
+
+        counts, rows = seeded("a.db", 7)
+        assert seeded("b.db", 10000)[1] == rows
+        assert counts["leases"] == 48 and counts["rent_schedules"] == 48 * 6
+        # Leases start in 2025-03, so March–May are invoiced and June onwards is not
+        assert counts["invoices"] == 48 * 3
+        assert all(inv.due_date < date(2025, 6, 1) for inv in rows[1])
+        assert counts["payments"] == counts["payment_allocations"] > 0
+
+
+class TestSQLiteProfile:
+    def test_sessions_read_and_write_on_one_writer_connection(self):
+        from app.database import ReadSessionLocal, SessionLocal, engine as app_engine, writer_engine
+        from app.modules.properties.models import Property
+        assert writer_engine is not None
+        with app_engine.connect() as conn:
+            assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        db = SessionLocal()
+        try:
+            # Reads before the first write are in the write transaction too
+            assert db.query(Property).filter(Property.property_code == "WAL-1").count() == 0
+            assert writer_engine.pool.checkedout() == 1
+            db.add(Property(property_code="WAL-1", property_name="Writer path"))
+            db.flush()
+            assert db.query(Property).filter(Property.property_code == "WAL-1").count() == 1
+            reader = ReadSessionLocal()
+            try:
+                assert reader.get_bind() is app_engine
+                assert reader.query(Property).filter(Property.property_code == "WAL-1").count() == 0
+            finally:
+                reader.close()
+            db.rollback()
+            assert writer_engine.pool.checkedout() == 0
+        finally:
+            db.close()
+
+    def test_concurrent_reads_and_writes_on_the_app_pools(self, monkeypatch):
+        from app.auth import dependencies
+        from app.database import writer_engine
+        monkeypatch.setattr(writer_engine.pool, "_timeout", 3)
+        monkeypatch.setattr(dependencies.settings, "PRINCIPAL_CACHE_TTL_SECONDS", 0)  # authenticate from the db
+        calls = [("GET", "/api/properties", None), ("GET", "/api/crm/contacts", None),
+                 ("POST", "/api/crm/contacts", {"first_name": "Burst", "contact_type": "Lead"})] * 8
+        assert _burst(calls) == [200, 200, 201] * 8
+
+
+class TestReadReplicas:
+    def test_reads_use_replica_until_own_write_and_skip_dead_replica(self, tmp_path, monkeypatch):
+        from sqlalchemy import insert
+        from app import database
+        from app.modules.properties.models import Property
+        replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+        Base.metadata.create_all(bind=replica)
+        with replica.begin() as conn:
+            conn.execute(insert(Property), [{"property_code": "RR-REPLICA", "property_name": "Only on replica",
+                                             "status": "Active", "is_deleted": False}])
+        dead = create_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+        router = database.ReplicaRouter([dead, replica], sticky_seconds=60)
+        monkeypatch.setattr(database, "replica_router", router)
+        headers = _login()
+
+        def codes():
+            r = client.get("/api/properties", params={"search": "RR-", "total": "none"}, headers=headers)
+            assert r.status_code == 200, r.text
+            return {p["property_code"] for p in r.json()["items"]}
+
+        assert codes() == {"RR-REPLICA"}
+        assert router.failures == 1  # the dead replica is skipped from now on
+        assert codes() == {"RR-REPLICA"} and router.failures == 1
+        r = client.post("/api/properties", json={"property_name": "Primary", "property_code": "RR-PRIMARY",
+                                                  "status": "Active"}, headers=headers)
+        assert r.status_code == 201, r.text
+        # Read-your-writes: this client now reads from the primary
+        assert codes() == {"RR-PRIMARY"}
+        replica.dispose()
+        dead.dispose()
+
+
+class TestAsyncSession:
+    def test_async_list_pages_by_cursor_and_async_job_lookup(self):
+        headers = _login()
+        for i in range(5):
+            r = client.post("/api/properties", json={"property_name": f"Async {i}", "property_code": f"AS-{i}",
+                                                      "status": "Active"}, headers=headers)
+            assert r.status_code == 201, r.text
+        params = {"search": "AS-", "limit": 2}
+        first = client.get("/api/properties", params=params, headers=headers).json()
+        assert first["total"] == 5
+        codes, cursor = [p["property_code"] for p in first["items"]], first["next_cursor"]
+        while cursor:
+            page = client.get("/api/properties", params={**params, "cursor": cursor}, headers=headers).json()
+            codes += [p["property_code"] for p in page["items"]]
+            cursor = page["next_cursor"]
+        assert codes == [f"AS-{i}" for i in reversed(range(5))]
+        r = client.get("/api/properties", params={"search": "AS-", "format": "ndjson"}, headers=headers)
+        assert r.status_code == 200, r.text
+        assert r.headers["content-type"].startswith("application/x-ndjson")
+        assert [json.loads(line)["property_code"] for line in r.text.splitlines()] == codes
+        assert client.post("/api/workflow/jobs/99999/run", headers=headers).status_code == 404